@@ -0,0 +1,9 @@
+"""效能測試工具，需在專案根目錄以模組方式執行
+
+- `python -m benchmark.fake_server`：啟動模擬 Hoyolab、Enka Network、Mihomo API 的本地伺服器
+- `python -m benchmark.scheduler`：建立虛擬使用者，測試自動簽到與即時便箋排程的吞吐量與回應時間
+- `python -m benchmark.search_index`：以真實的 genshin-db 資料測試 /search 自動完成的回應時間
+- `python -m benchmark.genshin_db_memory`：比較基準版本與目前版本 genshin-db 資料集常駐記憶體的大小
+- `python -m benchmark.html_converter`：確認公告 html 轉換的輸出與標準輸出相同，並比較新舊實作的速度
+- `python -m benchmark.import_time`：測試各模組 import 的時間，確認大型套件延遲載入，載入時間退步時失敗
+"""
@@ -0,0 +1,329 @@
+"""模擬 Hoyolab、Enka Network、Mihomo API 的本地伺服器
+
+所有請求的網址格式為 `http://127.0.0.1:<port>/<原本的主機名稱><原本的路徑>`，
+例如 `https://bbs-api-os.hoyolab.com/game_record/genshin/api/dailyNote`
+會變成 `http://127.0.0.1:<port>/bbs-api-os.hoyolab.com/game_record/genshin/api/dailyNote`，
+`redirect_genshin_routes` 會將 genshin.py 的所有 API 網址改成此格式。
+
+單獨執行：`python -m benchmark.fake_server --port 8080 --latency 0.2 --error-rate 0.05`
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+import genshin
+import yarl
+from aiohttp import web
+
+
+@dataclass
+class FakeServerOptions:
+    """模擬伺服器的設定"""
+
+    latency: float = 0.1
+    """每個請求的平均延遲（單位：秒）"""
+    jitter: float = 0.05
+    """延遲的隨機變動範圍（單位：秒）"""
+    error_rate: float = 0.0
+    """請求回傳錯誤的機率 (Hoyolab：retcode -1；Enka、Mihomo：HTTP 500)"""
+    rate_limit: float = 0.0
+    """每秒最多處理的請求數量，超過時回傳速率限制錯誤 (Hoyolab：retcode -110；Enka、Mihomo：HTTP 429)，0 表示不限制"""
+
+
+class FakeServer:
+    """模擬 API 的本地伺服器，回傳格式與官方 API 相同的隨機資料
+
+    Methods
+    -----
+    start()
+        啟動伺服器，回傳伺服器的網址
+    stop()
+        關閉伺服器
+    """
+
+    def __init__(self, options: FakeServerOptions, host: str = "127.0.0.1", port: int = 0):
+        self.options = options
+        self.host = host
+        self.port = port
+        self.stats: Counter[str] = Counter()
+        """請求的統計數量：requests、errors、rate_limited、以及各 API 的名稱"""
+        self._signed: set[tuple[str, str]] = set()
+        self._tokens = options.rate_limit
+        self._last_refill = time.monotonic()
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        """啟動伺服器，回傳伺服器的網址"""
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0 and site._server is not None:  # 使用系統分配的 port
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+        return f"http://{self.host}:{self.port}"
+
+    async def stop(self) -> None:
+        """關閉伺服器"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def _take_token(self) -> bool:
+        """以 token bucket 限制每秒的請求數量，回傳此請求是否在限制內"""
+        if self.options.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(
+            self.options.rate_limit,
+            self._tokens + (now - self._last_refill) * self.options.rate_limit,
+        )
+        self._last_refill = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        delay = self.options.latency + random.uniform(-1, 1) * self.options.jitter
+        await asyncio.sleep(max(delay, 0))
+
+        upstream, _, path = request.match_info["tail"].partition("/")
+        is_hoyolab = upstream not in ("enka.network", "api.mihomo.me")
+        if not self._take_token():
+            self.stats["rate_limited"] += 1
+            if is_hoyolab:
+                return self._hoyolab(None, retcode=-110, message="visit too frequently")
+            return web.json_response({"detail": "rate limited"}, status=429)
+        if random.random() < self.options.error_rate:
+            self.stats["errors"] += 1
+            if is_hoyolab:
+                return self._hoyolab(None, retcode=-1, message="Internal database error")
+            return web.json_response({"detail": "internal error"}, status=500)
+
+        if upstream == "enka.network":
+            self.stats["enka"] += 1
+            return web.json_response(_enka_user(path.rstrip("/").split("/")[-1]))
+        if upstream == "api.mihomo.me":
+            self.stats["mihomo"] += 1
+            return web.json_response(_mihomo_user(path.rstrip("/").split("/")[-1]))
+        return await self._handle_hoyolab(request, path)
+
+    async def _handle_hoyolab(self, request: web.Request, path: str) -> web.Response:
+        """依照路徑回傳 Hoyolab API 的資料"""
+        if path.endswith("/sign") and request.method == "POST":
+            self.stats["daily_sign"] += 1
+            key = (request.headers.get("Cookie", ""), path)
+            if key in self._signed:
+                return self._hoyolab(
+                    None, retcode=-5003, message="Traveler, you've already checked in today"
+                )
+            self._signed.add(key)
+            return self._hoyolab(
+                {
+                    "code": "ok",
+                    "risk_code": 0,
+                    "gt": "",
+                    "challenge": "",
+                    "success": 0,
+                    "is_risk": False,
+                }
+            )
+        if path.endswith("/info"):
+            return self._hoyolab(
+                {"is_sign": True, "total_sign_day": time.localtime().tm_mday, "first_bind": False}
+            )
+        if path.endswith("/home"):
+            award = {"icon": "", "name": "原石", "cnt": 20}
+            return self._hoyolab(
+                {"month": time.localtime().tm_mon, "awards": [award] * 31, "resign": False}
+            )
+        if path.endswith("dailyNote"):
+            self.stats["genshin_notes"] += 1
+            return self._hoyolab(_genshin_notes())
+        if path.endswith("hkrpg/api/note"):
+            self.stats["starrail_notes"] += 1
+            return self._hoyolab(_starrail_notes())
+        if path.endswith("zzz/note"):
+            self.stats["zzz_notes"] += 1
+            return self._hoyolab(_zzz_notes())
+        if path.endswith("getUserGameRolesByCookie"):
+            self.stats["game_accounts"] += 1
+            return self._hoyolab({"list": _game_accounts()})
+        if path.endswith("spiralAbyss"):
+            self.stats["spiral_abyss"] += 1
+            return self._hoyolab(_spiral_abyss())
+        # 其他 API (例：社群簽到) 回傳成功的空資料
+        return self._hoyolab({})
+
+    @staticmethod
+    def _hoyolab(data: Any, *, retcode: int = 0, message: str = "OK") -> web.Response:
+        return web.json_response({"retcode": retcode, "message": message, "data": data})
+
+
+def redirect_genshin_routes(base_url: str) -> None:
+    """將 genshin.py 所有 API 的網址改為指向模擬伺服器 (保留原本的主機名稱在路徑中)"""
+
+    def rewrite(url: yarl.URL) -> yarl.URL:
+        if url.host is None or url.host == yarl.URL(base_url).host:
+            return url
+        return yarl.URL(f"{base_url}/{url.host}{url.path}").with_query(url.query)
+
+    for route in vars(genshin.client.routes).values():
+        if isinstance(route, genshin.client.routes.Route):
+            route.url = rewrite(route.url)
+        elif isinstance(route, genshin.client.routes.InternationalRoute):
+            route.urls = {region: rewrite(url) for region, url in route.urls.items()}
+        elif isinstance(route, genshin.client.routes.GameRoute):
+            route.urls = {
+                region: {game: rewrite(url) for game, url in urls.items()}
+                for region, urls in route.urls.items()
+            }
+
+
+def _game_accounts() -> list[dict[str, Any]]:
+    uid = random.randint(800000000, 899999999)
+    return [
+        {"game_biz": biz, "region": region, "game_uid": str(uid), "nickname": "旅行者",
+         "level": 60, "is_chosen": False, "region_name": "Asia", "is_official": True}
+        for biz, region in (("hk4e_global", "os_asia"), ("hkrpg_global", "prod_official_asia"),
+                            ("nap_global", "prod_gf_jp"))
+    ]  # fmt: skip
+
+
+def _genshin_notes() -> dict[str, Any]:
+    resin = random.randint(0, 200)
+    expedition_time = random.randint(0, 72000)
+    return {
+        "current_resin": resin, "max_resin": 200, "resin_recovery_time": str((200 - resin) * 480),
+        "finished_task_num": random.randint(0, 4), "total_task_num": 4,
+        "is_extra_task_reward_received": random.random() < 0.5,
+        "remain_resin_discount_num": 3, "resin_discount_num_limit": 3,
+        "current_expedition_num": 5, "max_expedition_num": 5,
+        "expeditions": [
+            {"avatar_side_icon": "", "status": "Ongoing" if expedition_time > 0 else "Finished",
+             "remained_time": str(expedition_time)}
+        ] * 5,
+        "current_home_coin": 1000, "max_home_coin": 2400, "home_coin_recovery_time": "36000",
+        "calendar_url": "",
+        "transformer": {
+            "obtained": True,
+            "recovery_time": {"Day": 1, "Hour": 0, "Minute": 0, "Second": 0, "reached": False},
+            "wiki": "", "noticed": False, "latest_job_id": "0",
+        },
+        "daily_task": {
+            "total_num": 4, "finished_num": 4, "is_extra_task_reward_received": True,
+            "task_rewards": [{"status": "TaskRewardStatusFinished"}] * 4,
+            "attendance_rewards": [{"status": "AttendanceRewardStatusUnfinished", "progress": 0}] * 4,
+            "attendance_visible": True, "stored_attendance": "0.0",
+            "stored_attendance_refresh_countdown": 0,
+        },
+        "archon_quest_progress": {"list": [], "is_open_archon_quest": True,
+                                  "is_finish_all_mainline": True, "is_finish_all_interchapter": True,
+                                  "wiki_url": ""},
+    }  # fmt: skip
+
+
+def _starrail_notes() -> dict[str, Any]:
+    stamina = random.randint(0, 240)
+    return {
+        "current_stamina": stamina, "max_stamina": 240, "stamina_recover_time": (240 - stamina) * 360,
+        "stamina_full_ts": int(time.time()) + (240 - stamina) * 360,
+        "accepted_epedition_num": 4, "total_expedition_num": 4,
+        "expeditions": [
+            {"avatars": [], "status": "Ongoing", "remaining_time": random.randint(0, 72000),
+             "name": "委託", "item_url": "", "finish_ts": int(time.time()) + 3600}
+        ] * 4,
+        "current_train_score": 500, "max_train_score": 500,
+        "current_rogue_score": random.randint(0, 14000), "max_rogue_score": 14000,
+        "weekly_cocoon_cnt": random.randint(0, 3), "weekly_cocoon_limit": 3,
+        "current_reserve_stamina": 0, "is_reserve_stamina_full": False,
+        "rogue_tourn_weekly_unlocked": False, "rogue_tourn_weekly_max": 0, "rogue_tourn_weekly_cur": 0,
+        "current_ts": int(time.time()), "rogue_tourn_exp_is_full": False,
+    }  # fmt: skip
+
+
+def _zzz_notes() -> dict[str, Any]:
+    battery = random.randint(0, 240)
+    return {
+        "energy": {"progress": {"max": 240, "current": battery}, "restore": (240 - battery) * 360,
+                   "day_type": 1, "hour": 0, "minute": 0},
+        "vitality": {"max": 400, "current": random.randint(0, 400)},
+        "vhs_sale": {"sale_state": "SaleStateDoing"},
+        "card_sign": "CardSignDone",
+        "bounty_commission": {"num": 0, "total": 4},
+        "survey_points": None, "abyss_refresh": 86400, "coffee": None, "weekly_task": None,
+    }  # fmt: skip
+
+
+def _spiral_abyss() -> dict[str, Any]:
+    now = int(time.time())
+    return {
+        "schedule_id": 1, "start_time": str(now - 86400), "end_time": str(now + 86400),
+        "total_battle_times": 0, "total_win_times": 0, "max_floor": "0-0",
+        "reveal_rank": [], "defeat_rank": [], "damage_rank": [], "take_damage_rank": [],
+        "normal_skill_rank": [], "energy_skill_rank": [], "floors": [], "total_star": 0,
+        "is_unlock": True,
+    }  # fmt: skip
+
+
+def _enka_user(uid: str) -> dict[str, Any]:
+    return {
+        "playerInfo": {
+            "nickname": "旅行者", "level": 60, "signature": "", "worldLevel": 9,
+            "nameCardId": 210001, "finishAchievementNum": 1000, "towerFloorIndex": 12,
+            "towerLevelIndex": 3, "showAvatarInfoList": [], "showNameCardIdList": [],
+            "profilePicture": {"avatarId": 10000007},
+        },
+        "avatarInfoList": [], "ttl": 60, "uid": uid,
+    }  # fmt: skip
+
+
+def _mihomo_user(uid: str) -> dict[str, Any]:
+    return {
+        "player": {
+            "uid": uid, "nickname": "開拓者", "level": 70, "world_level": 6, "friend_count": 0,
+            "avatar": {"id": "201001", "name": "", "icon": ""}, "signature": "", "is_display": True,
+            "space_info": {"memory_data": None, "universe_level": 0, "light_cone_count": 0,
+                           "avatar_count": 0, "achievement_count": 0},
+        },
+        "characters": [],
+    }  # fmt: skip
+
+
+async def _main(args: argparse.Namespace) -> None:
+    options = FakeServerOptions(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    server = FakeServer(options, args.host, args.port)
+    url = await server.start()
+    print(f"模擬伺服器已啟動：{url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """加入模擬伺服器設定的命令列參數"""
+    parser.add_argument("--latency", type=float, default=0.1, help="平均延遲（秒）")
+    parser.add_argument("--jitter", type=float, default=0.05, help="延遲的隨機變動範圍（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="回傳錯誤的機率")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="每秒最多請求數量，0 表示不限制"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="模擬 Hoyolab、Enka、Mihomo API 的本地伺服器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
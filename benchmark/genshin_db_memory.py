@@ -0,0 +1,136 @@
+"""genshin-db 資料的記憶體用量測試：以 tracemalloc 比較基準版本與目前版本，完整資料集常駐記憶體的大小
+
+- baseline：基準版本 (預設為 e10082b) 的 genshin_db 套件，依照當時的做法逐一解析每個資料夾的 json 資料，
+  解析後只保留模型
+- current：目前的做法，intern 重複的短字串，從快照解析並建立索引後只保留解析後的模型
+
+兩種做法使用同一份硬碟上的快照，各在獨立的子程序內測量，互不影響；
+沒有快照時先向 genshin-db api 取得，請使用真實的快照測量，人工產生的資料無法反映實際的字串重複程度
+
+執行：`python -m benchmark.genshin_db_memory`
+指定基準版本：`python -m benchmark.genshin_db_memory --baseline <commit>`
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+BASELINE_REVISION = "e10082b"
+"""預設的基準版本，精簡 genshin-db 資料之前的 commit"""
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+"""專案的 git repository，用來取出基準版本的程式碼"""
+
+
+async def ensure_snapshot() -> Path:
+    """確認硬碟上有快照，沒有時向 genshin-db api 取得並保存，回傳快照的路徑"""
+    import genshin_db
+
+    if genshin_db.GenshinDbSnapshot.load() is None:
+        snapshot = await genshin_db.fetch_snapshot()
+        snapshot.save()
+    return genshin_db.GenshinDbSnapshot.PATH
+
+
+def extract_revision(revision: str, directory: str) -> None:
+    """將指定版本的 genshin_db 套件解壓縮到目錄內"""
+    archive = subprocess.run(
+        ["git", "-C", str(REPOSITORY), "archive", "--format=tar", revision, "genshin_db"],
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+def measure_baseline(source: str, snapshot_path: str) -> None:
+    """以基準版本的 genshin_db 解析快照內每個資料夾的資料，解析後丟棄原始資料 (與當時向 api 請求後的做法相同)
+
+    此子程序不可載入目前版本的 genshin_db，pydantic 不允許同名的模型重複定義 validator
+    """
+    sys.path.insert(0, source)
+    import genshin_db as baseline
+
+    Folder = baseline.API.GenshinDBFolder
+    text = Path(snapshot_path).read_text(encoding="utf-8")
+
+    gc.collect()
+    tracemalloc.start()
+    raw = json.loads(text)["data"]
+    data = baseline.GenshinDbAllData(
+        achievements=baseline.Achievements.parse_obj(raw.pop(Folder.ACHIEVEMENTS.value)),
+        artifacts=baseline.Artifacts.parse_obj(raw.pop(Folder.ARTIFACTS.value)),
+        characters=baseline.Characters.parse_obj(raw.pop(Folder.CHARACTERS.value)),
+        constellations=baseline.Constellations.parse_obj(raw.pop(Folder.CONSTELLATIONS.value)),
+        foods=baseline.Foods.parse_obj(raw.pop(Folder.FOODS.value)),
+        materials=baseline.Materials.parse_obj(raw.pop(Folder.MATERIALS.value)),
+        talents=baseline.Talents.parse_obj(raw.pop(Folder.TALENTS.value)),
+        tcg_cards=baseline.TCGCards(
+            raw.pop(Folder.TCG_ACTION_CARDS.value),
+            raw.pop(Folder.TCG_CHARACTER_CARDS.value),
+            raw.pop(Folder.TCG_SUMMONS.value),
+        ),
+        weapons=baseline.Weapons.parse_obj(raw.pop(Folder.WEAPONS.value)),
+    )
+    del raw
+    report("baseline", data)
+
+
+def measure_current() -> None:
+    """以目前的做法從快照解析資料並建立索引，只保留解析後的模型"""
+    import genshin_db
+
+    gc.collect()
+    tracemalloc.start()
+    snapshot = genshin_db.GenshinDbSnapshot.load()
+    assert snapshot is not None
+    data = snapshot.parse()
+    data.build_index()
+    del snapshot
+    report("current", data)
+
+
+def report(mode: str, data: object) -> None:
+    """輸出常駐與峰值記憶體（單位：MiB），data 在測量結束前保持存活"""
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{mode:<10}常駐 {current / 2**20:8.2f} MiB，峰值 {peak / 2**20:8.2f} MiB")
+    del data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="genshin-db 資料的記憶體用量測試")
+    parser.add_argument("--baseline", default=BASELINE_REVISION, help="作為基準的 git commit")
+    parser.add_argument("--mode", choices=["baseline", "current"], help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--snapshot", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == "baseline":
+        measure_baseline(args.source, args.snapshot)
+        return
+    if args.mode == "current":
+        measure_current()
+        return
+
+    snapshot_path = asyncio.run(ensure_snapshot())
+    print(f"快照：{snapshot_path}，基準版本：{args.baseline}")
+    module = "benchmark.genshin_db_memory"
+    with tempfile.TemporaryDirectory() as directory:
+        extract_revision(args.baseline, directory)
+        command = ["--mode", "baseline", "--source", directory, "--snapshot", str(snapshot_path)]
+        subprocess.run([sys.executable, "-m", module, *command], check=True)
+    subprocess.run([sys.executable, "-m", module, "--mode", "current"], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""公告 html 轉換的正確性與效能測試
+
+benchmark/notices_html/ 內每個 .html 都有一個對應的 .txt 標準輸出 (golden output)，
+由原本以 BeautifulSoup 實作的 legacy_parse_html_content 產生；
+測試時先確認 genshin_py.parser.parse_html_content 的輸出與標準輸出完全相同，再比較兩者的執行時間
+
+執行：`python -m benchmark.html_converter`
+更新標準輸出：`python -m benchmark.html_converter --update-golden`
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from genshin_py.parser.common import parse_html_content
+
+from .stats import percentile
+
+CORPUS_DIR = Path(__file__).parent / "notices_html"
+
+
+def legacy_parse_html_content(html_text: str, length_limit: int = 500) -> str:
+    """原本以 BeautifulSoup 建立完整的 html 樹後再轉換的實作，作為比較的基準"""
+    html_text = html_text.replace('&lt;t class="t_lc"&gt;', "")
+    html_text = html_text.replace('&lt;t class="t_gl"&gt;', "")
+    html_text = html_text.replace("&lt;/t&gt;", "")
+
+    soup = BeautifulSoup(html_text, features="html.parser")
+    url_pattern = re.compile(r"\(\'(https?://.*)\'\)")
+
+    result = ""
+    text_length = 0
+    for row in soup:
+        if text_length > length_limit:
+            return result + "..."
+
+        if row.a is not None and (url := url_pattern.search(row.a["href"])):
+            result += f"[{row.text}]({url.group(1)})\n"
+            text_length += len(row.text)
+        elif row.img is not None:
+            url = row.img["src"]
+            result += f"[>>圖片<<]({url})\n"
+        elif row.name == "div" and row.table is not None:
+            for tr in row.find_all("tr"):
+                for td in tr.find_all("td"):
+                    result += "· " + td.text + " "
+                    text_length += len(td.text)
+                result += "\n"
+        elif row.name == "ol":
+            for i, li in enumerate(row.find_all("li")):
+                result += f"{i+1}. {li.text}\n"
+                text_length += len(li.text)
+        elif row.name == "ul":
+            for li in row.find_all("li"):
+                result += "· " + li.text + "\n"
+                text_length += len(li.text)
+        else:
+            text = row.text.strip() + "\n"
+            result += text
+            text_length += len(text)
+
+    return result
+
+
+def measure(convert: Callable[[str], str], corpus: list[str], rounds: int) -> list[float]:
+    """回傳每一輪轉換整個測試資料花費的時間（單位：毫秒）"""
+    latencies: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for html_text in corpus:
+            convert(html_text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="公告 html 轉換的正確性與效能測試")
+    parser.add_argument("--rounds", type=int, default=200, help="轉換整個測試資料的次數")
+    parser.add_argument(
+        "--update-golden", action="store_true", help="以原本的實作重新產生標準輸出"
+    )
+    args = parser.parse_args()
+
+    html_files = sorted(CORPUS_DIR.glob("*.html"))
+    corpus = [path.read_text(encoding="utf-8") for path in html_files]
+
+    if args.update_golden:
+        for path, html_text in zip(html_files, corpus):
+            golden = legacy_parse_html_content(html_text)
+            path.with_suffix(".txt").write_text(golden, encoding="utf-8")
+        print(f"已更新 {len(html_files)} 個標準輸出")
+        return
+
+    failed = False
+    for path, html_text in zip(html_files, corpus):
+        golden = path.with_suffix(".txt").read_text(encoding="utf-8")
+        if parse_html_content(html_text) != golden:
+            print(f"輸出與標準輸出不同：{path.name}")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print(f"{len(html_files)} 個測試資料的輸出皆與標準輸出相同")
+
+    legacy = measure(legacy_parse_html_content, corpus, args.rounds)
+    streaming = measure(parse_html_content, corpus, args.rounds)
+    print(f"BeautifulSoup：p50 {percentile(legacy, 50):.3f}ms，p99 {percentile(legacy, 99):.3f}ms")
+    print(
+        f"串流轉換：p50 {percentile(streaming, 50):.3f}ms，p99 {percentile(streaming, 99):.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
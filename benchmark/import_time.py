@@ -0,0 +1,189 @@
+"""啟動時 import 的時間測試：以 `python -X importtime` 在獨立的子程序內載入各模組，解析每個模組的載入時間
+
+- 確認 PIL、enkanetwork、mihomo 等只有部分指令會用到的套件沒有在 import 時被載入
+- import 時間只包含模組本身；擴充功能的 setup() 在啟動時執行，可能另外載入套件或啟動背景工作，
+  因此也實際載入 SETUP_TARGETS 的擴充功能，確認 setup() 與其背景工作同樣沒有載入這些套件
+- 與基準 (data/benchmark/import_time.json) 比較，載入時間超過基準的容許範圍時視為退步
+
+任一項檢查失敗時以非 0 的狀態碼結束，可用於 CI；基準與機器有關，需先在同一台機器上產生
+
+執行：`python -m benchmark.import_time`
+更新基準：`python -m benchmark.import_time --update-baseline`
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+BASELINE_PATH = Path("data/benchmark/import_time.json")
+
+TARGETS = [
+    "genshin_py",
+    "genshin_py.auto_task",
+    "database",
+    "enka_network",
+    "star_rail",
+    "cogs.admin.cog",
+    "cogs.characters.cog",
+    "cogs.record_card.cog",
+    "cogs.showcase.cog",
+]
+"""測試的模組，每個模組在各自的子程序內載入"""
+
+SETUP_TARGETS = [
+    "cogs.showcase.cog",
+]
+"""以 bot.load_extension 實際執行 setup() 的擴充功能 (不連線到 Discord)"""
+
+SETUP_SCRIPT = """
+import asyncio, importlib.util, sys
+import discord
+from discord.ext import commands
+
+async def main():
+    bot = commands.Bot(command_prefix="/", intents=discord.Intents.none())
+    await bot.load_extension({target!r})
+    await asyncio.sleep({wait})  # 讓 setup() 啟動的背景工作開始執行
+    # lazy_module 的代理物件還沒有真正執行 import，不算已載入
+    loaded = [name for name, module in sys.modules.items()
+              if not isinstance(module, importlib.util._LazyModule)]
+    print(" ".join(sorted({{name.split(".")[0] for name in loaded}})))
+
+asyncio.run(main())
+"""
+"""在子程序內載入擴充功能後，輸出所有已載入的最上層套件"""
+
+LAZY_PACKAGES = [
+    "PIL",
+    "enkanetwork",
+    "mihomo",
+    "honkairail",
+    "hsrcard",
+    "genshinpyrail",
+    "bs4",
+]
+"""不應該在 import 時載入，第一次使用時才載入的套件"""
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+class ImportRecord(NamedTuple):
+    """`-X importtime` 輸出的一行"""
+
+    module: str
+    self_us: int
+    """模組本身的載入時間（單位：微秒）"""
+    cumulative_us: int
+    """包含子模組的載入時間（單位：微秒）"""
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """解析 `-X importtime` 的輸出，忽略其他的 stderr 內容"""
+    records: list[ImportRecord] = []
+    for line in stderr.splitlines():
+        if (match := IMPORTTIME_PATTERN.match(line)) is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def measure(target: str) -> list[ImportRecord]:
+    """在新的子程序內載入模組，回傳所有被載入的模組"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"無法載入 {target}：\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def loaded_after_setup(target: str, wait: float = 1.0) -> set[str]:
+    """在新的子程序內以 bot.load_extension 載入擴充功能，回傳 setup() 與背景工作載入的最上層套件"""
+    result = subprocess.run(
+        [sys.executable, "-c", SETUP_SCRIPT.format(target=target, wait=wait)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"無法載入擴充功能 {target}：\n{result.stderr[-2000:]}")
+    return set(result.stdout.split())
+
+
+def target_time_ms(records: list[ImportRecord], target: str) -> float:
+    """模組包含父套件與所有相依模組的載入時間（單位：毫秒）"""
+    for record in records:
+        if record.module == target and record.depth == 0:
+            return record.cumulative_us / 1000
+    raise ValueError(f"-X importtime 的輸出沒有 {target}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="啟動時 import 的時間測試")
+    parser.add_argument("--rounds", type=int, default=5, help="每個模組載入的次數，取中位數")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="容許超過基準的比例，預設 0.25 (25%%)"
+    )
+    parser.add_argument("--top", type=int, default=5, help="列出載入時間最長的幾個模組")
+    parser.add_argument("--targets", nargs="+", default=TARGETS, help="只測試指定的模組")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="以這次的測試結果作為新的基準"
+    )
+    args = parser.parse_args()
+
+    failed = False
+    results: dict[str, float] = {}
+    for target in args.targets:
+        rounds = [measure(target) for _ in range(args.rounds)]
+        results[target] = statistics.median(target_time_ms(r, target) for r in rounds)
+        print(f"{target:<24}{results[target]:8.1f} ms")
+
+        slowest = sorted(rounds[-1], key=lambda r: r.self_us, reverse=True)[: args.top]
+        for record in slowest:
+            print(f"    {record.module:<40}{record.self_us / 1000:8.1f} ms")
+
+        loaded = {r.module.split(".")[0] for r in rounds[-1]}
+        if eager := [package for package in LAZY_PACKAGES if package in loaded]:
+            print(f"    載入了應該延遲載入的套件：{', '.join(eager)}")
+            failed = True
+
+    for target in SETUP_TARGETS:
+        loaded = loaded_after_setup(target)
+        if eager := [package for package in LAZY_PACKAGES if package in loaded]:
+            print(f"{target} 的 setup() 載入了應該延遲載入的套件：{', '.join(eager)}")
+            failed = True
+        else:
+            print(f"{target} 的 setup() 沒有載入延遲載入的套件")
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"已更新基準：{BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline: dict[str, float] = json.load(f)
+        for target, elapsed in results.items():
+            if target not in baseline:
+                continue
+            limit = baseline[target] * (1 + args.tolerance)
+            if elapsed > limit:
+                print(f"載入時間退步：{target} {elapsed:.1f} ms，基準 {baseline[target]:.1f} ms")
+                failed = True
+    else:
+        print(f"沒有基準 ({BASELINE_PATH})，只檢查延遲載入的套件；以 --update-baseline 產生基準")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""自動排程壓力測試：在暫存的資料庫建立大量虛擬使用者，對模擬伺服器執行排程並統計效能
+
+執行：`python -m benchmark.scheduler --users 1000 --job daily --latency 0.2 --error-rate 0.02`
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+import discord
+
+from database import Database, GenshinScheduleNotes, ScheduleDailyCheckin, User
+from database.models import Base
+from genshin_py import auto_task
+from genshin_py.rate_controller import RateController
+from utility import config
+
+from .fake_server import (
+    FakeServer,
+    FakeServerOptions,
+    add_server_arguments,
+    redirect_genshin_routes,
+)
+from .stats import percentile
+
+CHANNEL_COUNT = 20
+"""虛擬使用者平均分配到的頻道數量"""
+
+
+class FakeUser:
+    """模擬 Discord 使用者，只實作排程會用到的屬性"""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+
+    def mentioned_in(self, message: Any) -> bool:
+        return True
+
+
+class FakeChannel(discord.abc.Messageable):
+    """模擬 Discord 頻道，不實際發送訊息，只記錄發送次數"""
+
+    def __init__(self, channel_id: int, stats: dict[str, int]):
+        self.id = channel_id
+        self.stats = stats
+
+    async def _get_channel(self) -> Any:
+        return self
+
+    async def send(self, content: str | None = None, **kwargs: Any) -> Any:  # type: ignore
+        self.stats["messages"] += 1
+        self.stats["embeds"] += len(kwargs.get("embeds") or [])
+        return None
+
+
+class FakeBot:
+    """模擬 Discord 機器人，提供排程發送通知所需的方法"""
+
+    def __init__(self):
+        self.stats = {"messages": 0, "embeds": 0}
+        self._channels: dict[int, FakeChannel] = {}
+
+    def get_channel(self, channel_id: int) -> FakeChannel:
+        if channel_id not in self._channels:
+            self._channels[channel_id] = FakeChannel(channel_id, self.stats)
+        return self._channels[channel_id]
+
+    async def fetch_channel(self, channel_id: int) -> FakeChannel:
+        return self.get_channel(channel_id)
+
+    def get_user(self, user_id: int) -> FakeUser:
+        return FakeUser(user_id)
+
+    async def fetch_user(self, user_id: int) -> FakeUser:
+        return FakeUser(user_id)
+
+
+async def seed_users(count: int, job: str) -> None:
+    """在資料庫建立虛擬使用者與排程資料"""
+    now = datetime.now()
+    async with Database.sessionmaker() as session:
+        for i in range(count):
+            discord_id = 10**17 + i
+            channel_id = 10**17 + i % CHANNEL_COUNT
+            session.add(
+                User(
+                    discord_id,
+                    cookie_default=(
+                        f"ltuid_v2={i + 1}; ltoken_v2=v2_benchmark{i}; ltmid_v2=mid{i}; "
+                        + f"account_id_v2={i + 1}; cookie_token_v2=v2_benchmark{i}"
+                    ),
+                    uid_genshin=800000000 + i,
+                )
+            )
+            if job == "daily":
+                session.add(
+                    ScheduleDailyCheckin(
+                        discord_id,
+                        channel_id,
+                        is_mention=i % 2 == 0,
+                        next_checkin_time=now - timedelta(minutes=1),
+                        has_genshin=True,
+                    )
+                )
+            else:
+                session.add(
+                    GenshinScheduleNotes(
+                        discord_id,
+                        channel_id,
+                        next_check_time=now - timedelta(minutes=1),
+                        threshold_resin=1,
+                    )
+                )
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    options = FakeServerOptions(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    server = FakeServer(options)
+    redirect_genshin_routes(await server.start())
+
+    # 收集每個 Hoyolab 請求的回應時間
+    latencies: list[float] = []
+    _record = RateController.record
+
+    def record(self: RateController, latency: float, exception: BaseException | None = None):
+        latencies.append(latency)
+        _record(self, latency, exception)
+
+    RateController.record = record  # type: ignore
+
+    config.schedule_loop_delay = args.loop_delay
+    config.notification_coalesce_window = 0.1
+    async with Database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed_users(args.users, args.job)
+
+    bot: Any = FakeBot()
+    start = time.perf_counter()
+    if args.job == "daily":
+        await auto_task.DailyReward.execute(bot)
+    else:
+        await auto_task.RealtimeNotes.execute(bot)
+    elapsed = time.perf_counter() - start
+    await server.stop()
+    await Database.close()
+
+    print(f"\n===== {args.job} 排程：{args.users} 位使用者 =====")
+    print(f"總耗時：{elapsed:.2f} 秒，吞吐量：{args.users / elapsed:.2f} 人/秒")
+    print(
+        f"Hoyolab 請求：{len(latencies)} 次，"
+        + f"錯誤 {server.stats['errors']} 次、速率限制 {server.stats['rate_limited']} 次"
+    )
+    print(
+        "回應時間："
+        + f"平均 {statistics.fmean(latencies) if latencies else 0:.3f}s、"
+        + f"p50 {percentile(latencies, 50):.3f}s、"
+        + f"p90 {percentile(latencies, 90):.3f}s、"
+        + f"p99 {percentile(latencies, 99):.3f}s"
+    )
+    print(f"Discord 訊息：{bot.stats['messages']} 則，共 {bot.stats['embeds']} 個 embed")
+    for region, controller in RateController._controllers.items():
+        print(
+            f"RateController[{region}]：並行數量 {controller.limit:.2f}、間隔 {controller.delay:.2f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="自動排程壓力測試")
+    parser.add_argument("--users", type=int, default=100, help="虛擬使用者數量")
+    parser.add_argument("--job", choices=["daily", "notes"], default="daily", help="要測試的排程")
+    parser.add_argument(
+        "--loop-delay",
+        type=float,
+        default=0.0,
+        help="使用者之間的基本間隔（秒），正式環境預設為 2",
+    )
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    # 資料庫使用相對路徑 data/bot/bot.db，切換到暫存目錄避免動到正式的資料庫
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.makedirs("data/bot")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""/search 自動完成的延遲測試：以真實的 genshin-db 資料，比較搜尋索引與逐一比對名稱的回應時間
+
+優先使用硬碟上的快照 (data/genshin_db/snapshot.json)，沒有快照時向 genshin-db api 取得
+
+執行：`python -m benchmark.search_index --queries 2000`
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable
+
+import genshin_db
+
+from .stats import percentile
+
+
+def linear_search(names: list[str], current: str) -> list[str]:
+    """原本的自動完成做法：逐一比對名稱是否包含輸入文字"""
+    choices = [name for name in names if current.lower() in name.lower()]
+    if current == "":
+        choices = random.sample(choices, k=min(25, len(choices)))
+    choices = choices[:25]
+    choices.sort()
+    return choices
+
+
+def make_queries(names: list[str], count: int) -> list[str]:
+    """模擬使用者輸入：名稱的前綴、名稱中間的片段、打錯一個字的名稱"""
+    queries: list[str] = []
+    for _ in range(count):
+        name = random.choice(names)
+        kind = random.random()
+        if kind < 0.5 or len(name) < 3:
+            queries.append(name[: random.randint(1, min(3, len(name)))])
+        elif kind < 0.8:
+            start = random.randint(1, len(name) - 2)
+            queries.append(name[start : start + 2])
+        else:
+            i = random.randrange(len(name))
+            queries.append(name[:i] + random.choice(name) + name[i + 1 :])
+    return queries
+
+
+def measure(search: Callable[[str], list[str]], queries: list[str]) -> list[float]:
+    """回傳每次搜尋花費的時間（單位：毫秒）"""
+    latencies: list[float] = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def load_data() -> genshin_db.GenshinDbAllData:
+    snapshot = genshin_db.GenshinDbSnapshot.load()
+    if snapshot is None:
+        print("沒有快照，向 genshin-db api 取得資料...")
+        snapshot = await genshin_db.fetch_snapshot()
+    data = snapshot.parse()
+    start = time.perf_counter()
+    data.build_index()
+    print(f"建立索引耗時：{(time.perf_counter() - start) * 1000:.1f} 毫秒")
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/search 自動完成的延遲測試")
+    parser.add_argument("--queries", type=int, default=2000, help="每個類別的搜尋次數")
+    parser.add_argument("--seed", type=int, default=0, help="產生搜尋文字的亂數種子")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    data = asyncio.run(load_data())
+    print(
+        f"\n{'類別':<12}{'數量':>6}{'索引 p50':>12}{'索引 p99':>12}{'逐一 p50':>12}{'逐一 p99':>12}"
+    )
+    for category, index in data.search_indexes.items():
+        names = index.names
+        if len(names) == 0:
+            continue
+        queries = make_queries(names, args.queries)
+        indexed = measure(index.search, queries)
+        linear = measure(lambda query: linear_search(names, query), queries)
+        print(
+            f"{category:<12}{len(names):>6}"
+            + f"{percentile(indexed, 50):>10.3f}ms{percentile(indexed, 99):>10.3f}ms"
+            + f"{percentile(linear, 50):>10.3f}ms{percentile(linear, 99):>10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
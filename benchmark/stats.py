@@ -0,0 +1,6 @@
+def percentile(values: list[float], p: float) -> float:
+    """計算百分位數 (最近秩法)"""
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
@@ -4,13 +4,15 @@ import typing
 from datetime import datetime, time, timedelta
 
 import discord
-import enkanetwork
+import sentry_sdk
 from discord import app_commands
 from discord.app_commands import Choice
 from discord.ext import commands, tasks
 
+import enka_network
+import genshin_db
 from genshin_py import auto_task
-from utility import SlashCommandLogger, config
+from utility import LOG, SlashCommandLogger, config
 
 
 class Admin(commands.Cog):
@@ -74,10 +76,7 @@ class Admin(commands.Cog):
                 await interaction.edit_original_response(content="開始執行每日自動簽到")
                 asyncio.create_task(auto_task.DailyReward.execute(self.bot))
             case "UPDATE_ENKA_ASSETS":  # 更新 Enka 新版本素材資料
-                client = enkanetwork.EnkaNetworkAPI()
-                async with client:
-                    await client.update_assets()
-                enkanetwork.Assets(lang=enkanetwork.Language.CHT)
+                await enka_network.update_assets()
                 await interaction.edit_original_response(content="Enka 資料更新完成")
 
     # /config指令：設定config配置檔案的參數值
@@ -150,7 +149,14 @@ class Admin(commands.Cog):
     # 每天定時重整 genshin_db API 資料
     @tasks.loop(time=time(hour=20, minute=00))
     async def refresh_genshin_db(self):
-        await self.bot.reload_extension("cogs.data_search.cog")
+        # 在背景取得新資料後直接替換，不重新載入 cog，更新失敗時保留舊資料
+        try:
+            result = await genshin_db.GenshinDbStore.refresh()
+        except Exception as e:
+            LOG.Error(f"genshin-db 資料更新失敗：{e}")
+            sentry_sdk.capture_exception(e)
+        else:
+            LOG.System(str(result))
 
     @refresh_genshin_db.before_loop
     async def before_refresh_genshin_db(self):
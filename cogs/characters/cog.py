@@ -6,8 +6,6 @@ import discord
 import genshin
 from discord import app_commands
 from discord.ext import commands
-from genshinpyrail.genshinpyrail import genshin_character_list, honkai_character_list
-from genshinpyrail.src.tools.model import GenshinCharterList, StarRaillCharterList
 
 import genshin_py
 from utility import EmbedTemplate
@@ -74,13 +72,7 @@ class CharactersCog(commands.Cog, name="角色一覽"):
 
         try:
             # 使用 genshinpyrail 產生圖片
-            match game:
-                case genshin.Game.GENSHIN:
-                    data = await genshin_character_list.Creat(characters).start()
-                    image = GenshinCharterList(**data).card
-                case genshin.Game.STARRAIL:
-                    data = await honkai_character_list.Creat(characters).start()
-                    image = StarRaillCharterList(**data).card
+            image = await genshin_py.draw_character_list(game, characters)
             if image is None:
                 raise ValueError("沒有圖片")
         except Exception:
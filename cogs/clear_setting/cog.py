@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+import genshin_py
 from database import Database
 from utility import custom_log
 
@@ -21,6 +22,8 @@ class ClearSettingCog(commands.Cog, name="清除設定"):
         await view.wait()
         if view.value is True:
             await Database.delete_all(interaction.user.id)
+            genshin_py.NotesCache.invalidate(interaction.user.id)
+            genshin_py.ResponseCache.invalidate(interaction.user.id)
             await interaction.edit_original_response(content="使用者資料已全部刪除", view=None)
         else:
             await interaction.edit_original_response(content="取消指令", view=None)
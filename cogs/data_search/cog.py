@@ -1,5 +1,5 @@
-import random
-from typing import Iterable, List, Literal
+import asyncio
+from typing import List, Literal
 
 import discord
 import sentry_sdk
@@ -14,11 +14,44 @@ from .ui import SearchResultsDropdown
 
 StrCategory = Literal["角色", "武器", "聖遺物", "物品/食物", "成就", "七聖召喚"]
 
+SEARCH_INDEX_KEYS: dict[StrCategory, str] = {
+    "角色": "characters",
+    "武器": "weapons",
+    "聖遺物": "artifacts",
+    "物品/食物": "items",
+    "成就": "achievements",
+    "七聖召喚": "tcg_cards",
+}
+"""各類別在 GenshinDbAllData.search_indexes 對應的鍵"""
+
 
 class Search(commands.Cog, name="資料搜尋"):
-    def __init__(self, bot: commands.Bot, genshin_db_data: genshin_db.GenshinDbAllData):
+    def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db = genshin_db_data
+        self._refresh_task: asyncio.Task | None = None
+
+    async def cog_load(self) -> None:
+        # 先使用硬碟上的快照讓搜尋功能立即可用，在背景向 genshin-db api 確認資料是否有更新
+        await genshin_db.GenshinDbStore.load_snapshot()
+        self._refresh_task = asyncio.create_task(self.background_refresh())
+
+    async def cog_unload(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    async def background_refresh(self) -> None:
+        """背景更新資料；失敗時若還沒有任何資料，每隔一段時間重試直到成功"""
+        while True:
+            try:
+                result = await genshin_db.GenshinDbStore.refresh()
+                custom_log.LOG.System(str(result))
+            except Exception as e:
+                custom_log.LOG.Error(f"genshin-db 資料更新失敗：{e}")
+                sentry_sdk.capture_exception(e)
+                if genshin_db.GenshinDbStore.data() is None:
+                    await asyncio.sleep(300)
+                    continue
+            return
 
     @app_commands.command(name="search搜尋資料庫", description="搜尋原神資料庫，包含了角色、武器、各項物品、成就、七聖召喚")
     @app_commands.rename(category="類別", item_name="名稱")
@@ -41,33 +74,38 @@ class Search(commands.Cog, name="資料搜尋"):
         item_name: str,
     ):
         """搜尋 genshin-db 資料庫斜線指令"""
+        if (db := genshin_db.GenshinDbStore.data()) is None:
+            await interaction.response.send_message(
+                embed=EmbedTemplate.error("資料庫正在載入中，請稍後再試"), ephemeral=True
+            )
+            return
         titles: list[str] = []
         embeds: list[discord.Embed] = []
         match category:
             case "角色":
-                character = self.db.characters.find(item_name)
+                character = db.characters.find(item_name)
                 titles.append("基本資料")
                 embeds.append(genshin_db.parse(character))
 
                 # 旅行者多元素特殊處理
                 if "旅行者" in item_name:
                     for element in ["風", "岩", "雷", "草"]:
-                        talent = self.db.talents.find(f"旅行者 ({element}元素)")
+                        talent = db.talents.find(f"旅行者 ({element}元素)")
                         titles.append(f"天賦：{element}")
                         embeds.append(genshin_db.parse(talent))
                     for element in ["風", "岩", "雷", "草"]:
-                        constell = self.db.constellations.find(f"旅行者 ({element}元素)")
+                        constell = db.constellations.find(f"旅行者 ({element}元素)")
                         titles.append(f"命座：{element}")
                         embeds.append(genshin_db.parse(constell))
                 else:
-                    talent = self.db.talents.find(item_name)
+                    talent = db.talents.find(item_name)
                     titles.append("天賦")
                     embeds.append(genshin_db.parse(talent))
-                    constell = self.db.constellations.find(item_name)
+                    constell = db.constellations.find(item_name)
                     titles.append("命座")
                     embeds.append(genshin_db.parse(constell))
             case "聖遺物":
-                artifact = self.db.artifacts.find(item_name)
+                artifact = db.artifacts.find(item_name)
                 if artifact is None:
                     return
                 titles = ["總覽"]
@@ -85,7 +123,7 @@ class Search(commands.Cog, name="資料搜尋"):
                         titles.append(_titles[i])
                         embeds.append(genshin_db.parse(_part))
             case _:
-                item = self.db.find(item_name)
+                item = db.find(item_name)
                 embeds.append(genshin_db.parse(item))
 
         match len(embeds):
@@ -109,36 +147,14 @@ class Search(commands.Cog, name="資料搜尋"):
         # which means that if a parameter was renamed then the
         # renamed key is used instead of the function parameter name.
         category: StrCategory | None = interaction.namespace.類別
-        if category is None:
+        if category is None or (db := genshin_db.GenshinDbStore.data()) is None:
             return []
 
-        item_list: Iterable[genshin_db.GenshinDbBase] = {
-            "角色": self.db.characters.list,
-            "武器": self.db.weapons.list,
-            "聖遺物": self.db.artifacts.list,
-            "物品/食物": self.db.materials.list + self.db.foods.list,
-            "成就": self.db.achievements.list,
-            "七聖召喚": self.db.tcg_cards.list,
-        }.get(category, [])
-
-        choices: List[Choice[str]] = []
-        for item in item_list:
-            if current.lower() in item.name.lower():
-                choices.append(Choice(name=item.name, value=item.name))
-        # 使用者沒輸入的情況下，隨機找 25 個
-        if current == "":
-            choices = random.sample(choices, k=25)
-
-        choices = choices[:25]
-        choices.sort(key=lambda choice: choice.name)
-        return choices
+        index = db.search_indexes.get(SEARCH_INDEX_KEYS.get(category, ""))
+        if index is None:
+            return []
+        return [Choice(name=name, value=name) for name in index.search(current, limit=25)]
 
 
 async def setup(client: commands.Bot):
-    try:
-        gdb_data = await genshin_db.fetch_all()
-    except Exception as e:
-        custom_log.LOG.Error(str(e))
-        sentry_sdk.capture_exception(e)
-    else:
-        await client.add_cog(Search(client, gdb_data))
+    await client.add_cog(Search(client))
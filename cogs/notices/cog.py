@@ -1,12 +1,12 @@
 import asyncio
 
 import discord
-import genshin
+import sentry_sdk
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 import genshin_py
-from utility import EmbedTemplate
+from utility import LOG, EmbedTemplate, config
 from utility.custom_log import SlashCommandLogger
 
 from .ui import Dropdown, View
@@ -16,38 +16,40 @@ class NoticesCog(commands.Cog, name="遊戲公告"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        self.refresh_notices.start()
+
+    async def cog_unload(self) -> None:
+        self.refresh_notices.cancel()
+
     @app_commands.command(name="notices原神公告", description="顯示原神的遊戲公告與活動公告")
     @SlashCommandLogger
     async def slash_notices(self, interaction: discord.Interaction):
         try:
             defer, notices = await asyncio.gather(
-                interaction.response.defer(), genshin_py.get_genshin_notices()
+                interaction.response.defer(), genshin_py.NoticesCache.get()
             )
         except Exception as e:
             await interaction.edit_original_response(embed=EmbedTemplate.error(e))
         else:
-            # 將公告分成活動公告、遊戲公告、祈願公告三類
-            game: list[genshin.models.Announcement] = []
-            event: list[genshin.models.Announcement] = []
-            wish: list[genshin.models.Announcement] = []
-            for notice in notices:
-                if notice.type == 1:
-                    if "祈願" in notice.subtitle:
-                        wish.append(notice)
-                    else:
-                        event.append(notice)
-                elif notice.type == 2:
-                    game.append(notice)
-
             view = View()
-            if len(game) > 0:
-                view.add_item(Dropdown(game, "遊戲公告："))
-            if len(event) > 0:
-                view.add_item(Dropdown(event, "活動公告："))
-            if len(wish) > 0:
-                view.add_item(Dropdown(wish, "祈願卡池："))
+            if len(notices.game) > 0:
+                view.add_item(Dropdown(notices.game, "遊戲公告："))
+            if len(notices.event) > 0:
+                view.add_item(Dropdown(notices.event, "活動公告："))
+            if len(notices.wish) > 0:
+                view.add_item(Dropdown(notices.wish, "祈願卡池："))
             await interaction.edit_original_response(view=view)
 
+    # 定時更新遊戲公告快取
+    @tasks.loop(minutes=config.notices_refresh_interval)
+    async def refresh_notices(self):
+        try:
+            await genshin_py.NoticesCache.refresh()
+        except Exception as e:
+            LOG.Error(f"遊戲公告更新失敗：{e}")
+            sentry_sdk.capture_exception(e)
+
 
 async def setup(client: commands.Bot):
     await client.add_cog(NoticesCog(client))
@@ -2,16 +2,15 @@ import datetime
 from typing import Optional, Sequence
 
 import discord
-import genshin
 
-from genshin_py import parser
+import genshin_py
 from utility import EmbedTemplate, config
 
 
 class Dropdown(discord.ui.Select):
     """選擇公告的下拉選單"""
 
-    def __init__(self, notices: Sequence[genshin.models.Announcement], placeholder: str):
+    def __init__(self, notices: Sequence[genshin_py.Notice], placeholder: str):
         self.notices = notices
         options = [
             discord.SelectOption(label=notice.subtitle, description=notice.title, value=str(i))
@@ -21,7 +20,7 @@ class Dropdown(discord.ui.Select):
 
     async def callback(self, interaction: discord.Interaction):
         notice = self.notices[int(self.values[0])]
-        embed = EmbedTemplate.normal(parser.parse_html_content(notice.content), title=notice.title)
+        embed = EmbedTemplate.normal(notice.content, title=notice.title)
         embed.set_image(url=notice.banner)
         await interaction.response.edit_message(content=None, embed=embed)
 
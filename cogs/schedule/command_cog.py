@@ -10,13 +10,14 @@ from discord.ext import commands
 
 import database
 from database import (
+    CheckinTimeWheel,
     Database,
     GenshinScheduleNotes,
     ScheduleDailyCheckin,
     StarrailScheduleNotes,
     ZZZScheduleNotes,
 )
-from utility import EmbedTemplate, get_app_command_mention
+from utility import EmbedTemplate, config, get_app_command_mention
 from utility.custom_log import SlashCommandLogger
 
 from .ui import (
@@ -131,10 +132,14 @@ class ScheduleCommandCog(commands.Cog, name="排程設定指令"):
                     )
                     return
 
-                # 新增使用者
-                checkin_time = datetime.combine(
-                    datetime.now().date(), time(options_view.hour, options_view.minute)
+                # 新增使用者，依照目前各時段的人數分配實際的簽到時間，避免簽到集中在同一分鐘
+                slot = await CheckinTimeWheel.assign(
+                    time(options_view.hour, options_view.minute),
+                    config.schedule_checkin_slot_tolerance,
+                    config.schedule_checkin_slot_capacity,
+                    exclude_user_id=interaction.user.id,
                 )
+                checkin_time = datetime.combine(datetime.now().date(), slot)
                 checkin_user = ScheduleDailyCheckin(
                     discord_id=interaction.user.id,
                     discord_channel_id=interaction.channel_id or 0,
@@ -155,7 +160,7 @@ class ScheduleCommandCog(commands.Cog, name="排程設定指令"):
                     embed=EmbedTemplate.normal(
                         f"{options_view.selected_games} 每日自動簽到已開啟，"
                         f'簽到時小幫手{"會" if options_view.is_mention else "不會"} tag 你，'
-                        f"簽到的時間為每天 {options_view.hour:02d}:{options_view.minute:02d} 左右"
+                        f"簽到的時間為每天 {slot.hour:02d}:{slot.minute:02d} 左右"
                     ),
                     content=None,
                     view=None,
@@ -7,6 +7,7 @@ from discord.ext import commands, tasks
 
 import database
 from genshin_py import auto_task
+from genshin_py.proxy_pool import ProxyPool
 from utility import config
 from utility.custom_log import LOG
 
@@ -38,6 +39,10 @@ class ScheduleLoopCog(commands.Cog, name="排程循環"):
             if now.minute % config.schedule_check_resin_interval < self.loop_interval:
                 asyncio.create_task(auto_task.RealtimeNotes.execute(self.bot))
 
+        # 每 {config.proxy_health_check_interval} 分鐘檢查 proxy server 的連線狀況
+        if now.minute % config.proxy_health_check_interval < self.loop_interval:
+            asyncio.create_task(ProxyPool.health_check())
+
         # 每日凌晨一點備份資料庫、刪除過期使用者資料
         if now.hour == 1 and now.minute < self.loop_interval:
             try:
@@ -52,6 +57,12 @@ class ScheduleLoopCog(commands.Cog, name="排程循環"):
     @schedule.before_loop
     async def before_schedule(self):
         await self.bot.wait_until_ready()
+        # 接續機器人重啟前中斷的簽到工作
+        try:
+            await auto_task.DailyReward.resume()
+        except Exception as e:
+            LOG.Error(f"接續自動簽到工作時發生錯誤：{e}")
+            sentry_sdk.capture_exception(e)
 
 
 async def setup(client: commands.Bot):
@@ -1,7 +1,6 @@
 from typing import Literal, Optional
 
 import discord
-import enkanetwork
 from discord import app_commands
 from discord.ext import commands
 
@@ -40,12 +39,7 @@ class ShowcaseCog(commands.Cog, name="原神展示櫃"):
 
 
 async def setup(client: commands.Bot):
-    # 更新 Enka 素材資料
-    enka = enkanetwork.EnkaNetworkAPI()
-    async with enka:
-        await enka.update_assets()
-    enkanetwork.Assets(lang=enkanetwork.Language.CHT)
-
+    # Enka 素材資料在第一次使用展示櫃時才檢查是否需要更新 (見 enka_network.AssetsUpdater)
     await client.add_cog(ShowcaseCog(client))
 
     @client.tree.context_menu(name="角色展示櫃")
@@ -1,15 +1,21 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Any, Callable, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import discord
-import enkanetwork
 import sentry_sdk
 
+import enka_network
 from database import Database, GenshinShowcase, User
-from enka_network import Showcase, enka_assets
-from utility import EmbedTemplate, config, emoji, get_app_command_mention
+from utility import EmbedTemplate, config, emoji, get_app_command_mention, lazy_module
 from utility.custom_log import LOG
 
+if TYPE_CHECKING:
+    from enka_network import Showcase
+
+enkanetwork = lazy_module("enkanetwork")
+
 
 class ShowcaseCharactersDropdown(discord.ui.Select):
     """展示櫃角色下拉選單"""
@@ -29,7 +35,7 @@ class ShowcaseCharactersDropdown(discord.ui.Select):
                 enkanetwork.ElementType.Anemo: "anemo",
                 enkanetwork.ElementType.Geo: "geo",
             }.get(character.element, "")
-            _assets_character = enka_assets.character(character.id)
+            _assets_character = enka_network.enka_assets.character(character.id)
             _rarity = _assets_character.rarity if _assets_character else "?"
 
             options.append(
@@ -148,7 +154,9 @@ async def showcase(
     elif len(str(uid)) < 9 or len(str(uid)) > 10 or str(uid)[0] not in ["1", "2", "5", "6", "7", "8", "9"]:
         await interaction.edit_original_response(embed=EmbedTemplate.error("輸入的UID格式錯誤"))
     else:
-        showcase = Showcase(uid)
+        # 素材資料太舊時在背景更新，這次查詢先使用本地已有的素材資料
+        enka_network.AssetsUpdater.schedule()
+        showcase = enka_network.Showcase(uid)
         try:
             await showcase.load_data()
             view = ShowcaseView(showcase)
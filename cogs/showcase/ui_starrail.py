@@ -1,13 +1,18 @@
-from typing import Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
 
 import discord
 import sentry_sdk
 
+import star_rail
 from database import Database, StarrailShowcase, User
-from star_rail.showcase import Showcase
 from utility import EmbedTemplate, config, emoji, get_app_command_mention
 from utility.custom_log import LOG
 
+if TYPE_CHECKING:
+    from star_rail import Showcase
+
 
 class ShowcaseCharactersDropdown(discord.ui.Select):
     """展示櫃角色下拉選單"""
@@ -138,7 +143,7 @@ async def showcase(
     elif len(str(uid)) != 9 or str(uid)[0] not in ["1", "2", "5", "6", "7", "8", "9"]:
         await interaction.edit_original_response(embed=EmbedTemplate.error("輸入的UID格式錯誤"))
     else:
-        showcase = Showcase(uid)
+        showcase = star_rail.Showcase(uid)
         try:
             await showcase.load_data()
             view = ShowcaseView(showcase)
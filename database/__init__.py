@@ -1,5 +1,7 @@
 from .app import Database
 from .dataclass import *
+from .journal import JobJournal
+from .lease import CheckinLease
 from .migration import migrate
 from .models import (
     Base,
@@ -8,6 +10,7 @@ from .models import (
     GenshinShowcase,
     GenshinSpiralAbyss,
     ScheduleDailyCheckin,
+    ScheduleJobJournal,
     StarrailForgottenHall,
     StarrailPureFiction,
     StarrailScheduleNotes,
@@ -15,4 +18,5 @@ from .models import (
     User,
     ZZZScheduleNotes,
 )
+from .time_wheel import CheckinTimeWheel
 from .tools import Tool
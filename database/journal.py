@@ -0,0 +1,115 @@
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Final, Sequence
+
+import sqlalchemy
+
+from utility.config import config
+
+from .app import Database
+from .models import ScheduleJobJournal
+
+
+class JobJournal:
+    """自動排程的工作日誌，記錄每位使用者的處理狀態，讓機器人重啟後能接續上次未完成的工作
+
+    每位使用者在每個排程工作只有一筆紀錄，狀態依序為：
+    - STARTED：開始處理，若機器人在此狀態下重啟，表示不確定是否已向 Hoyolab 請求
+    - CLAIMED：已完成對 Hoyolab 的請求，但結果還沒寫入資料庫
+    - DONE / FAILED：處理完成或發生一般錯誤
+    """
+
+    STARTED: Final[str] = "started"
+    CLAIMED: Final[str] = "claimed"
+    DONE: Final[str] = "done"
+    FAILED: Final[str] = "failed"
+
+    MAX_ATTEMPTS: Final[int] = 3
+    """連續處理中斷次數的上限，超過時排程會暫時略過此使用者"""
+
+    WORKER_NAME: Final[str] = config.worker_name or socket.gethostname()
+    """本程序的 worker 名稱，以設定檔的 worker_name 為準，重新部署後不變"""
+
+    WORKER_ID: Final[str] = f"{WORKER_NAME}:{os.getpid()}"
+    """本程序的 worker ID，排程執行 ID 與簽到租約皆以此為前綴，用來區分不同程序或主機"""
+
+    STARTED_AT: Final[datetime] = datetime.now()
+    """本程序啟動的時間"""
+
+    @classmethod
+    async def start(cls, job: str, run_id: str, discord_id: int) -> int:
+        """記錄開始處理使用者，回傳連續開始處理卻沒有完成的次數 (包含本次)
+
+        Parameters
+        ------
+        job: `str`
+            排程工作名稱
+        run_id: `str`
+            本次排程執行 ID
+        discord_id: `int`
+            使用者 Discord ID
+
+        Returns
+        ------
+        `int`:
+            上次處理途中機器人當機或重啟時會大於 1，可以用來略過每次都讓機器人當機的使用者
+        """
+        entry = await Database.select_one(
+            ScheduleJobJournal,
+            ScheduleJobJournal.job.is_(job) & ScheduleJobJournal.discord_id.is_(discord_id),
+        )
+        attempts = 1
+        if entry is not None and entry.state == cls.STARTED:
+            attempts = entry.attempts + 1
+        await Database.insert_or_replace(
+            ScheduleJobJournal(job, discord_id, run_id, cls.STARTED, datetime.now(), attempts)
+        )
+        return attempts
+
+    @classmethod
+    async def mark(cls, job: str, discord_id: int, state: str) -> None:
+        """更新使用者的處理狀態"""
+        stmt = (
+            sqlalchemy.update(ScheduleJobJournal)
+            .where(ScheduleJobJournal.job.is_(job) & ScheduleJobJournal.discord_id.is_(discord_id))
+            .values(
+                {ScheduleJobJournal.state: state, ScheduleJobJournal.updated_at: datetime.now()}
+            )
+        )
+        async with Database.sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    @classmethod
+    async def unfinished(cls, job: str) -> Sequence[ScheduleJobJournal]:
+        """取得指定排程工作中，處理到一半 (狀態為 STARTED 或 CLAIMED) 的紀錄"""
+        return await Database.select_all(
+            ScheduleJobJournal,
+            ScheduleJobJournal.job.is_(job)
+            & ScheduleJobJournal.state.in_([cls.STARTED, cls.CLAIMED]),
+        )
+
+    @classmethod
+    def is_dead_run(cls, entry: ScheduleJobJournal, timeout: timedelta) -> bool:
+        """判斷工作日誌紀錄所屬的排程執行是否已經結束
+
+        - 與本程序 worker 名稱相同、且在本程序啟動前更新的紀錄，屬於重啟或重新部署前的程序
+        - 其他 worker 的紀錄超過 timeout 沒有更新時 (例：簽到租約已過期)，視為該 worker 已經結束
+
+        Parameters
+        ------
+        entry: `ScheduleJobJournal`
+            工作日誌紀錄
+        timeout: `timedelta`
+            其他 worker 的紀錄超過此時間沒有更新時視為已經結束
+
+        Returns
+        ------
+        `bool`:
+            排程執行是否已經結束
+        """
+        worker_name = entry.run_id.split(":")[0]
+        if worker_name == cls.WORKER_NAME and entry.updated_at < cls.STARTED_AT:
+            return True
+        return datetime.now() - entry.updated_at > timeout
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from typing import Sequence
+
+import sqlalchemy
+
+from .app import Database
+from .models import ScheduleDailyCheckin
+
+
+class CheckinLease:
+    """每日簽到工作的租約，讓多個程序 (或多台主機) 的 worker 能從同一個資料庫分批領取需要簽到的使用者
+
+    - worker 以租約 (lease_owner, lease_expires_at) 領取使用者，租約期間其他 worker 不會領取相同的使用者
+    - worker 當機時租約會過期，過期後其他 worker 可以重新領取
+    - 簽到完成時只有仍持有租約的 worker 能更新下次簽到時間，確保每位使用者每天最多只簽到一次
+    """
+
+    @classmethod
+    async def claim(
+        cls, owner: str, batch_size: int, lease_seconds: float
+    ) -> Sequence[ScheduleDailyCheckin]:
+        """領取一批已到簽到時間、且沒有被其他 worker 領取 (或租約已過期) 的使用者
+
+        Parameters
+        ------
+        owner: `str`
+            worker 名稱，每個 worker 必須是唯一的
+        batch_size: `int`
+            一次最多領取的使用者數量
+        lease_seconds: `float`
+            租約的有效時間 (單位：秒)
+
+        Returns
+        ------
+        `Sequence[ScheduleDailyCheckin]`:
+            本次領取到的使用者，若沒有需要簽到的使用者則回傳空的 list
+        """
+        table = ScheduleDailyCheckin
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=lease_seconds)
+        claimable = (table.next_checkin_time < now) & (
+            table.lease_owner.is_(None) | (table.lease_expires_at < now)
+        )
+        subquery = (
+            sqlalchemy.select(table.discord_id)
+            .where(claimable)
+            .order_by(table.next_checkin_time)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        # 以單一 UPDATE 敘述領取，資料庫的寫入鎖保證同一位使用者不會同時被兩個 worker 領取
+        stmt = (
+            sqlalchemy.update(table)
+            .where(table.discord_id.in_(subquery) & claimable)
+            .values({table.lease_owner: owner, table.lease_expires_at: expires_at})
+            .execution_options(synchronize_session=False)
+        )
+        async with Database.sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+        return await Database.select_all(
+            table, table.lease_owner.is_(owner) & table.lease_expires_at.is_(expires_at)
+        )
+
+    @classmethod
+    async def release(
+        cls, user: ScheduleDailyCheckin, owner: str, *, checked_in: bool = False
+    ) -> bool:
+        """釋放使用者的租約，若已完成簽到則同時將下次簽到時間更新為明日
+
+        Parameters
+        ------
+        user: `ScheduleDailyCheckin`
+            之前由 `claim` 領取的使用者
+        owner: `str`
+            領取此使用者的 worker 名稱
+        checked_in: `bool`
+            此使用者是否已完成簽到
+
+        Returns
+        ------
+        `bool`:
+            `True` 表示成功釋放；`False` 表示租約已過期並被其他 worker 領取，此時不會更新任何資料
+        """
+        table = ScheduleDailyCheckin
+        values: dict = {table.lease_owner: None, table.lease_expires_at: None}
+        if checked_in:
+            user.update_next_checkin_time()
+            values[table.next_checkin_time] = user.next_checkin_time
+        stmt = (
+            sqlalchemy.update(table)
+            .where(table.discord_id.is_(user.discord_id) & table.lease_owner.is_(owner))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        async with Database.sessionmaker() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        user.lease_owner = None
+        user.lease_expires_at = None
+        return result.rowcount > 0
@@ -1,7 +1,16 @@
+from __future__ import annotations
+
+import typing
 import zlib
 
 import aiosqlite
-from mihomo import StarrailInfoParsedV1
+
+from utility.lazy_import import lazy_module
+
+if typing.TYPE_CHECKING:
+    from mihomo import StarrailInfoParsedV1
+
+mihomo = lazy_module("mihomo")
 
 
 class StarrailShowcaseTable:
@@ -40,5 +49,5 @@ class StarrailShowcaseTable:
             row = await cursor.fetchone()
             if row is not None:
                 json_data = zlib.decompress(row["data"]).decode(encoding="utf8")
-                return StarrailInfoParsedV1.parse_raw(json_data)
+                return mihomo.StarrailInfoParsedV1.parse_raw(json_data)
             return None
@@ -5,11 +5,18 @@ import zlib
 
 import genshin
 import sqlalchemy
-from mihomo import StarrailInfoParsed
 from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column
 
+from utility.lazy_import import lazy_module
+
 from .dataclass import spiral_abyss
 
+if typing.TYPE_CHECKING:
+    from mihomo import StarrailInfoParsed
+
+# 只有星穹鐵道展示櫃會用到 mihomo，第一次使用時才載入
+mihomo = lazy_module("mihomo")
+
 
 class Base(MappedAsDataclass, DeclarativeBase):
     """資料庫 Table 基礎類別，繼承自 sqlalchemy `MappedAsDataclass`, `DeclarativeBase`"""
@@ -77,6 +84,11 @@ class ScheduleDailyCheckin(Base):
     has_zzz: Mapped[bool] = mapped_column(default=False)
     """是否要簽到絕區零"""
 
+    lease_owner: Mapped[str | None] = mapped_column(default=None)
+    """目前領取此使用者簽到工作的 worker 名稱，None 表示沒有 worker 領取"""
+    lease_expires_at: Mapped[datetime.datetime | None] = mapped_column(default=None)
+    """簽到工作租約的到期時間，過期後其他 worker 可以重新領取此使用者"""
+
     def update_next_checkin_time(self) -> None:
         """將下次簽到時間更新為明日"""
         dt = datetime.datetime
@@ -85,6 +97,25 @@ class ScheduleDailyCheckin(Base):
         ) + datetime.timedelta(days=1)
 
 
+class ScheduleJobJournal(Base):
+    """自動排程的工作日誌 Table，記錄每位使用者在排程中的處理狀態，機器人重啟後可以接續未完成的工作"""
+
+    __tablename__ = "schedule_job_journal"
+
+    job: Mapped[str] = mapped_column(primary_key=True)
+    """排程工作名稱，例：daily_reward、genshin_notes"""
+    discord_id: Mapped[int] = mapped_column(primary_key=True)
+    """使用者 Discord ID"""
+    run_id: Mapped[str]
+    """最後一次處理此使用者的排程執行 ID"""
+    state: Mapped[str]
+    """處理狀態，見 `database.JobJournal` 的狀態常數"""
+    updated_at: Mapped[datetime.datetime]
+    """最後一次更新狀態的時間"""
+    attempts: Mapped[int] = mapped_column(default=1)
+    """連續開始處理卻沒有完成 (處理途中機器人當機或重啟) 的次數"""
+
+
 class GeetestChallenge(Base):
     """用在簽到圖形驗證 Geetest 的 Challenge 值"""
 
@@ -332,7 +363,7 @@ class StarrailShowcase(Base):
     _raw_data: Mapped[bytes]
     """展示櫃 bytes 資料"""
 
-    def __init__(self, uid: int, data: StarrailInfoParsed):
+    def __init__(self, uid: int, data: "StarrailInfoParsed"):
         """初始化星穹鐵道展示櫃資料表的物件。
 
         Parameters:
@@ -347,10 +378,10 @@ class StarrailShowcase(Base):
         self._raw_data = zlib.compress(json_str.encode("utf-8"), level=5)
 
     @property
-    def data(self) -> StarrailInfoParsed:
+    def data(self) -> "StarrailInfoParsed":
         """Mihomo API 資料"""
         data = zlib.decompress(self._raw_data).decode("utf-8")
-        return StarrailInfoParsed.parse_raw(data)
+        return mihomo.StarrailInfoParsed.parse_raw(data)
 
 
 class ZZZScheduleNotes(Base):
@@ -0,0 +1,72 @@
+import datetime
+from collections import Counter
+
+import sqlalchemy
+
+from .app import Database
+from .models import ScheduleDailyCheckin
+
+
+class CheckinTimeWheel:
+    """每日自動簽到的時間輪，將一天分成 1440 個每分鐘的時段
+
+    大部分使用者會選擇整點等相同的時間簽到，使得自動簽到集中在少數幾分鐘內執行；
+    時間輪在使用者設定的時間之後的容許範圍內，選擇人數還沒超過容量的時段作為實際的簽到時間。
+    分配後的時段保存在 `ScheduleDailyCheckin.next_checkin_time`，
+    `update_next_checkin_time` 只更新日期，因此每天都維持在相同的時段
+    """
+
+    MINUTES_PER_DAY = 24 * 60
+
+    @classmethod
+    async def load(cls, exclude_user_id: int | None = None) -> Counter[int]:
+        """統計目前每個時段 (一天中的第幾分鐘) 已分配的使用者數量
+
+        Parameters
+        ------
+        exclude_user_id: `int` | `None`
+            不列入統計的使用者，用在使用者重新設定簽到時間時
+        """
+        stmt = sqlalchemy.select(ScheduleDailyCheckin.next_checkin_time)
+        if exclude_user_id is not None:
+            stmt = stmt.where(ScheduleDailyCheckin.discord_id.is_not(exclude_user_id))
+        async with Database.sessionmaker() as session:
+            times = (await session.execute(stmt)).scalars().all()
+        return Counter(t.hour * 60 + t.minute for t in times)
+
+    @classmethod
+    async def assign(
+        cls,
+        preferred: datetime.time,
+        tolerance: int,
+        capacity: int,
+        *,
+        exclude_user_id: int | None = None,
+    ) -> datetime.time:
+        """依照使用者設定的時間分配實際的簽到時段
+
+        Parameters
+        ------
+        preferred: `datetime.time`
+            使用者設定的簽到時間
+        tolerance: `int`
+            允許比設定時間延後的最大分鐘數，分配的時段不會跨過午夜
+        capacity: `int`
+            每個時段的使用者數量上限
+        exclude_user_id: `int` | `None`
+            重新設定簽到時間的使用者，不列入目前的時段統計
+
+        Returns
+        ------
+        `datetime.time`:
+            最接近設定時間且還沒額滿的時段；若範圍內的時段都已額滿，則回傳人數最少的時段
+        """
+        load = await cls.load(exclude_user_id)
+        start = preferred.hour * 60 + preferred.minute
+        end = min(start + max(tolerance, 0), cls.MINUTES_PER_DAY - 1)
+        candidates = range(start, end + 1)
+        slot = next(
+            (m for m in candidates if load[m] < capacity),
+            min(candidates, key=lambda m: load[m]),
+        )
+        return datetime.time(slot // 60, slot % 60)
@@ -1,3 +1,21 @@
+from typing import TYPE_CHECKING
+
+from utility import lazy_attributes
+
 from .api import EnkaAPI, EnkaError
-from .enka_card import generate_image
-from .showcase import Showcase, enka_assets
+
+if TYPE_CHECKING:
+    from .enka_card import generate_image
+    from .showcase import AssetsUpdater, Showcase, enka_assets, update_assets
+
+# 展示櫃與圖片需要 enkanetwork 與 PIL，第一次使用時才載入
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "generate_image": ".enka_card",
+        "AssetsUpdater": ".showcase",
+        "Showcase": ".showcase",
+        "enka_assets": ".showcase",
+        "update_assets": ".showcase",
+    },
+)
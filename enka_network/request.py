@@ -4,6 +4,8 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+from utility import CircuitBreaker
+
 from .api import EnkaAPI, EnkaError
 
 
@@ -26,7 +28,22 @@ async def fetch_enka_data(
     `Dict[str, Any]`
         將從 API 取得的資料
 
+    Raises
+    ------
+    `CircuitOpenError`
+        Enka API 持續異常，斷路器開啟中
     """
+    # UID 格式錯誤、玩家不存在與 API 狀態無關，不計入斷路器的失敗次數
+    async with CircuitBreaker.get("enka").guard(
+        ignore=(EnkaError.WrongUIDFormat, EnkaError.PlayerNotExist)
+    ):
+        return await _request_enka_data(uid, cache_data, retry)
+
+
+async def _request_enka_data(
+    uid: int, cache_data: Optional[Dict[str, Any]], retry: int
+) -> Dict[str, Any]:
+    """向 enka.network API 請求資料，失敗時重試"""
     async with aiohttp.request(
         "GET",
         EnkaAPI.get_user_data_url(uid),
@@ -48,7 +65,7 @@ async def fetch_enka_data(
                     raise EnkaError.PlayerNotExist()
             if retry > 0:  # 再次嘗試直到重試次數歸零
                 await asyncio.sleep(0.5)
-                return await fetch_enka_data(uid, cache_data, retry=retry - 1)
+                return await _request_enka_data(uid, cache_data, retry=retry - 1)
             else:
                 match resp.status:
                     case 429:
@@ -1,12 +1,16 @@
+import asyncio
 import io
+import time
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, ClassVar
 
 import discord
 import enkanetwork
+import sentry_sdk
 
 from database import Database, GenshinShowcase
-from utility import emoji
+from utility import LOG, config, emoji
 
 from .api import EnkaAPI
 from .enka_card import generate_image
@@ -15,6 +19,60 @@ from .request import fetch_enka_data
 enka_assets = enkanetwork.Assets(lang=enkanetwork.Language.CHT)
 
 
+async def update_assets() -> None:
+    """從 Enka 更新素材資料並重新載入 enka_assets，並記錄更新時間"""
+    enka = enkanetwork.EnkaNetworkAPI()
+    async with enka:
+        await enka.update_assets()
+    enkanetwork.Assets(lang=enkanetwork.Language.CHT)
+    AssetsUpdater.PATH.parent.mkdir(parents=True, exist_ok=True)
+    AssetsUpdater.PATH.touch()
+
+
+class AssetsUpdater:
+    """在第一次使用展示櫃時，於背景更新 Enka 素材資料
+
+    機器人啟動時不載入 enkanetwork 與 PIL，也不向 Enka 請求；
+    本地素材資料超過 config.enka_assets_update_interval 沒有更新時才更新，更新完成前使用本地已有的素材資料
+
+    Methods
+    -----
+    schedule()
+        素材資料需要更新時，在背景更新，每個程序只會檢查一次
+    """
+
+    PATH: ClassVar[Path] = Path("data/enka_network/assets_updated_at")
+    """記錄最後一次更新素材資料的檔案，以檔案的修改時間作為更新時間"""
+
+    _checked: ClassVar[bool] = False
+    _task: ClassVar[asyncio.Task | None] = None
+
+    @classmethod
+    def schedule(cls) -> None:
+        """素材資料需要更新時，在背景更新，每個程序只會檢查一次"""
+        if cls._checked:
+            return
+        cls._checked = True
+        if cls.PATH.exists():
+            age = time.time() - cls.PATH.stat().st_mtime
+            if age < config.enka_assets_update_interval:
+                return
+        # 保留 task 的參考，避免執行中被回收
+        cls._task = asyncio.create_task(cls._update())
+
+    @classmethod
+    async def _update(cls) -> None:
+        """更新素材資料，失敗時只記錄錯誤"""
+        start = time.perf_counter()
+        try:
+            await update_assets()
+        except Exception as e:
+            LOG.Error(f"更新 Enka 素材資料失敗：{e}")
+            sentry_sdk.capture_exception(e)
+            return
+        LOG.System(f"更新 Enka 素材資料完成，耗時 {time.perf_counter() - start:.2f} 秒")
+
+
 class Showcase:
     """使用者的角色展示櫃
 
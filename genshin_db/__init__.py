@@ -2,5 +2,7 @@
 
 from .api import API
 from .models import *
-from .parsers import parse
+from .parsers import EmbedCache, parse
 from .request import *
+from .snapshot import FolderDiff, GenshinDbSnapshot
+from .store import GenshinDbStore, RefreshResult
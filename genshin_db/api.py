@@ -3,6 +3,8 @@ from typing import Any, ClassVar, Union
 
 import aiohttp
 
+from utility import CircuitBreaker
+
 
 class API:
     """genshin-db api，能夠取得遊戲內容 json 格式資料"""
@@ -67,6 +69,66 @@ class API:
         `typing.Any`:
             json 格式的資料
         """
+        url, params = cls._build_request(
+            folder,
+            query,
+            dumpResult=dumpResult,
+            matchNames=matchNames,
+            matchAltNames=matchAltNames,
+            matchAliases=matchAliases,
+            matchCategories=matchCategories,
+            verboseCategories=verboseCategories,
+            queryLanguages=queryLanguages,
+            resultLanguage=resultLanguage,
+        )
+        data, _ = await cls._get(url, params)
+        return data
+
+    @classmethod
+    async def request_genshin_db_if_modified(
+        cls,
+        folder: Union[GenshinDBFolder, str],
+        query: str,
+        etag: str | None,
+        **options: Any,
+    ) -> tuple[Any | None, str | None]:
+        """與 request_genshin_db 相同，但帶上 If-None-Match 標頭向 genshin-db api 確認資料是否有變動
+
+        Parameters
+        ------
+        folder: `GenshinDBFolder` | `str`
+            參考 https://github.com/theBowja/genshin-db/wiki/Folders
+        query: `str`
+            範例參考 https://github.com/theBowja/genshin-db/blob/main/examples/examples.md
+        etag: `str` | `None`
+            上次回應的 ETag，為 None 時一定會取得資料
+        other options: `keyword arguments`
+            同 request_genshin_db
+
+        Returns
+        ------
+        `tuple[typing.Any | None, str | None]`:
+            (json 格式的資料, 本次回應的 ETag)；資料沒有變動 (HTTP 304) 時資料為 None
+        """
+        url, params = cls._build_request(folder, query, **options)
+        return await cls._get(url, params, etag)
+
+    @classmethod
+    def _build_request(
+        cls,
+        folder: Union[GenshinDBFolder, str],
+        query: str,
+        *,
+        dumpResult: bool = False,
+        matchNames: bool = True,
+        matchAltNames: bool = True,
+        matchAliases: bool = False,
+        matchCategories: bool = False,
+        verboseCategories: bool = False,
+        queryLanguages: str = GenshinDBLang.CHT.value,
+        resultLanguage: str = GenshinDBLang.CHT.value,
+    ) -> tuple[str, dict[str, str]]:
+        """產生請求的網址與參數"""
         folder_name = str(folder.value) if not isinstance(folder, str) else folder
         url = cls.GENSHIN_DB_URL.format(folder=folder_name)
         params = {
@@ -80,14 +142,25 @@ class API:
             "queryLanguages": queryLanguages,
             "resultLanguage": resultLanguage,
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status != 200:
-                    raise Exception(
-                        f"無法取得 genshin-db api 內容: url={url} params={str(params)}"
-                    )
-                data = await response.json(encoding="utf-8")
-                return data
+        return url, params
+
+    @classmethod
+    async def _get(
+        cls, url: str, params: dict[str, str], etag: str | None = None
+    ) -> tuple[Any | None, str | None]:
+        """送出請求，回傳 (json 格式的資料, ETag)；資料沒有變動 (HTTP 304) 時資料為 None"""
+        headers = {"If-None-Match": etag} if etag else {}
+        async with CircuitBreaker.get("genshin_db").guard():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, params=params, headers=headers) as response:
+                    if etag and response.status == 304:
+                        return None, etag
+                    if response.status != 200:
+                        raise Exception(
+                            f"無法取得 genshin-db api 內容: url={url} params={str(params)}"
+                        )
+                    data = await response.json(encoding="utf-8")
+                    return data, response.headers.get("ETag")
 
     @classmethod
     def get_image_url(cls, image_name: str) -> str:
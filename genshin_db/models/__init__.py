@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from ..search_index import SearchIndex
 
 from .achievements import Achievement, Achievements
 from .artifacts import Artifact, Artifacts
-from .base import GenshinDbBase, GenshinDbListBase
+from .base import GenshinDbBase, GenshinDbListBase, normalize_name
 from .characters import Character, Characters
 from .constellations import Constellation, Constellations
 from .foods import Food, Foods
@@ -39,16 +41,68 @@ class GenshinDbAllData:
     talents: Talents
     tcg_cards: TCGCards
     weapons: Weapons
+    search_indexes: dict[str, SearchIndex] = field(default_factory=dict, init=False)
+    """自動完成使用的搜尋索引，以類別 (characters、weapons、artifacts、items、achievements、tcg_cards) 為鍵"""
+    _name_index: dict[str, tuple[str, GenshinDbItem]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @property
+    def categories(self) -> list[tuple[str, list[GenshinDbItem]]]:
+        """各類別名稱與物件列表，名稱重複時依照此順序決定 find 回傳的物件"""
+        return [
+            ("achievements", self.achievements.list),
+            ("tcg_cards", self.tcg_cards.list),
+            ("weapons", self.weapons.list),
+            ("foods", self.foods.list),
+            ("materials", self.materials.list),
+            ("artifacts", self.artifacts.list),
+            ("characters", self.characters.list),
+            ("constellations", self.constellations.list),
+            ("talents", self.talents.list),
+        ]
+
+    def build_index(self) -> None:
+        """建立所有資料的名稱索引與搜尋索引
+
+        全域名稱索引的鍵依照以下優先順序加入，同一個鍵已經存在時保留先加入的物件：
+        1. 正式名稱
+        2. 別名 (例：名稱重複的物品的編號別名)
+        3. 上述名稱轉為小寫並移除空白後的名稱
+        同一個優先順序內依照 categories 的類別順序
+        """
+        index: dict[str, tuple[str, GenshinDbItem]] = {}
+        for category, items in self.categories:
+            for item in items:
+                index.setdefault(item.name, (category, item))
+        for category, items in self.categories:
+            for item in items:
+                for alt_name in item.alt_names:
+                    index.setdefault(alt_name, (category, item))
+        for key, entry in list(index.items()):
+            index.setdefault(normalize_name(key), entry)
+        self._name_index = index
+
+        # 其他類別經由全域名稱索引尋找，只有搜尋指令直接查詢的類別需要各自的名稱索引
+        for data in (self.artifacts, self.characters, self.constellations, self.talents):
+            data.build_index()
+
+        self.search_indexes = {
+            "characters": SearchIndex(item.name for item in self.characters.list),
+            "weapons": SearchIndex(item.name for item in self.weapons.list),
+            "artifacts": SearchIndex(item.name for item in self.artifacts.list),
+            "items": SearchIndex(item.name for item in self.materials.list + self.foods.list),
+            "achievements": SearchIndex(item.name for item in self.achievements.list),
+            "tcg_cards": SearchIndex(item.name for item in self.tcg_cards.list),
+        }
+
+    def lookup(self, item_name: str) -> tuple[str, GenshinDbItem] | None:
+        """依照名稱或別名尋找物件，回傳 (類別, 物件)，找不到時回傳 None"""
+        if len(self._name_index) == 0:
+            self.build_index()
+        return self._name_index.get(item_name) or self._name_index.get(normalize_name(item_name))
 
     def find(self, item_name: str) -> GenshinDbItem | None:
-        return (
-            self.achievements.find(item_name)
-            or self.tcg_cards.find(item_name)
-            or self.weapons.find(item_name)
-            or self.foods.find(item_name)
-            or self.materials.find(item_name)
-            or self.artifacts.find(item_name)
-            or self.characters.find(item_name)
-            or self.constellations.find(item_name)
-            or self.talents.find(item_name)
-        )
+        """依照名稱或別名尋找物件，找不到時回傳 None"""
+        entry = self.lookup(item_name)
+        return entry[1] if entry is not None else None
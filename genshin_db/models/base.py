@@ -1,13 +1,23 @@
-from typing import Dict, Generic, List, TypeVar
+from typing import Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, PrivateAttr
 
 
+def normalize_name(name: str) -> str:
+    """將名稱轉為小寫並移除空白，讓使用者輸入的名稱不需要與原名稱完全相同"""
+    return "".join(name.lower().split())
+
+
 class GenshinDbBase(BaseModel):
     """由 genshin-db 最高層物件 model 繼承"""
 
     name: str
 
+    @property
+    def alt_names(self) -> List[str]:
+        """名稱以外，也可以用來尋找此物件的別名"""
+        return []
+
 
 T = TypeVar("T", bound=GenshinDbBase)
 
@@ -16,16 +26,19 @@ class GenshinDbListBase(BaseModel, Generic[T]):
     """由 genshin-db 最高層物件列表 model 繼承，提供依照名稱尋找特定物件的方法"""
 
     __root__: List[T]
-    _name_item_dict: Dict[str, T] = PrivateAttr({})
+    _name_item_dict: Optional[Dict[str, T]] = PrivateAttr(None)
 
     @property
     def list(self) -> List[T]:
         """所有物件列表"""
         return self.__root__
 
+    def build_index(self) -> None:
+        """建立名稱索引，之後的 find 不需要再逐一建立"""
+        self._name_item_dict = {item.name: item for item in self.list}
+
     def find(self, name: str) -> T | None:
         """依照名稱尋找特定物件"""
-        if self._name_item_dict == {}:
-            for item in self.list:
-                self._name_item_dict[item.name] = item
-        return self._name_item_dict.get(name)
+        if self._name_item_dict is None:
+            self.build_index()
+        return self._name_item_dict.get(name)  # type: ignore
@@ -32,6 +32,10 @@ class Material(GenshinDbBase):
     def remove_empty_version(cls, v: str) -> Optional[str]:
         return None if v == "" else v
 
+    @property
+    def alt_names(self) -> List[str]:
+        return [self.dupealias] if self.dupealias else []
+
 
 class Materials(GenshinDbListBase[Material]):
     __root__: List[Material]
@@ -1,4 +1,5 @@
-from typing import Callable, Type
+import asyncio
+from typing import Any, Callable, ClassVar, Iterable, Type
 
 import discord
 
@@ -29,11 +30,66 @@ def parse(model) -> discord.Embed:
     }
     parser = _map.get(type(model))
     if parser is not None:
-        return parser(model)
+        return EmbedCache.get(model, parser)
     else:
         return EmbedTemplate.error("發生錯誤，無法解析資料")
 
 
+class EmbedCache:
+    """parse 結果的快取，genshin-db 資料一天才更新一次，同一個物件不需要每次搜尋都重新產生 Embed
+
+    - 以物件本身 (id 與 is 比對) 為鍵，保存 Embed 的 dict 格式，每次取出時產生新的 Embed，呼叫端可以自由修改
+    - 資料更新後以新的資料版本呼叫 reset 清空快取，並可用 prewarm 在背景預先產生所有物件的 Embed
+
+    Methods
+    -----
+    get(model: `Any`, parser: `Callable`)
+        從快取取得 Embed，沒有時呼叫 parser 產生
+    reset(version: `str`)
+        資料版本改變時清空快取
+    prewarm(models: `Iterable`, version: `str`)
+        在背景預先產生 Embed
+    """
+
+    _cache: ClassVar[dict[int, tuple[Any, dict]]] = {}
+    _version: ClassVar[str | None] = None
+
+    @classmethod
+    def get(cls, model: Any, parser: Callable[[Any], discord.Embed]) -> discord.Embed:
+        entry = cls._cache.get(id(model))
+        # 同時保存物件本身並以 is 比對，避免物件被回收後 id 被新物件重複使用
+        if entry is not None and entry[0] is model:
+            return discord.Embed.from_dict(entry[1])
+        embed = parser(model)
+        cls._cache[id(model)] = (model, embed.to_dict())
+        return embed
+
+    @classmethod
+    def reset(cls, version: str) -> None:
+        """資料版本改變時清空快取"""
+        if version != cls._version:
+            cls._cache.clear()
+            cls._version = version
+
+    @classmethod
+    async def prewarm(cls, models: Iterable[Any], version: str) -> None:
+        """預先產生 Embed，每產生一批就讓出 event loop，期間資料版本改變時停止
+
+        Parameters
+        ------
+        models: `Iterable`
+            要預先產生 Embed 的 genshin-db model 物件
+        version: `str`
+            這些物件所屬的資料版本
+        """
+        for i, model in enumerate(models):
+            if cls._version != version:
+                return
+            parse(model)
+            if i % 50 == 0:
+                await asyncio.sleep(0)
+
+
 class TCGCardParser:
     """七聖召喚"""
 
@@ -1,94 +1,47 @@
-from typing import Any, Tuple
+import asyncio
+from typing import Any
 
 from .api import API
-from .models import (
-    Achievements,
-    Artifacts,
-    Characters,
-    Constellations,
-    Foods,
-    GenshinDbAllData,
-    Materials,
-    Talents,
-    TCGCards,
-    Weapons,
-)
+from .models import GenshinDbAllData
+from .snapshot import GenshinDbSnapshot
 
 
-async def _request(folder: API.GenshinDBFolder) -> Any:
-    return await API.request_genshin_db(
-        folder, "names", matchCategories=True, verboseCategories=True
+async def _request(folder: API.GenshinDBFolder, etag: str | None) -> tuple[Any | None, str | None]:
+    return await API.request_genshin_db_if_modified(
+        folder, "names", etag, matchCategories=True, verboseCategories=True
     )
 
 
-async def fetch_cards() -> TCGCards:
-    """取得七聖召喚卡牌的資料，並將資料傳入卡牌模型解析"""
+async def fetch_snapshot(previous: GenshinDbSnapshot | None = None) -> GenshinDbSnapshot:
+    """同時向 genshin-db api 請求所有資料夾的資料，組成新的快照
 
-    action_cards = await _request(API.GenshinDBFolder.TCG_ACTION_CARDS)
-    character_cards = await _request(API.GenshinDBFolder.TCG_CHARACTER_CARDS)
-    summons = await _request(API.GenshinDBFolder.TCG_SUMMONS)
+    Parameters
+    ------
+    previous: `GenshinDbSnapshot` | `None`
+        上一份快照，請求時帶上其 ETag，資料沒有變動的資料夾直接沿用上一份快照的資料
 
-    return TCGCards(action_cards, character_cards, summons)
-
-
-async def fetch_achievements() -> Achievements:
-    """取得成就資料，並傳入模型解析"""
-    data = await _request(API.GenshinDBFolder.ACHIEVEMENTS)
-    return Achievements.parse_obj(data)
-
-
-async def fetch_characters() -> Tuple[Characters, Constellations, Talents]:
-    """取得角色、天賦、命座資料，並傳入模型解析"""
-    data = await _request(API.GenshinDBFolder.CHARACTERS)
-    characters = Characters.parse_obj(data)
-
-    data = await _request(API.GenshinDBFolder.CONSTELLATIONS)
-    constellations = Constellations.parse_obj(data)
-
-    data = await _request(API.GenshinDBFolder.TALENTS)
-    talents = Talents.parse_obj(data)
-
-    return characters, constellations, talents
-
-
-async def fetch_materials() -> Tuple[Materials, Foods]:
-    """取得物品、食物資料，並傳入模型解析"""
-    data = await _request(API.GenshinDBFolder.MATERIALS)
-    materials = Materials.parse_obj(data)
-
-    data = await _request(API.GenshinDBFolder.FOODS)
-    foods = Foods.parse_obj(data)
-
-    return materials, foods
-
-
-async def fetch_equipments() -> Tuple[Artifacts, Weapons]:
-    """取得聖遺物、武器資料，並傳入模型解析"""
-    data = await _request(API.GenshinDBFolder.ARTIFACTS)
-    artifacts = Artifacts.parse_obj(data)
-
-    data = await _request(API.GenshinDBFolder.WEAPONS)
-    weapons = Weapons.parse_obj(data)
+    Returns
+    ------
+    `GenshinDbSnapshot`:
+        新的快照，尚未寫入硬碟
+    """
+    folders = list(API.GenshinDBFolder)
+    etags = previous.etags if previous is not None else {}
+    results = await asyncio.gather(
+        *[_request(folder, etags.get(folder.value)) for folder in folders]
+    )
 
-    return artifacts, weapons
+    snapshot = GenshinDbSnapshot(data={})
+    for folder, (data, etag) in zip(folders, results):
+        if data is None and previous is not None:  # HTTP 304 Not Modified
+            data = previous.data[folder.value]
+        snapshot.data[folder.value] = data
+        if etag is not None:
+            snapshot.etags[folder.value] = etag
+    return snapshot
 
 
 async def fetch_all() -> GenshinDbAllData:
     """取得所有 genshin-db 資料，解析後封裝"""
-    tcg_cards = await fetch_cards()
-    achievements = await fetch_achievements()
-    characters, constellations, talents = await fetch_characters()
-    materials, foods = await fetch_materials()
-    artifacts, weapons = await fetch_equipments()
-
-    return GenshinDbAllData(
-        achievements,
-        artifacts,
-        characters,
-        constellations,
-        foods,
-        materials,
-        talents,
-        tcg_cards,
-        weapons,
-    )
+    snapshot = await fetch_snapshot()
+    return snapshot.parse()
@@ -0,0 +1,137 @@
+import random
+from array import array
+from collections import Counter
+from typing import Iterable
+
+
+class _TrieNode:
+    """前綴樹的節點，ids 為所有以此節點為前綴的名稱編號 (已依照排名排序)"""
+
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.ids: array[int] = array("I")
+
+
+class SearchIndex:
+    """依照名稱搜尋項目的索引，用於斜線指令的自動完成
+
+    資料載入時建立一次，之後每次搜尋只需要查表：
+    - 前綴樹：找出以輸入文字開頭的名稱
+    - 字元二元組 (bigram) 倒排索引：中文名稱沒有空白分詞，以相鄰兩個字元為單位，
+      取輸入文字所有二元組的交集找出包含輸入文字的名稱；輸入只有一個字時改用單一字元的索引
+    - 找不到足夠的結果時，依照共同二元組的比例找出相近的名稱 (例：輸入錯一個字)
+
+    排名依序為：前綴相符 > 包含輸入文字 > 相近，同一類中名稱越短越前面
+
+    Methods
+    -----
+    search(query: `str`, limit: `int`)
+        搜尋名稱，回傳依照排名排序的名稱列表
+    """
+
+    FUZZY_THRESHOLD: float = 0.5
+    """相近名稱至少要包含輸入文字的二元組比例"""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        # 名稱越短、與輸入文字越接近，相同長度時依照名稱排序，讓結果固定
+        self.names: list[str] = sorted(set(names), key=lambda name: (len(name), name))
+        # 大部分名稱為中文，轉小寫後與原名稱相同時共用同一個字串
+        self._normalized: list[str] = [
+            name if (lower := name.lower()) == name else lower for name in self.names
+        ]
+        self._trie = _TrieNode()
+        # 名稱編號以 array 保存，比 list[int] 少佔用一半以上的記憶體
+        self._chars: dict[str, array[int]] = {}
+        self._bigrams: dict[str, array[int]] = {}
+
+        for i, name in enumerate(self._normalized):
+            node = self._trie
+            for char in name:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.append(i)
+            for char in set(name):
+                self._chars.setdefault(char, array("I")).append(i)
+            for bigram in self._to_bigrams(name):
+                self._bigrams.setdefault(bigram, array("I")).append(i)
+
+    @staticmethod
+    def _to_bigrams(text: str) -> set[str]:
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        """搜尋名稱
+
+        Parameters
+        ------
+        query: `str`
+            使用者輸入的文字，不區分大小寫；空字串時隨機回傳名稱
+        limit: `int`
+            最多回傳的數量
+
+        Returns
+        ------
+        `list[str]`:
+            依照排名排序的名稱列表
+        """
+        query = query.strip().lower()
+        if query == "":
+            return sorted(random.sample(self.names, k=min(limit, len(self.names))))
+
+        results: list[int] = []
+        seen: set[int] = set()
+
+        def add(ids: Iterable[int]) -> bool:
+            """加入結果，達到數量上限時回傳 True"""
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    results.append(i)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if add(self._prefix(query)):
+            return self._to_names(results)
+        if add(self._substring(query)):
+            return self._to_names(results)
+        add(self._fuzzy(query))
+        return self._to_names(results)
+
+    def _to_names(self, ids: list[int]) -> list[str]:
+        return [self.names[i] for i in ids]
+
+    def _prefix(self, query: str) -> Iterable[int]:
+        node = self._trie
+        for char in query:
+            child = node.children.get(char)
+            if child is None:
+                return []
+            node = child
+        return node.ids
+
+    def _substring(self, query: str) -> Iterable[int]:
+        if len(query) == 1:
+            return self._chars.get(query, ())
+        postings = [self._bigrams.get(bigram) for bigram in self._to_bigrams(query)]
+        if any(p is None for p in postings):
+            return []
+        # 從最短的倒排列表開始取交集，最後確認確實包含輸入文字 (二元組順序可能不同)
+        postings.sort(key=len)  # type: ignore
+        candidates = set(postings[0])  # type: ignore
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)  # type: ignore
+        return sorted(i for i in candidates if query in self._normalized[i])
+
+    def _fuzzy(self, query: str) -> list[int]:
+        bigrams = self._to_bigrams(query)
+        if len(bigrams) == 0:
+            return []
+        counter: Counter[int] = Counter()
+        for bigram in bigrams:
+            counter.update(self._bigrams.get(bigram, ()))
+        threshold = self.FUZZY_THRESHOLD * len(bigrams)
+        matches = [(count, i) for i, count in counter.items() if count >= threshold]
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return [i for _, i in matches]
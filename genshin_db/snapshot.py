@@ -0,0 +1,166 @@
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar, NamedTuple
+
+from .api import API
+from .models import (
+    Achievements,
+    Artifacts,
+    Characters,
+    Constellations,
+    Foods,
+    GenshinDbAllData,
+    Materials,
+    Talents,
+    TCGCards,
+    Weapons,
+)
+
+Folder = API.GenshinDBFolder
+
+INTERN_MAX_LENGTH = 64
+"""長度不超過此值的字串會被 intern (例：類別、元素、素材名稱)，重複出現時只保存一份"""
+
+
+def _intern_strings(obj: Any) -> Any:
+    """將 json 資料內的短字串與字典鍵 intern，直接修改傳入的 list 與 dict"""
+    if isinstance(obj, str):
+        return sys.intern(obj) if len(obj) <= INTERN_MAX_LENGTH else obj
+    if isinstance(obj, list):
+        for i, value in enumerate(obj):
+            obj[i] = _intern_strings(value)
+    elif isinstance(obj, dict):
+        for key in list(obj.keys()):
+            obj[sys.intern(key)] = _intern_strings(obj.pop(key))
+    return obj
+
+
+class FolderDiff(NamedTuple):
+    """資料夾內新增、移除、內容變動的項目數量"""
+
+    added: int
+    removed: int
+    changed: int
+
+
+@dataclass
+class GenshinDbSnapshot:
+    """genshin-db api 所有資料夾的原始資料快照，保存在硬碟上，讓機器人啟動時不必等待 api 請求
+
+    快照保存的是 api 回應的 json 資料，讀取時再傳入模型解析，
+    模型欄位改變時 (VERSION 不同) 舊的快照不會被讀取，避免解析出錯誤的資料
+
+    Methods
+    -----
+    load()
+        從硬碟讀取快照
+    save()
+        將快照寫入硬碟
+    parse()
+        將原始資料傳入模型解析
+    diff(previous: `GenshinDbSnapshot` | `None`)
+        與上一份快照比較，計算各資料夾變動的項目數量
+    """
+
+    VERSION: ClassVar[int] = 1
+    """快照格式與模型的版本，修改模型欄位時需要增加"""
+
+    PATH: ClassVar[Path] = Path("data/genshin_db/snapshot.json")
+    """快照檔案的路徑"""
+
+    data: dict[str, Any]
+    """各資料夾的原始 json 資料，以資料夾名稱為鍵"""
+    etags: dict[str, str] = field(default_factory=dict)
+    """各資料夾回應的 ETag，用於下次請求時確認資料是否有變動"""
+    created_at: float = field(default_factory=time.time)
+    """快照建立的時間 (Unix timestamp)"""
+
+    @property
+    def digest(self) -> str:
+        """原始資料的雜湊值，用來比較兩份快照的內容是否相同"""
+        content = json.dumps(self.data, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @classmethod
+    def load(cls) -> "GenshinDbSnapshot | None":
+        """從硬碟讀取快照，檔案不存在、版本不同或缺少資料夾時回傳 None"""
+        if not cls.PATH.exists():
+            return None
+        with open(cls.PATH, "r", encoding="utf-8") as f:
+            content: dict[str, Any] = json.load(f)
+        if content.get("version") != cls.VERSION:
+            return None
+        snapshot = cls(content["data"], content["etags"], content["created_at"])
+        if any(folder.value not in snapshot.data for folder in Folder):
+            return None
+        return snapshot
+
+    def save(self) -> None:
+        """將快照寫入硬碟，先寫入暫存檔再取代原檔案，避免寫入中斷時留下不完整的快照"""
+        self.PATH.parent.mkdir(parents=True, exist_ok=True)
+        content = {
+            "version": self.VERSION,
+            "created_at": self.created_at,
+            "etags": self.etags,
+            "data": self.data,
+        }
+        temp_path = self.PATH.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False)
+        temp_path.replace(self.PATH)
+
+    def parse(self, intern_strings: bool = True) -> GenshinDbAllData:
+        """將原始資料傳入模型解析，封裝成 GenshinDbAllData
+
+        Parameters
+        ------
+        intern_strings: `bool`
+            解析前是否將重複的短字串 intern，讓模型內相同的字串共用同一個物件以節省記憶體
+        """
+        data = _intern_strings(self.data) if intern_strings else self.data
+        return GenshinDbAllData(
+            achievements=Achievements.parse_obj(data[Folder.ACHIEVEMENTS.value]),
+            artifacts=Artifacts.parse_obj(data[Folder.ARTIFACTS.value]),
+            characters=Characters.parse_obj(data[Folder.CHARACTERS.value]),
+            constellations=Constellations.parse_obj(data[Folder.CONSTELLATIONS.value]),
+            foods=Foods.parse_obj(data[Folder.FOODS.value]),
+            materials=Materials.parse_obj(data[Folder.MATERIALS.value]),
+            talents=Talents.parse_obj(data[Folder.TALENTS.value]),
+            tcg_cards=TCGCards(
+                data[Folder.TCG_ACTION_CARDS.value],
+                data[Folder.TCG_CHARACTER_CARDS.value],
+                data[Folder.TCG_SUMMONS.value],
+            ),
+            weapons=Weapons.parse_obj(data[Folder.WEAPONS.value]),
+        )
+
+    def diff(self, previous: "GenshinDbSnapshot | None") -> dict[str, FolderDiff]:
+        """與上一份快照比較，以項目名稱對應，計算各資料夾新增、移除、內容變動的項目數量
+
+        Parameters
+        ------
+        previous: `GenshinDbSnapshot` | `None`
+            上一份快照，為 None 時所有項目皆視為新增
+
+        Returns
+        ------
+        `dict[str, FolderDiff]`:
+            以資料夾名稱為鍵，只包含有變動的資料夾
+        """
+        result: dict[str, FolderDiff] = {}
+        for folder, items in self.data.items():
+            old_items = previous.data.get(folder, []) if previous is not None else []
+            if items == old_items:
+                continue
+            new = {item["name"]: item for item in items}
+            old = {item["name"]: item for item in old_items}
+            result[folder] = FolderDiff(
+                added=len(new.keys() - old.keys()),
+                removed=len(old.keys() - new.keys()),
+                changed=sum(1 for name in new.keys() & old.keys() if new[name] != old[name]),
+            )
+        return result
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Iterator
+
+from utility import LOG, config
+from utility.prometheus import Metrics
+
+from .models import GenshinDbAllData
+from .parsers import EmbedCache
+from .request import fetch_snapshot
+from .snapshot import FolderDiff, GenshinDbSnapshot
+
+
+@dataclass
+class RefreshResult:
+    """更新 genshin-db 資料的結果"""
+
+    duration: float
+    """更新花費的時間（單位：秒）"""
+    updated: bool = False
+    """是否替換了使用中的資料"""
+    changes: dict[str, FolderDiff] = field(default_factory=dict)
+    """各資料夾變動的項目數量"""
+
+    def __str__(self) -> str:
+        if self.updated is False:
+            return f"genshin-db 資料沒有變動 (耗時 {self.duration:.2f} 秒)"
+        changes = "、".join(
+            f"{folder} +{diff.added} -{diff.removed} ~{diff.changed}"
+            for folder, diff in self.changes.items()
+        )
+        return f"genshin-db 資料已更新 (耗時 {self.duration:.2f} 秒)：{changes}"
+
+
+class GenshinDbStore:
+    """保存目前使用中的 genshin-db 資料，並負責從快照載入與定時更新
+
+    更新時在背景取得並解析新資料、建立索引，完成後才一次替換，
+    替換前使用者仍然使用舊資料；更新失敗時保留舊資料，不影響搜尋功能
+
+    記憶體內只保留解析後的資料，原始 json 資料只存在硬碟上的快照，更新時才讀取用來比較
+
+    Methods
+    -----
+    data()
+        取得目前使用中的資料
+    load_snapshot()
+        從硬碟上的快照載入資料
+    refresh()
+        向 genshin-db api 取得最新資料，有變動時替換
+    """
+
+    _version: ClassVar[str | None] = None
+    """使用中資料的版本 (快照的雜湊值)"""
+    _data: ClassVar[GenshinDbAllData | None] = None
+    _lock: ClassVar[asyncio.Lock | None] = None
+    _prewarm_task: ClassVar[asyncio.Task | None] = None
+
+    @classmethod
+    def data(cls) -> GenshinDbAllData | None:
+        """取得目前使用中的資料，還沒有任何資料時回傳 None；
+        呼叫端在同一次處理中應保存回傳值，而不是重複呼叫，以免前後使用到不同版本的資料
+        """
+        return cls._data
+
+    @classmethod
+    async def load_snapshot(cls) -> bool:
+        """從硬碟上的快照載入資料，已經有資料時不做任何事
+
+        Returns
+        ------
+        `bool`:
+            是否有可用的資料
+        """
+        if cls._data is not None:
+            return True
+        try:
+            snapshot = await asyncio.to_thread(GenshinDbSnapshot.load)
+            if snapshot is None:
+                return False
+            version = await asyncio.to_thread(lambda: snapshot.digest)
+            data = await asyncio.to_thread(cls._build, snapshot)
+        except Exception as e:
+            LOG.Error(f"genshin-db 快照讀取失敗：{e}")
+            return False
+        cls._swap(version, data)
+        return True
+
+    @classmethod
+    async def refresh(cls) -> RefreshResult:
+        """向 genshin-db api 取得最新資料，與目前的資料比較，有變動時解析並替換，同時寫入快照；
+        同一時間只會有一個更新在進行
+
+        Returns
+        ------
+        `RefreshResult`:
+            更新花費的時間與各資料夾變動的項目數量
+
+        Raises
+        ------
+        `Exception`:
+            請求或解析失敗，此時仍然保留原本的資料
+        """
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            start = time.perf_counter()
+            previous = await asyncio.to_thread(cls._load_previous)
+            snapshot = await fetch_snapshot(previous)
+            version = await asyncio.to_thread(lambda: snapshot.digest)
+            if version == cls._version:
+                if previous is None or snapshot.etags != previous.etags:
+                    await asyncio.to_thread(snapshot.save)
+                result = RefreshResult(time.perf_counter() - start)
+            else:
+                changes = await asyncio.to_thread(snapshot.diff, previous)
+                data = await asyncio.to_thread(cls._build, snapshot)
+                cls._swap(version, data)
+                await asyncio.to_thread(snapshot.save)
+                result = RefreshResult(time.perf_counter() - start, True, changes)
+            cls._export(result)
+            return result
+
+    @classmethod
+    def _load_previous(cls) -> GenshinDbSnapshot | None:
+        """讀取硬碟上與使用中資料相同版本的快照，用來沿用 ETag 與比較變動；讀取失敗或版本不同時回傳 None"""
+        try:
+            snapshot = GenshinDbSnapshot.load()
+        except Exception:
+            return None
+        if snapshot is None or snapshot.digest != cls._version:
+            return None
+        return snapshot
+
+    @staticmethod
+    def _build(snapshot: GenshinDbSnapshot) -> GenshinDbAllData:
+        """解析快照並建立索引，在其他執行緒執行，不阻塞 event loop"""
+        data = snapshot.parse()
+        data.build_index()
+        return data
+
+    @classmethod
+    def _swap(cls, version: str, data: GenshinDbAllData) -> None:
+        """替換使用中的資料，中間沒有 await，其他協程不會看到替換到一半的狀態"""
+        cls._version = version
+        cls._data = data
+        EmbedCache.reset(version)
+        if config.genshin_db_prewarm_embeds:
+            cls._prewarm_task = asyncio.create_task(
+                EmbedCache.prewarm(cls._iter_items(data), version)
+            )
+
+    @staticmethod
+    def _iter_items(data: GenshinDbAllData) -> Iterator[Any]:
+        """所有會在搜尋結果顯示的物件，包含聖遺物的各部位"""
+        for _, items in data.categories:
+            yield from items
+        for artifact in data.artifacts.list:
+            for part in (
+                artifact.flower,
+                artifact.plume,
+                artifact.sands,
+                artifact.goblet,
+                artifact.circlet,
+            ):
+                if part is not None:
+                    yield part
+
+    @classmethod
+    def _export(cls, result: RefreshResult) -> None:
+        """將更新結果輸出到 Prometheus"""
+        Metrics.GENSHIN_DB_REFRESH_SECONDS.set(result.duration)
+        Metrics.GENSHIN_DB_CHANGED_ITEMS.clear()
+        for folder, diff in result.changes.items():
+            for change, count in diff._asdict().items():
+                Metrics.GENSHIN_DB_CHANGED_ITEMS.labels(folder, change).set(count)
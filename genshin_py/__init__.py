@@ -1,4 +1,22 @@
+from typing import TYPE_CHECKING
+
+from utility import lazy_attributes
+
 from .client import *
 from .errors import *
-from .painter import *
 from .parser import *
+
+if TYPE_CHECKING:
+    from .painter import *
+
+# 繪圖模組在第一次呼叫繪圖函式時才載入，排程簽到等不需要繪圖的程式不必載入 PIL 與 genshinpyrail
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "draw_abyss_card": ".painter",
+        "draw_character_list": ".painter",
+        "draw_exploration_card": ".painter",
+        "draw_record_card": ".painter",
+        "draw_starrail_forgottenhall_card": ".painter",
+    },
+)
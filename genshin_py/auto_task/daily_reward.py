@@ -1,40 +1,76 @@
 import asyncio
-from datetime import datetime
-from typing import Any, ClassVar, Final
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Final
 
 import aiohttp
 import discord
+import genshin
 import sentry_sdk
 from discord.ext import commands
 
 import database
-from database import Database, GeetestChallenge, ScheduleDailyCheckin, User
-from utility import LOG, EmbedTemplate, config
+from database import (
+    CheckinLease,
+    Database,
+    GeetestChallenge,
+    JobJournal,
+    ScheduleDailyCheckin,
+    User,
+)
+from utility import LOG, CircuitOpenError, EmbedTemplate, config
 
-from .. import claim_daily_reward
+from .. import claim_daily_reward, get_region
+from ..rate_controller import RateController
+from ..retry_policy import RetryPolicy
+from .notification_queue import Notification, NotificationQueue
 
 
 class DailyReward:
     """自動排程的類別
 
+    每個簽到主機 (本地或遠端 API) 各自以租約從資料庫分批領取需要簽到的使用者，
+    因此可以同時在多個機器人程序執行，彼此不會重複簽到同一位使用者；
+    每位使用者的處理狀態記錄在工作日誌，機器人重啟後由 resume 接續
+
     Methods
     -----
     execute(bot: `commands.Bot`)
         執行自動排程
+    resume()
+        接續重啟前中斷的簽到工作
     """
 
-    _lock: ClassVar[asyncio.Lock] = asyncio.Lock()
-    # 統計簽到人數
-    _total: ClassVar[dict[str, int]] = {}
-    """簽到的總人數 dict[host, count]"""
-    _honkai_count: ClassVar[dict[str, int]] = {}
-    """簽到崩壞3的人數 dict[host, count]"""
-    _starrail_count: ClassVar[dict[str, int]] = {}
-    """簽到星穹鐵道的人數 dict[host, count]"""
-    _zzz_count: ClassVar[dict[str, int]] = {}
-    """簽到絕區零的人數 dict[host, count]"""
-    _themis_count: ClassVar[dict[str, int]] = {}
-    """簽到未定事件簿的人數 dict[host, count]"""
+    JOB: Final[str] = "daily_reward"
+    """工作日誌中的排程工作名稱"""
+
+    @classmethod
+    async def resume(cls) -> None:
+        """機器人啟動時，依照工作日誌接續重啟前中斷的簽到工作
+
+        - 已向 Hoyolab 簽到但還沒寫入下次簽到時間的使用者，直接更新下次簽到時間，不再重複簽到
+        - 處理到一半的使用者，釋放已結束程序的租約，讓使用者不用等租約過期就能重新簽到
+        """
+        resumed = released = 0
+        for entry in await JobJournal.unfinished(cls.JOB):
+            # 其他 worker 處理中的使用者在租約過期前不接手
+            lease = timedelta(seconds=config.schedule_checkin_lease_seconds)
+            if not JobJournal.is_dead_run(entry, lease):
+                continue
+            user = await Database.select_one(
+                ScheduleDailyCheckin, ScheduleDailyCheckin.discord_id.is_(entry.discord_id)
+            )
+            if entry.state == JobJournal.CLAIMED:
+                if user is not None:
+                    await CheckinLease.release(user, entry.run_id, checked_in=True)
+                await JobJournal.mark(cls.JOB, entry.discord_id, JobJournal.DONE)
+                resumed += 1
+            else:  # STARTED 狀態保留在日誌中，下次處理時會累計中斷次數
+                if user is not None and await CheckinLease.release(user, entry.run_id):
+                    released += 1
+        LOG.System(f"自動簽到工作日誌：接續 {resumed} 位已簽到的使用者，釋放 {released} 個租約")
 
     @classmethod
     async def execute(cls, bot: commands.Bot):
@@ -45,72 +81,52 @@ class DailyReward:
         bot: `commands.Bot`
             Discord 機器人客戶端
         """
-        if cls._lock.locked():
-            return
-        await cls._lock.acquire()
         try:
             LOG.System("每日自動簽到開始")
 
-            # 初始化
-            queue: asyncio.Queue[ScheduleDailyCheckin] = asyncio.Queue()
-            cls._total = {}
-            cls._honkai_count = {}
-            cls._starrail_count = {}
-            cls._zzz_count = {}
-            cls._themis_count = {}
-            daily_users = await Database.select_all(ScheduleDailyCheckin)
-
-            # 將所有需要簽到的使用者放入佇列 (Producer)
-            for user in daily_users:
-                if user.next_checkin_time < datetime.now():
-                    await queue.put(user)
-
-            # 建立本地簽到任務 (Consumer)
-            tasks = [asyncio.create_task(cls._claim_daily_reward_task(queue, "LOCAL", bot))]
-            # 建立遠端簽到任務 (Consumer)
-            for host in config.daily_reward_api_list:
-                tasks.append(asyncio.create_task(cls._claim_daily_reward_task(queue, host, bot)))
-
-            await queue.join()  # 等待所有使用者簽到完成
-            for task in tasks:  # 關閉簽到任務
-                task.cancel()
+            # 建立本地與遠端簽到任務，每個任務各自從資料庫領取使用者，直到沒有需要簽到的使用者
+            hosts = ["LOCAL", *config.daily_reward_api_list]
+            # 統計簽到人數 dict[host, Counter[遊戲]]
+            stats: dict[str, Counter[str]] = {host: Counter() for host in hosts}
+            # 自動排程不受 Discord 互動時限影響，使用較長的重試時間
+            with RetryPolicy.SCHEDULER.use():
+                await asyncio.gather(
+                    *[cls._claim_daily_reward_task(host, bot, stats[host]) for host in hosts]
+                )
+            await NotificationQueue.join()
 
+            _total = {host: s["total"] for host, s in stats.items()}
             _log_message = (
-                f"自動簽到結束：總共 {sum(cls._total.values())} 人簽到，"
-                + f"其中 {sum(cls._honkai_count.values())} 人簽到崩壞3、"
-                + f"{sum(cls._starrail_count.values())} 人簽到星穹鐵道、"
-                + f"{sum(cls._zzz_count.values())} 人簽到絕區零、"
-                + f"{sum(cls._themis_count.values())} 人簽到未定事件簿\n"
+                f"自動簽到結束：總共 {sum(_total.values())} 人簽到，"
+                + f"其中 {sum(s['honkai3rd'] for s in stats.values())} 人簽到崩壞3、"
+                + f"{sum(s['starrail'] for s in stats.values())} 人簽到星穹鐵道、"
+                + f"{sum(s['zzz'] for s in stats.values())} 人簽到絕區零、"
+                + f"{sum(s['themis'] for s in stats.values())} 人簽到未定事件簿\n"
             )
-            for host in cls._total.keys():
+            for host, s in stats.items():
                 _log_message += (
-                    f"- {host}：{cls._total.get(host)}、{cls._honkai_count.get(host)}、"
-                    + f"{cls._starrail_count.get(host)}、{cls._zzz_count.get(host)}\n"
+                    f"- {host}：{s['total']}、{s['honkai3rd']}、"
+                    + f"{s['starrail']}、{s['zzz']}\n"
                 )
             LOG.System(_log_message)
         except Exception as e:
             sentry_sdk.capture_exception(e)
             LOG.Error(f"自動排程 DailyReward 發生錯誤：{e}")
-        finally:
-            cls._lock.release()
 
     @classmethod
-    async def _claim_daily_reward_task(
-        cls, queue: asyncio.Queue[ScheduleDailyCheckin], host: str, bot: commands.Bot
-    ):
-        """從傳入的 asyncio.Queue 裡面取得使用者，然後進行每日簽到，並根據簽到結果發送訊息給使用者
+    async def _claim_daily_reward_task(cls, host: str, bot: commands.Bot, stats: Counter[str]):
+        """以租約從資料庫分批領取需要簽到的使用者，然後進行每日簽到，並根據簽到結果發送訊息給使用者
 
         Parameters
         -----
-        queue: `asyncio.Queue[ScheduleDailyCheckin]`
-            存放需要簽到的使用者的佇列
         host: `str`
             簽到的主機
             - 本地：固定為字串 "LOCAL"
             - 遠端：簽到 API 網址
-
         bot: `commands.Bot`
             Discord 機器人客戶端
+        stats: `Counter[str]`
+            此主機的簽到人數統計
         """
         LOG.Info(f"自動排程簽到任務開始：{host}")
         if host != "LOCAL":
@@ -125,40 +141,106 @@ class DailyReward:
                     LOG.Error(f"自動排程 DailyReward 測試 API {host} 時發生錯誤：{e}")
                     return
 
-        cls._total[host] = 0  # 初始化簽到人數
-        cls._honkai_count[host] = 0  # 初始化簽到崩壞3的人數
-        cls._starrail_count[host] = 0  # 初始化簽到星穹鐵道的人數
-        cls._zzz_count[host] = 0  # 初始化簽到絕區零的人數
-        cls._themis_count[host] = 0  # 初始化簽到未定事件簿的人數
+        owner = (
+            f"{JobJournal.WORKER_ID}:{host}:{uuid.uuid4().hex[:8]}"  # 此任務的租約名稱與執行 ID
+        )
         MAX_API_ERROR_COUNT: Final[int] = 20  # 遠端 API 發生錯誤的最大次數
         api_error_count = 0  # 遠端 API 發生錯誤的次數
 
         while True:
-            user = await queue.get()
+            users = await CheckinLease.claim(
+                owner, config.schedule_checkin_batch_size, config.schedule_checkin_lease_seconds
+            )
+            if len(users) == 0:  # 沒有需要簽到的使用者
+                return
+            # 同一批的使用者同時簽到，實際並行數量由各區域的 RateController 控制
+            results = await asyncio.gather(
+                *[cls._claim_and_notify(host, bot, owner, user, stats) for user in users]
+            )
+            errors = [e for e in results if e is not None]
+            api_error_count += len(errors)
+            if len(errors) > 0:
+                LOG.Error(f"遠端 API：{host} 發生錯誤 ({api_error_count}/{MAX_API_ERROR_COUNT})")
+            # 如果發生錯誤超過 MAX_API_ERROR_COUNT 次，則停止簽到任務
+            if api_error_count >= MAX_API_ERROR_COUNT:
+                sentry_sdk.capture_exception(errors[-1])
+                return
+
+    @classmethod
+    async def _claim_and_notify(
+        cls,
+        host: str,
+        bot: commands.Bot,
+        owner: str,
+        user: ScheduleDailyCheckin,
+        stats: Counter[str],
+    ) -> Exception | None:
+        """取得並行名額後為使用者簽到，簽到完成後釋放租約並發送訊息，回傳簽到時發生的例外"""
+        attempts = await JobJournal.start(cls.JOB, owner, user.discord_id)
+        if attempts > JobJournal.MAX_ATTEMPTS:
+            # 連續多次處理此使用者時機器人都中斷，略過此使用者今天的簽到
+            LOG.Error(
+                f"自動簽到連續 {attempts - 1} 次中斷，略過 {LOG.User(user.discord_id)} 今日的簽到"
+            )
+            await CheckinLease.release(user, owner, checked_in=True)
+            await JobJournal.mark(cls.JOB, user.discord_id, JobJournal.FAILED)
+            return None
+
+        controller = await cls._get_rate_controller(host, user)
+        async with controller.slot():
+            start = time.perf_counter()
             try:
                 message = await cls._claim_daily_reward(host, user)
             except Exception as e:
-                await queue.put(user)  # 簽到發生異常，將使用者放回佇列
-                api_error_count += 1
-                LOG.Error(f"遠端 API：{host} 發生錯誤 ({api_error_count}/{MAX_API_ERROR_COUNT})")
-                # 如果發生錯誤超過 MAX_API_ERROR_COUNT 次，則停止簽到任務
-                if api_error_count >= MAX_API_ERROR_COUNT:
-                    sentry_sdk.capture_exception(e)
-                    return
-            else:
-                # 簽到成功後，更新資料庫中的簽到日期、發送訊息給使用者、更新計數器
-                user.update_next_checkin_time()
-                await Database.insert_or_replace(user)
-                if message is not None:
-                    await cls._send_message(bot, user, message)
-                    cls._total[host] += 1
-                    cls._honkai_count[host] += int(user.has_honkai3rd)
-                    cls._starrail_count[host] += int(user.has_starrail)
-                    cls._zzz_count[host] += int(user.has_zzz)
-                    cls._themis_count[host] += int(user.has_themis) + int(user.has_themis_tw)
-                    await asyncio.sleep(config.schedule_loop_delay)
-            finally:
-                queue.task_done()
+                # 本地簽到的請求結果由 HoyolabClient 回報，這裡只需回報遠端 API
+                if host != "LOCAL":
+                    controller.record(time.perf_counter() - start, e)
+                # 簽到發生異常，釋放租約讓其他 worker 重新領取
+                await CheckinLease.release(user, owner)
+                await JobJournal.mark(cls.JOB, user.discord_id, JobJournal.FAILED)
+                # 斷路器開啟時請求沒有送出，不計入 API 錯誤次數，下次領取時排程會先暫停等待 API 恢復
+                return None if isinstance(e, CircuitOpenError) else e
+            if host != "LOCAL":
+                controller.record(time.perf_counter() - start)
+
+            # 先在日誌記錄已簽到，若在寫入下次簽到時間前重啟，啟動時會直接補上而不重複簽到
+            await JobJournal.mark(cls.JOB, user.discord_id, JobJournal.CLAIMED)
+            # 簽到成功後，更新資料庫中的簽到日期並釋放租約；
+            # 若租約已過期被其他 worker 領取，則由該 worker 負責，這裡不發送訊息
+            released = await CheckinLease.release(user, owner, checked_in=True)
+            await JobJournal.mark(cls.JOB, user.discord_id, JobJournal.DONE)
+            if released is False:
+                LOG.Info(f"自動簽到租約已過期，略過 {LOG.User(user.discord_id)}")
+                return None
+            # 發送訊息給使用者、更新計數器
+            if message is not None:
+                await cls._send_message(bot, user, message)
+                stats["total"] += 1
+                stats["honkai3rd"] += int(user.has_honkai3rd)
+                stats["starrail"] += int(user.has_starrail)
+                stats["zzz"] += int(user.has_zzz)
+                stats["themis"] += int(user.has_themis) + int(user.has_themis_tw)
+        return None
+
+    @classmethod
+    async def _get_rate_controller(cls, host: str, user: ScheduleDailyCheckin) -> RateController:
+        """取得使用者簽到時使用的 RateController：遠端 API 以網址區分，本地簽到依照帳號所在區域區分"""
+        if host != "LOCAL":
+            return RateController.get(host)
+        user_data = await Database.select_one(User, User.discord_id.is_(user.discord_id))
+        region = genshin.Region.OVERSEAS
+        if user_data is not None:
+            games = [
+                game
+                for game, has_game in (
+                    (genshin.Game.GENSHIN, user.has_genshin),
+                    (genshin.Game.STARRAIL, user.has_starrail),
+                )
+                if has_game
+            ]
+            if any(get_region(user_data, game) == genshin.Region.CHINESE for game in games):
+                region = genshin.Region.CHINESE
+        return RateController.get(region.value)
 
     @classmethod
     async def _claim_daily_reward(cls, host: str, user: ScheduleDailyCheckin) -> str | None:
@@ -241,22 +323,36 @@ class DailyReward:
 
     @classmethod
     async def _send_message(cls, bot: commands.Bot, user: ScheduleDailyCheckin, message: str):
-        """向使用者發送簽到結果的訊息"""
+        """將簽到結果的訊息加入通知佇列，與同頻道的其他使用者合併發送"""
+
+        async def on_failed(e: Exception) -> None:  # 發送訊息失敗，移除此使用者
+            LOG.Except(f"自動簽到發送訊息失敗，移除此使用者 {LOG.User(user.discord_id)}：{e}")
+            await Database.delete_instance(user)
+
         try:
-            _id = user.discord_channel_id
-            channel = bot.get_channel(_id) or await bot.fetch_channel(_id)
             # 若不用@提及使用者，則先取得此使用者的名稱然後發送訊息
             if user.is_mention is False and "Cookie已失效" not in message:
-                _user = await bot.fetch_user(user.discord_id)
-                await channel.send(embed=EmbedTemplate.normal(f"[自動簽到] {_user.name}：{message}"))  # type: ignore
+                _user = await NotificationQueue.fetch_user(bot, user.discord_id)
+                notification = Notification(
+                    "",
+                    EmbedTemplate.normal(f"[自動簽到] {_user.name}：{message}"),
+                    None,
+                    on_failed,
+                )
             else:  # 若需要@提及使用者或是 Cookie 已失效
-                await channel.send(f"<@{user.discord_id}>", embed=EmbedTemplate.normal(f"[自動簽到] {message}"))  # type: ignore
+                notification = Notification(
+                    f"<@{user.discord_id}>",
+                    EmbedTemplate.normal(f"[自動簽到] {message}"),
+                    None,
+                    on_failed,
+                )
         except (
             discord.Forbidden,
             discord.NotFound,
             discord.InvalidData,
-        ) as e:  # 發送訊息失敗，移除此使用者
-            LOG.Except(f"自動簽到發送訊息失敗，移除此使用者 {LOG.User(user.discord_id)}：{e}")
-            await Database.delete_instance(user)
+        ) as e:  # 取得使用者失敗，移除此使用者
+            await on_failed(e)
         except Exception as e:
             sentry_sdk.capture_exception(e)
+        else:
+            NotificationQueue.put(bot, user.discord_channel_id, notification)
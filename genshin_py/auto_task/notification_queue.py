@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, ClassVar, Final
+
+import discord
+import sentry_sdk
+from cachetools import TTLCache
+from discord.ext import commands
+
+from utility import LOG, config
+from utility.prometheus import Metrics
+
+
+@dataclass
+class Notification:
+    """排程要發送到頻道的一則通知"""
+
+    content: str
+    """訊息文字，多則通知合併時以換行串接"""
+    embed: discord.Embed
+    """通知的 embed，多則通知合併時放在同一則訊息"""
+    on_sent: Callable[[discord.Message], Awaitable[None]] | None = None
+    """訊息成功發送後呼叫，參數為包含此通知的訊息"""
+    on_failed: Callable[[Exception], Awaitable[None]] | None = None
+    """頻道不存在或沒有權限而發送失敗時呼叫"""
+
+
+class NotificationQueue:
+    """自動排程的通知發送佇列
+
+    - 同一個頻道在短時間內的通知會合併成一則訊息 (最多 10 個 embed)，減少消耗 Discord 頻道的速率限制
+    - 每個頻道同時只有一個發送工作，由 discord.py 依照回應的速率限制標頭 (bucket) 等待
+    - 快取已取得的頻道與使用者，避免重複呼叫 fetch_channel、fetch_user
+
+    Methods
+    -----
+    put(bot: `commands.Bot`, channel_id: `int`, notification: `Notification`)
+        將通知加入佇列
+    fetch_user(bot: `commands.Bot`, user_id: `int`)
+        取得 Discord 使用者
+    join()
+        等待佇列內所有的通知發送完畢
+    """
+
+    MAX_EMBEDS: Final[int] = 10
+    """Discord 每則訊息的 embed 數量上限"""
+    MAX_EMBED_CHARS: Final[int] = 6000
+    """Discord 每則訊息所有 embed 的字數上限"""
+    MAX_CONTENT_CHARS: Final[int] = 2000
+    """Discord 每則訊息文字的字數上限"""
+
+    _pending: ClassVar[dict[int, list[Notification]]] = {}
+    _senders: ClassVar[dict[int, asyncio.Task]] = {}
+    _channels: ClassVar[TTLCache[int, discord.abc.Messageable]] = TTLCache(10000, 3600)
+    _users: ClassVar[TTLCache[int, discord.User]] = TTLCache(10000, 3600)
+
+    @classmethod
+    def put(cls, bot: commands.Bot, channel_id: int, notification: Notification) -> None:
+        """將通知加入佇列，在合併等待時間後與同頻道的其他通知一起發送"""
+        cls._pending.setdefault(channel_id, []).append(notification)
+        if channel_id not in cls._senders:
+            cls._senders[channel_id] = asyncio.create_task(cls._channel_sender(bot, channel_id))
+
+    @classmethod
+    async def fetch_user(cls, bot: commands.Bot, user_id: int) -> discord.User:
+        """從機器人快取或本佇列的快取取得使用者，都沒有時才向 Discord 請求"""
+        user = bot.get_user(user_id) or cls._users.get(user_id)
+        if user is None:
+            user = cls._users[user_id] = await bot.fetch_user(user_id)
+        return user
+
+    @classmethod
+    async def join(cls) -> None:
+        """等待佇列內所有的通知發送完畢"""
+        while len(cls._senders) > 0:
+            await asyncio.gather(*cls._senders.values(), return_exceptions=True)
+
+    @classmethod
+    async def _channel_sender(cls, bot: commands.Bot, channel_id: int) -> None:
+        """單一頻道的發送工作，直到此頻道沒有待發送的通知"""
+        try:
+            while len(cls._pending.get(channel_id, [])) > 0:
+                # 等待一小段時間，讓同時間產生的通知能合併在同一則訊息
+                await asyncio.sleep(config.notification_coalesce_window)
+                batch = cls._take_batch(channel_id)
+                await cls._send_batch(bot, channel_id, batch)
+        finally:
+            cls._pending.pop(channel_id, None)
+            cls._senders.pop(channel_id, None)
+
+    @classmethod
+    def _take_batch(cls, channel_id: int) -> list[Notification]:
+        """從待發送的通知中取出能放進同一則訊息的通知"""
+        pending = cls._pending[channel_id]
+        batch: list[Notification] = []
+        embed_chars = content_chars = 0
+        while len(pending) > 0 and len(batch) < cls.MAX_EMBEDS:
+            notification = pending[0]
+            _embed_chars = embed_chars + len(notification.embed)
+            _content_chars = content_chars + len(notification.content) + 1
+            if len(batch) > 0 and (
+                _embed_chars > cls.MAX_EMBED_CHARS or _content_chars > cls.MAX_CONTENT_CHARS
+            ):
+                break
+            batch.append(pending.pop(0))
+            embed_chars, content_chars = _embed_chars, _content_chars
+        return batch
+
+    @classmethod
+    async def _send_batch(
+        cls, bot: commands.Bot, channel_id: int, batch: list[Notification]
+    ) -> None:
+        """將多則通知合併成一則訊息發送到頻道"""
+        try:
+            channel = cls._channels.get(channel_id) or bot.get_channel(channel_id)
+            if channel is None:
+                channel = await bot.fetch_channel(channel_id)
+            if not isinstance(channel, discord.abc.Messageable):
+                raise discord.InvalidData(f"頻道 {channel_id} 無法發送訊息")
+            cls._channels[channel_id] = channel
+            content = "\n".join(n.content for n in batch if len(n.content) > 0)
+            message = await channel.send(content or None, embeds=[n.embed for n in batch])
+        except (discord.Forbidden, discord.NotFound, discord.InvalidData) as e:
+            # 頻道不存在或沒有權限，此頻道之後的通知也會失敗，一併取出交給呼叫端處理
+            cls._channels.pop(channel_id, None)
+            batch += cls._pending.get(channel_id, [])
+            cls._pending[channel_id] = []
+            LOG.Except(f"排程通知發送到頻道 {channel_id} 失敗：{e}")
+            for notification in batch:
+                if notification.on_failed is not None:
+                    await notification.on_failed(e)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+        else:
+            Metrics.NOTIFICATION_SENDS.inc()
+            Metrics.NOTIFICATION_MERGES.inc(len(batch) - 1)
+            for notification in batch:
+                if notification.on_sent is not None:
+                    await notification.on_sent(message)
+
+
+class _RateLimitCounter(logging.Handler):
+    """計算 discord.py 收到 HTTP 429 (被速率限制) 的次數"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "429" in str(record.msg) or "Global rate limit" in str(record.msg):
+            Metrics.DISCORD_RATE_LIMITED.inc()
+
+
+# discord.py 會在收到 429 時於 discord.http logger 記錄警告，藉此統計被速率限制的次數
+logging.getLogger("discord.http").addHandler(_RateLimitCounter(logging.WARNING))
@@ -5,6 +5,7 @@ import discord
 import genshin
 
 from database import Database, GenshinScheduleNotes, StarrailScheduleNotes, ZZZScheduleNotes
+from utility import CircuitOpenError
 
 from ... import errors, get_genshin_notes, get_starrail_notes, get_zzz_notes
 
@@ -30,6 +31,9 @@ async def get_realtime_notes(
             notes = await get_starrail_notes(user.discord_id)
         if isinstance(user, ZZZScheduleNotes):
             notes = await get_zzz_notes(user.discord_id)
+    except CircuitOpenError:
+        # API 異常中請求沒有送出，維持原本的檢查時間，等 API 恢復後的下次排程再檢查
+        pass
     except Exception as e:
         # 當錯誤為 InternalDatabaseError 時，忽略並設定1小時後檢查
         if isinstance(e, errors.GenshinAPIException) and isinstance(
@@ -1,15 +1,29 @@
 import asyncio
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from typing import Awaitable, Callable, ClassVar
 
 import discord
+import genshin
 import sentry_sdk
 import sqlalchemy
 from discord.ext import commands
 
-from database import Database, GenshinScheduleNotes, StarrailScheduleNotes, ZZZScheduleNotes
+from database import (
+    Database,
+    GenshinScheduleNotes,
+    JobJournal,
+    StarrailScheduleNotes,
+    User,
+    ZZZScheduleNotes,
+)
 from utility import LOG, config
 
+from ... import get_region
+from ...rate_controller import RateController
+from ...retry_policy import RetryPolicy
+from ..notification_queue import Notification, NotificationQueue
+
 from .common import CheckResult, T_User
 from .genshin import check_genshin_notes
 from .starrail import check_starrail_notes
@@ -43,11 +57,18 @@ class RealtimeNotes:
         cls._bot = bot
         try:
             LOG.System("自動檢查樹脂開始")
-            await asyncio.gather(
-                cls._check_games_note(GenshinScheduleNotes, "原神", check_genshin_notes),
-                cls._check_games_note(StarrailScheduleNotes, "星穹鐵道", check_starrail_notes),
-                cls._check_games_note(ZZZScheduleNotes, "絕區零", check_zzz_notes),
-            )
+            # 自動排程不受 Discord 互動時限影響，使用較長的重試時間
+            with RetryPolicy.SCHEDULER.use():
+                await asyncio.gather(
+                    cls._check_games_note(
+                        GenshinScheduleNotes, genshin.Game.GENSHIN, check_genshin_notes
+                    ),
+                    cls._check_games_note(
+                        StarrailScheduleNotes, genshin.Game.STARRAIL, check_starrail_notes
+                    ),
+                    cls._check_games_note(ZZZScheduleNotes, genshin.Game.ZZZ, check_zzz_notes),
+                )
+            await NotificationQueue.join()
         except Exception as e:
             sentry_sdk.capture_exception(e)
             LOG.Error(f"自動排程 RealtimeNotes 發生錯誤：{e}")
@@ -58,7 +79,7 @@ class RealtimeNotes:
     async def _check_games_note(
         cls,
         game_orm: type[T_User],
-        game_name: str,
+        game: genshin.Game,
         game_check_fucntion: Callable[[T_User], Awaitable[CheckResult | None]],
     ) -> None:
         """檢查指定遊戲的所有使用者的即時便箋
@@ -67,56 +88,91 @@ class RealtimeNotes:
         ----------
         game_orm: Type[`T_User`]
             排程檢查即時便箋的 ORM（物件關聯對映）類型
-        game_name: `str`
-            遊戲名稱
+        game: `genshin.Game`
+            遊戲，用來判斷使用者帳號所在的區域
         game_check_function: Callable[[`T_User`], Awaitable[`CheckResult` | `None`]]
             檢查遊戲便箋的函式
 
         """
+        game_name, job = {
+            genshin.Game.GENSHIN: ("原神", "genshin_notes"),
+            genshin.Game.STARRAIL: ("星穹鐵道", "starrail_notes"),
+            genshin.Game.ZZZ: ("絕區零", "zzz_notes"),
+        }[game]
+        run_id = f"{JobJournal.WORKER_ID}:{job}:{uuid.uuid4().hex[:8]}"  # 工作日誌的執行 ID
         count = 0
         # 選擇所有使用者 ID
         stmt = sqlalchemy.select(game_orm.discord_id)
         async with Database.sessionmaker() as session:
             user_ids = (await session.execute(stmt)).scalars().all()
-        for user_id in user_ids:
-            # 取得要檢查的使用者，若檢查時間還沒到則跳過
-            user = await Database.select_one(game_orm, game_orm.discord_id.is_(user_id))
-            if user is None or user.next_check_time and datetime.now() < user.next_check_time:
-                continue
-            r = await game_check_fucntion(user)
-            if r is not None:
-                count += 1
-            # 當有錯誤訊息或是即時便箋快要額滿時，向使用者發送訊息
-            if r and len(r.message) > 0:
-                await cls._send_message(user, r.message, r.embed)
-            # 使用者之間的檢查間隔時間
-            await asyncio.sleep(config.schedule_loop_delay)
+        user_id_iter = iter(user_ids)  # 所有 worker 共用，每位使用者只會被一個 worker 取出
+
+        async def worker() -> None:
+            nonlocal count
+            for user_id in user_id_iter:
+                # 取得要檢查的使用者，若檢查時間還沒到則跳過
+                user = await Database.select_one(game_orm, game_orm.discord_id.is_(user_id))
+                if user is None or user.next_check_time and datetime.now() < user.next_check_time:
+                    continue
+                # 連續多次檢查此使用者時機器人都中斷，暫停檢查此使用者一天
+                attempts = await JobJournal.start(job, run_id, user_id)
+                if attempts > JobJournal.MAX_ATTEMPTS:
+                    LOG.Error(
+                        f"{game_name}自動檢查即時便箋連續 {attempts - 1} 次中斷，略過 {LOG.User(user_id)}"
+                    )
+                    user.next_check_time = datetime.now() + timedelta(days=1)
+                    await Database.insert_or_replace(user)
+                    await JobJournal.mark(job, user_id, JobJournal.FAILED)
+                    continue
+                # 依照使用者帳號所在區域的 API 狀況，控制同時檢查的人數與使用者之間的檢查間隔
+                user_data = await Database.select_one(User, User.discord_id.is_(user_id))
+                region = genshin.Region.OVERSEAS
+                if user_data is not None:
+                    region = get_region(user_data, game)
+                async with RateController.get(region.value).slot():
+                    r = await game_check_fucntion(user)
+                    if r is not None:
+                        count += 1
+                    # 當有錯誤訊息或是即時便箋快要額滿時，向使用者發送訊息
+                    if r and len(r.message) > 0:
+                        await cls._send_message(user, r.message, r.embed)
+                await JobJournal.mark(job, user_id, JobJournal.DONE)
+
+        await asyncio.gather(*[worker() for _ in range(config.schedule_concurrency_max)])
         LOG.System(f"{game_name}自動檢查即時便箋結束，{count}/{len(user_ids)} 人已檢查")
 
     @classmethod
     async def _send_message(cls, user: T_User, message: str, embed: discord.Embed) -> None:
-        """發送訊息提醒使用者"""
+        """將提醒訊息加入通知佇列，與同頻道的其他使用者合併發送"""
         bot = cls._bot
+
+        async def on_sent(msg_sent: discord.Message) -> None:
+            # 若使用者不在發送訊息的頻道則移除
+            if discord_user.mentioned_in(msg_sent) is False:
+                LOG.Except(
+                    f"自動檢查即時便箋使用者不在頻道，移除此使用者 {LOG.User(discord_user)}"
+                )
+                await Database.delete_instance(user)
+
+        async def on_failed(e: Exception) -> None:  # 發送訊息失敗，移除此使用者
+            LOG.Except(
+                f"自動檢查即時便箋發送訊息失敗，移除此使用者 {LOG.User(user.discord_id)}：{e}"
+            )
+            await Database.delete_instance(user)
+
         try:
-            _id = user.discord_channel_id
-            channel = bot.get_channel(_id) or await bot.fetch_channel(_id)
-            discord_user = bot.get_user(user.discord_id) or await bot.fetch_user(user.discord_id)
-            msg_sent = await channel.send(f"{discord_user.mention}，{message}", embed=embed)  # type: ignore
+            discord_user = await NotificationQueue.fetch_user(bot, user.discord_id)
         except (
             discord.Forbidden,
             discord.NotFound,
             discord.InvalidData,
-        ) as e:  # 發送訊息失敗，移除此使用者
-            LOG.Except(
-                f"自動檢查即時便箋發送訊息失敗，移除此使用者 {LOG.User(user.discord_id)}：{e}"
-            )
-            await Database.delete_instance(user)
+        ) as e:  # 取得使用者失敗，移除此使用者
+            await on_failed(e)
         except Exception as e:
             sentry_sdk.capture_exception(e)
-        else:  # 成功發送訊息
-            # 若使用者不在發送訊息的頻道則移除
-            if discord_user.mentioned_in(msg_sent) is False:
-                LOG.Except(
-                    f"自動檢查即時便箋使用者不在頻道，移除此使用者 {LOG.User(discord_user)}"
-                )
-                await Database.delete_instance(user)
+        else:
+            NotificationQueue.put(
+                bot,
+                user.discord_channel_id,
+                Notification(f"{discord_user.mention}，{message}", embed, on_sent, on_failed),
+            )
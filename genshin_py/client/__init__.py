@@ -1,4 +1,8 @@
 from .common import *
+from .cookie_cache import *
 from .genshin import *
+from .notes_cache import *
+from .notices_cache import *
+from .response_cache import *
 from .starrail import *
 from .zzz import *
@@ -1,15 +1,21 @@
 import asyncio
-from typing import Mapping, Sequence
+import time
+from typing import Any, Mapping, Sequence
 
 import genshin
 import sentry_sdk
 
 import database
 from database import Database, GeetestChallenge, User
-from utility import LOG, config, get_app_command_mention
+from utility import LOG, CircuitOpenError, config, get_app_command_mention
 
 from ..errors import UserDataNotFound
 from ..errors_decorator import generalErrorHandler
+from ..proxy_pool import ProxyPool
+from ..rate_controller import RateController
+from .cookie_cache import CookieAccounts, CookieCache
+from .notes_cache import NotesCache
+from .response_cache import ResponseCache
 
 
 async def get_client(
@@ -38,39 +44,96 @@ async def get_client(
     check, msg = await database.Tool.check_user(user, check_uid=check_uid, game=game)
     if check is False or user is None:
         raise UserDataNotFound(msg)
+    return _build_client(user, game)
 
-    client = genshin.Client(lang="zh-tw")
+
+def get_region(user: User, game: genshin.Game) -> genshin.Region:
+    """取得使用者在指定遊戲的帳號所在的區域 (國際服或國服)
+
+    優先使用設定 Cookie 時確認過的區域，沒有快取時依照 UID 開頭判斷
+    """
+    cookie = _get_cookie(user, game)
+    if cookie is not None and (cached := CookieCache.get(cookie)) is not None:
+        return cached.region
+    match game:
+        case genshin.Game.GENSHIN:
+            uid = str(user.uid_genshin or 0)
+            if len(uid) == 9 and uid[0] in ["1", "2", "5"]:
+                return genshin.Region.CHINESE
+        case genshin.Game.STARRAIL:
+            uid = str(user.uid_starrail or 0)
+            if uid[0] in ["1", "2", "5"]:
+                return genshin.Region.CHINESE
+    return genshin.Region.OVERSEAS
+
+
+class HoyolabClient(genshin.Client):
+    """將每次請求的回應時間與例外回報給所在區域 RateController 的 genshin.Client
+
+    - 所在區域的斷路器開啟時不送出請求，直接拋出 CircuitOpenError
+    - 每次請求從 ProxyPool 選擇代理伺服器，優先沿用此 Client 上次使用的代理伺服器
+    """
+
+    async def request(self, *args: Any, **kwargs: Any) -> Any:
+        controller = RateController.get(self.region.value)
+        controller.breaker.check()
+        async with ProxyPool.acquire(self.proxy) as proxy:
+            self.proxy = proxy
+            start = time.perf_counter()
+            try:
+                response = await super().request(*args, **kwargs)
+            except Exception as e:
+                latency = time.perf_counter() - start
+                controller.record(latency, e)
+                ProxyPool.record(proxy, latency, e)
+                raise
+            except BaseException:  # 請求被取消，沒有結果可以回報
+                controller.breaker.release_probe()
+                raise
+        latency = time.perf_counter() - start
+        controller.record(latency)
+        ProxyPool.record(proxy, latency)
+        return response
+
+
+def _get_cookie(user: User, game: genshin.Game) -> str | None:
+    """取得使用者在指定遊戲使用的 Cookie，沒有個別設定時使用預設 Cookie"""
+    match game:
+        case genshin.Game.GENSHIN:
+            return user.cookie_genshin or user.cookie_default
+        case genshin.Game.HONKAI:
+            return user.cookie_honkai3rd or user.cookie_default
+        case genshin.Game.STARRAIL:
+            return user.cookie_starrail or user.cookie_default
+        case genshin.Game.ZZZ:
+            return user.cookie_zzz or user.cookie_default
+        case genshin.Game.THEMIS | genshin.Game.THEMIS_TW:
+            return user.cookie_themis or user.cookie_default
+        case _:
+            return user.cookie_default
+
+
+def _build_client(user: User, game: genshin.Game) -> genshin.Client:
+    """依照資料庫內的使用者資料建立指定遊戲的 Client，同一位使用者的多個遊戲可共用同一筆資料"""
+    if get_region(user, game) == genshin.Region.CHINESE:
+        client = HoyolabClient(region=genshin.Region.CHINESE, lang="zh-cn")
+    else:
+        client = HoyolabClient(lang="zh-tw")
     match game:
         case genshin.Game.GENSHIN:
             uid = user.uid_genshin or 0
-            cookie = user.cookie_genshin or user.cookie_default
-            if len(str(uid)) == 9 and str(uid)[0] in ["1", "2", "5"]:
-                client = genshin.Client(region=genshin.Region.CHINESE, lang="zh-cn")
         case genshin.Game.HONKAI:
             uid = user.uid_honkai3rd or 0
-            cookie = user.cookie_honkai3rd or user.cookie_default
         case genshin.Game.STARRAIL:
             uid = user.uid_starrail or 0
-            cookie = user.cookie_starrail or user.cookie_default
-            if str(uid)[0] in ["1", "2", "5"]:
-                client = genshin.Client(region=genshin.Region.CHINESE, lang="zh-cn")
         case genshin.Game.ZZZ:
             uid = user.uid_zzz or 0
-            cookie = user.cookie_zzz or user.cookie_default
-        case genshin.Game.THEMIS:
-            uid = 0
-            cookie = user.cookie_themis or user.cookie_default
-        case genshin.Game.THEMIS_TW:
-            uid = 0
-            cookie = user.cookie_themis or user.cookie_default
         case _:
             uid = 0
-            cookie = user.cookie_default
 
-    client.set_cookies(cookie)
+    client.set_cookies(_get_cookie(user, game))
     client.default_game = game
     client.uid = uid
-    client.proxy = config.genshin_py_proxy_server
     return client
 
 
@@ -92,11 +155,49 @@ async def get_game_accounts(
     `Sequence[GenshinAccount]`
         查詢結果
     """
-    client = await get_client(user_id, game=game, check_uid=False)
-    accounts = await client.get_game_accounts()
+    user = await Database.select_one(User, User.discord_id.is_(user_id))
+    check, msg = await database.Tool.check_user(user)
+    if check is False or user is None:
+        raise UserDataNotFound(msg)
+    # 設定 Cookie 時已經取得過帳號列表，使用快取避免重複請求
+    cached = CookieCache.get(_get_cookie(user, game) or "")
+    if cached is not None:
+        accounts = cached.accounts
+    else:
+        accounts = await _build_client(user, game).get_game_accounts()
     return [account for account in accounts if account.game == game]
 
 
+async def _probe_region(cookie: str) -> CookieAccounts:
+    """同時以國際服與國服 Client 取得帳號資訊，回傳最先成功的區域與帳號列表
+
+    兩個區域都失敗時，國際服不是 Cookie 無效的錯誤則拋出國際服的例外，否則拋出國服的例外
+    """
+
+    async def probe(region: genshin.Region) -> CookieAccounts:
+        client = HoyolabClient(region=region, lang="zh-tw")
+        client.set_cookies(cookie)
+        return CookieAccounts(region, await client.get_game_accounts())
+
+    tasks = {
+        region: asyncio.create_task(probe(region))
+        for region in (genshin.Region.OVERSEAS, genshin.Region.CHINESE)
+    }
+    try:
+        for completed in asyncio.as_completed(tasks.values()):
+            try:
+                return await completed
+            except Exception:
+                continue
+        overseas_error = tasks[genshin.Region.OVERSEAS].exception()
+        if not isinstance(overseas_error, genshin.errors.InvalidCookies):
+            raise overseas_error  # type: ignore
+        raise tasks[genshin.Region.CHINESE].exception()  # type: ignore
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
 @generalErrorHandler
 async def set_cookie(user_id: int, cookie: str, games: Sequence[genshin.Game]) -> str:
     """根據遊戲設定使用者 Cookie
@@ -117,15 +218,8 @@ async def set_cookie(user_id: int, cookie: str, games: Sequence[genshin.Game]) -
     """
     LOG.Info(f"設定 {LOG.User(user_id)} 的Cookie：{cookie}")
 
-    client = genshin.Client(lang="zh-tw")
-    client.set_cookies(cookie)
-
-    # 先以國際服 client 取得帳號資訊，若失敗則嘗試使用中國服 client
-    try:
-        accounts = await client.get_game_accounts()
-    except genshin.errors.InvalidCookies:
-        client.region = genshin.Region.CHINESE
-        accounts = await client.get_game_accounts()
+    region, accounts = await _probe_region(cookie)
+    CookieCache.put(cookie, region, accounts)
     gs_accounts = [a for a in accounts if a.game == genshin.Game.GENSHIN]
     hk3_accounts = [a for a in accounts if a.game == genshin.Game.HONKAI]
     sr_accounts = [a for a in accounts if a.game == genshin.Game.STARRAIL]
@@ -170,6 +264,8 @@ async def set_cookie(user_id: int, cookie: str, games: Sequence[genshin.Game]) -
         user.cookie_themis = cookie
 
     await Database.insert_or_replace(user)
+    NotesCache.invalidate(user_id)
+    ResponseCache.invalidate(user_id)
     LOG.Info(f"{LOG.User(user_id)} Cookie設置成功")
 
     result = "Cookie已設定完成！"
@@ -219,10 +315,12 @@ async def claim_daily_reward(
     `str`
         回覆給使用者的訊息
     """
-    try:
-        client = await get_client(user_id, check_uid=False)
-    except Exception as e:
-        return str(e)
+    # 只讀取一次使用者資料，所有遊戲的 Client 共用同一份 cookie 設定
+    user = await Database.select_one(User, User.discord_id.is_(user_id))
+    check, msg = await database.Tool.check_user(user)
+    if check is False or user is None:
+        return msg
+    client = _build_client(user, genshin.Game.GENSHIN)
 
     # Hoyolab 社群簽到
     try:
@@ -234,10 +332,19 @@ async def claim_daily_reward(
         LOG.FuncExceptionLog(user_id, "claimDailyReward: Hoyolab", e)
 
     # 遊戲簽到
-    if (
-        any([has_genshin, has_honkai3rd, has_starrail, has_zzz, has_themis, has_themis_tw])
-        is False
-    ):
+    games: list[genshin.Game] = [
+        game
+        for game, has_game in (
+            (genshin.Game.GENSHIN, has_genshin),
+            (genshin.Game.HONKAI, has_honkai3rd),
+            (genshin.Game.STARRAIL, has_starrail),
+            (genshin.Game.ZZZ, has_zzz),
+            (genshin.Game.THEMIS, has_themis),
+            (genshin.Game.THEMIS_TW, has_themis_tw),
+        )
+        if has_game
+    ]
+    if len(games) == 0:
         return "未選擇任何遊戲簽到"
 
     # 使用者保存的 geetest 驗證資料
@@ -247,32 +354,31 @@ async def claim_daily_reward(
             GeetestChallenge, GeetestChallenge.discord_id.is_(user_id)
         )
 
-    result = ""
-    if has_genshin:
-        challenge = gt_challenge.genshin if gt_challenge else None
-        client = await get_client(user_id, game=genshin.Game.GENSHIN, check_uid=False)
-        result += await _claim_reward(user_id, client, genshin.Game.GENSHIN, is_geetest, challenge)
-    if has_honkai3rd:
-        challenge = gt_challenge.honkai3rd if gt_challenge else None
-        client = await get_client(user_id, game=genshin.Game.HONKAI, check_uid=False)
-        result += await _claim_reward(user_id, client, genshin.Game.HONKAI, is_geetest, challenge)
-    if has_starrail:
-        challenge = gt_challenge.starrail if gt_challenge else None
-        client = await get_client(user_id, game=genshin.Game.STARRAIL, check_uid=False)
-        result += await _claim_reward(
-            user_id, client, genshin.Game.STARRAIL, is_geetest, challenge
-        )
-    if has_zzz:
-        client = await get_client(user_id, game=genshin.Game.ZZZ, check_uid=False)
-        result += await _claim_reward(user_id, client, genshin.Game.ZZZ)
-    if has_themis:
-        client = await get_client(user_id, game=genshin.Game.THEMIS, check_uid=False)
-        result += await _claim_reward(user_id, client, genshin.Game.THEMIS)
-    if has_themis_tw:
-        client = await get_client(user_id, game=genshin.Game.THEMIS_TW, check_uid=False)
-        result += await _claim_reward(user_id, client, genshin.Game.THEMIS_TW)
+    # 各遊戲同時簽到，並限制同一位使用者同時進行的請求數量
+    clients = {game: _build_client(user, game) for game in games}
+    semaphore = asyncio.Semaphore(config.daily_reward_game_concurrency)
 
-    return result
+    async def claim(game: genshin.Game) -> str:
+        client = clients[game]
+        async with semaphore:
+            match game:
+                case genshin.Game.GENSHIN | genshin.Game.HONKAI | genshin.Game.STARRAIL:
+                    challenge = getattr(gt_challenge, _GEETEST_FIELDS[game], None)
+                    return await _claim_reward(user_id, client, game, is_geetest, challenge)
+                case _:
+                    return await _claim_reward(user_id, client, game)
+
+    # gather 回傳的結果與傳入的順序相同，因此訊息順序固定
+    results = await asyncio.gather(*[claim(game) for game in games])
+    return "".join(results)
+
+
+_GEETEST_FIELDS: dict[genshin.Game, str] = {
+    genshin.Game.GENSHIN: "genshin",
+    genshin.Game.HONKAI: "honkai3rd",
+    genshin.Game.STARRAIL: "starrail",
+}
+"""遊戲與 GeetestChallenge 資料表欄位的對應"""
 
 
 async def _claim_reward(
@@ -299,6 +405,8 @@ async def _claim_reward(
         return f"{game_name[game]}今日獎勵已經領過了！"
     except genshin.errors.InvalidCookies:
         return "Cookie已失效，請從Hoyolab重新取得新Cookie。"
+    except CircuitOpenError:  # API 異常中，不重試，交由呼叫端稍後再簽到
+        raise
     except genshin.errors.DailyGeetestTriggered as exception:
         # 使用者選擇設定圖形驗證，回傳網址
         if is_geetest is True and config.geetest_solver_url is not None:
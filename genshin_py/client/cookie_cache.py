@@ -0,0 +1,43 @@
+import hashlib
+from typing import ClassVar, NamedTuple, Sequence
+
+import genshin
+from cachetools import TTLCache
+
+
+class CookieAccounts(NamedTuple):
+    """Cookie 所屬的區域與帳號列表"""
+
+    region: genshin.Region
+    accounts: Sequence[genshin.models.GenshinAccount]
+
+
+class CookieCache:
+    """以 Cookie 雜湊值為鍵，快取 Cookie 所屬的區域 (國際服或國服) 與帳號列表
+
+    設定 Cookie 時已經向 Hoyolab 確認過區域，之後建立 Client 時直接使用，
+    不用再從 UID 開頭推測；快取過期或機器人重啟後，才退回以 UID 判斷。
+    帳號列表可能因為使用者新建角色而改變，因此快取只保留一天
+    """
+
+    _cache: ClassVar[TTLCache[str, CookieAccounts]] = TTLCache(maxsize=10000, ttl=86400)
+
+    @staticmethod
+    def _key(cookie: str) -> str:
+        """記憶體內不保存 Cookie 原文，只保存雜湊值"""
+        return hashlib.sha256(cookie.encode()).hexdigest()
+
+    @classmethod
+    def get(cls, cookie: str) -> CookieAccounts | None:
+        """取得 Cookie 的區域與帳號列表，若沒有快取則回傳 None"""
+        return cls._cache.get(cls._key(cookie))
+
+    @classmethod
+    def put(
+        cls,
+        cookie: str,
+        region: genshin.Region,
+        accounts: Sequence[genshin.models.GenshinAccount],
+    ) -> None:
+        """保存從 Hoyolab 取得的區域與帳號列表"""
+        cls._cache[cls._key(cookie)] = CookieAccounts(region, accounts)
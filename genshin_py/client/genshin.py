@@ -6,7 +6,9 @@ import genshin
 from database import GenshinSpiralAbyss
 
 from ..errors_decorator import generalErrorHandler
-from .common import get_client
+from .common import HoyolabClient, get_client
+from .notes_cache import NotesCache
+from .response_cache import ResponseCache
 
 
 @generalErrorHandler
@@ -23,8 +25,14 @@ async def get_genshin_notes(user_id: int) -> genshin.models.Notes:
     `Notes`
         查詢結果
     """
+    # 短時間內 /notes 指令與自動排程共用同一份即時便箋，避免重複請求
+    cached = NotesCache.get(user_id, genshin.Game.GENSHIN)
+    if isinstance(cached, genshin.models.Notes):
+        return cached
     client = await get_client(user_id)
-    return await client.get_genshin_notes(client.uid)
+    notes = await client.get_genshin_notes(client.uid)
+    NotesCache.put(user_id, genshin.Game.GENSHIN, notes)
+    return notes
 
 
 @generalErrorHandler
@@ -44,19 +52,27 @@ async def get_genshin_spiral_abyss(user_id: int, previous: bool = False) -> Gens
         查詢結果
     """
     client = await get_client(user_id)
-    try:
-        await client.get_partial_genshin_user(client.uid or 0)  # refresh user data
-    except Exception:
-        pass
-    abyss, characters = await asyncio.gather(
-        client.get_genshin_spiral_abyss(client.uid or 0, previous=previous),
-        client.get_genshin_characters(client.uid or 0),
-        return_exceptions=True,
+
+    async def fetch():
+        try:
+            await client.get_partial_genshin_user(client.uid or 0)  # refresh user data
+        except Exception:
+            pass
+        abyss, characters = await asyncio.gather(
+            client.get_genshin_spiral_abyss(client.uid or 0, previous=previous),
+            client.get_genshin_characters(client.uid or 0),
+            return_exceptions=True,
+        )
+        if isinstance(abyss, BaseException):
+            raise abyss
+        if isinstance(characters, BaseException):
+            return abyss, None
+        return abyss, characters
+
+    # 上期深淵在下次換期前不會再變動
+    abyss, characters = await ResponseCache.get_or_fetch(
+        "genshin_spiral_abyss", user_id, client.uid or 0, (previous,), fetch, until_reset=previous
     )
-    if isinstance(abyss, BaseException):
-        raise abyss
-    if isinstance(characters, BaseException):
-        return GenshinSpiralAbyss(user_id, abyss.season, abyss, None)
     return GenshinSpiralAbyss(user_id, abyss.season, abyss, characters)
 
 
@@ -77,7 +93,14 @@ async def get_genshin_traveler_diary(user_id: int, month: int) -> genshin.models
         查詢結果
     """
     client = await get_client(user_id)
-    diary = await client.get_diary(client.uid, month=month)
+    diary = await ResponseCache.get_or_fetch(
+        "genshin_diary",
+        user_id,
+        client.uid or 0,
+        ResponseCache.diary_month(month),
+        lambda: client.get_diary(client.uid, month=month),
+        immutable=ResponseCache.is_past_month(month),
+    )
     return diary
 
 
@@ -98,7 +121,13 @@ async def get_genshin_record_card(
         查詢結果，包含UID與原神使用者資料
     """
     client = await get_client(user_id)
-    userstats = await client.get_partial_genshin_user(client.uid or 0)
+    userstats = await ResponseCache.get_or_fetch(
+        "genshin_record_card",
+        user_id,
+        client.uid or 0,
+        (),
+        lambda: client.get_partial_genshin_user(client.uid or 0),
+    )
     return (client.uid or 0, userstats)
 
 
@@ -117,7 +146,13 @@ async def get_genshin_characters(user_id: int) -> Sequence[genshin.models.Charac
         查詢結果
     """
     client = await get_client(user_id)
-    return await client.get_genshin_characters(client.uid or 0)
+    return await ResponseCache.get_or_fetch(
+        "genshin_characters",
+        user_id,
+        client.uid or 0,
+        (),
+        lambda: client.get_genshin_characters(client.uid or 0),
+    )
 
 
 @generalErrorHandler
@@ -129,6 +164,6 @@ async def get_genshin_notices() -> Sequence[genshin.models.Announcement]:
     `Sequence[Announcement]`
         公告事項查詢結果
     """
-    client = genshin.Client(lang="zh-tw")
+    client = HoyolabClient(lang="zh-tw")
     notices = await client.get_genshin_announcements()
     return notices
@@ -0,0 +1,35 @@
+from typing import ClassVar, TypeAlias
+
+import genshin
+from cachetools import TTLCache
+
+from utility import config
+
+_Notes: TypeAlias = genshin.models.Notes | genshin.models.StarRailNote | genshin.models.ZZZNotes
+
+
+class NotesCache:
+    """即時便箋的短期快取，/notes 指令、右鍵選單與自動排程共用同一份資料
+
+    快取以 (使用者 Discord ID, 遊戲) 為鍵
+    """
+
+    _cache: ClassVar[TTLCache[tuple[int, genshin.Game], _Notes]] = TTLCache(
+        maxsize=10000, ttl=config.notes_cache_ttl
+    )
+
+    @classmethod
+    def get(cls, user_id: int, game: genshin.Game) -> _Notes | None:
+        """取得快取中還沒過期的即時便箋，若沒有則回傳 None"""
+        return cls._cache.get((user_id, game))
+
+    @classmethod
+    def put(cls, user_id: int, game: genshin.Game, notes: _Notes) -> None:
+        """保存剛從 Hoyolab 取得的即時便箋"""
+        cls._cache[(user_id, game)] = notes
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        """移除使用者所有遊戲的即時便箋，在使用者的 Cookie 或 UID 變更、刪除時呼叫"""
+        for game in genshin.Game:
+            cls._cache.pop((user_id, game), None)
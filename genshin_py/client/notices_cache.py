@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar, Sequence
+
+import genshin
+
+from ..parser.common import parse_html_content
+from .genshin import get_genshin_notices
+
+
+@dataclass(frozen=True)
+class Notice:
+    """解析完成的遊戲公告"""
+
+    title: str
+    subtitle: str
+    banner: str
+    content: str
+    """移除 html 標籤、轉換成 Discord 格式的內容"""
+
+
+@dataclass(frozen=True)
+class Notices:
+    """依照類別分類的遊戲公告"""
+
+    game: list[Notice] = field(default_factory=list)
+    """遊戲公告"""
+    event: list[Notice] = field(default_factory=list)
+    """活動公告"""
+    wish: list[Notice] = field(default_factory=list)
+    """祈願卡池"""
+    fetched_at: datetime = field(default_factory=datetime.now)
+    """從 Hoyolab 取得公告的時間"""
+
+
+class NoticesCache:
+    """遊戲公告的全域快取，所有使用者共用同一份已分類、已解析 html 的公告
+
+    公告由排程定時呼叫 refresh 更新，/notices 指令只讀取快取，不向 Hoyolab 請求也不解析 html；
+    Hoyolab 公告 API 沒有 ETag，因此以公告內容的雜湊值判斷是否有變動，沒有變動時不重新解析
+
+    Methods
+    -----
+    get()
+        取得公告，還沒有快取時向 Hoyolab 請求
+    refresh()
+        向 Hoyolab 取得最新公告，有變動時重新解析
+    """
+
+    _notices: ClassVar[Notices | None] = None
+    _digest: ClassVar[str | None] = None
+    _lock: ClassVar[asyncio.Lock | None] = None
+
+    @classmethod
+    async def get(cls) -> Notices:
+        """取得公告，還沒有快取時 (例：機器人剛啟動) 向 Hoyolab 請求"""
+        if cls._notices is None:
+            await cls.refresh()
+        return cls._notices  # type: ignore
+
+    @classmethod
+    async def refresh(cls) -> bool:
+        """向 Hoyolab 取得最新公告，內容有變動時重新分類與解析；同一時間只會有一個請求
+
+        Returns
+        ------
+        `bool`:
+            公告是否有變動
+        """
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            announcements = await get_genshin_notices()
+            digest = cls._hash(announcements)
+            if digest == cls._digest and cls._notices is not None:
+                return False
+            cls._notices = await asyncio.to_thread(cls._parse, announcements)
+            cls._digest = digest
+            return True
+
+    @staticmethod
+    def _hash(announcements: Sequence[genshin.models.Announcement]) -> str:
+        sha256 = hashlib.sha256()
+        for ann in announcements:
+            for text in (str(ann.id), ann.title, ann.subtitle, ann.banner, ann.content):
+                sha256.update(text.encode())
+                sha256.update(b"\0")
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _parse(announcements: Sequence[genshin.models.Announcement]) -> Notices:
+        """將公告分成遊戲公告、活動公告、祈願公告三類，並將 html 內容轉換成 Discord 格式"""
+        notices = Notices()
+        for ann in announcements:
+            notice = Notice(ann.title, ann.subtitle, ann.banner, parse_html_content(ann.content))
+            if ann.type == 1:
+                if "祈願" in ann.subtitle:
+                    notices.wish.append(notice)
+                else:
+                    notices.event.append(notice)
+            elif ann.type == 2:
+                notices.game.append(notice)
+        return notices
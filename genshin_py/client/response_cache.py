@@ -0,0 +1,176 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, ClassVar, Final, Hashable, TypeVar
+
+from cachetools import Cache, LRUCache, TLRUCache, TTLCache
+
+from utility import config
+from utility.prometheus import Metrics
+
+T_Response = TypeVar("T_Response")
+
+
+class ResponseCache:
+    """Hoyolab 唯讀資料 (戰績、角色、札記、深淵) 的快取，以 (端點, 使用者 Discord ID, 遊戲 UID, 參數) 為鍵
+
+    - 這些資料都以使用者本人的 Cookie 請求，可能包含不公開的內容；不同的 Discord 使用者即使設定了
+      同一個 UID 也不共用快取，使用者的 Cookie 變更或刪除時以 invalidate 移除
+
+    - 每個端點有各自的有效時間 (POLICIES)；已結束的月份札記不會再變動，以 (年, 月) 為鍵、
+      immutable=True 存在不會過期的 LRU 快取
+    - 上期深淵、忘卻之庭、虛構敘事在換期前不會變動，但換期後「上期」會變成另一期，
+      以 until_reset=True 保存到下次換期 (RESET_SCHEDULES)
+    - 同一個鍵同時有多個請求時，只向 Hoyolab 請求一次，其他請求等待同一份結果 (single-flight)
+    - 每個快取都有數量上限，超過時淘汰最舊或最少使用的資料；請求發生例外時不會快取
+
+    Methods
+    -----
+    get_or_fetch(endpoint: `str`, user_id: `int`, uid: `int`, args: `tuple`, fetch: `Callable`)
+        從快取取得資料，沒有時呼叫 fetch 向 Hoyolab 請求
+    invalidate(user_id: `int`)
+        移除使用者所有的快取資料
+    """
+
+    POLICIES: Final[dict[str, float]] = {
+        "genshin_record_card": 600,
+        "genshin_characters": 1800,
+        "genshin_diary": 600,
+        "genshin_spiral_abyss": 300,
+        "starrail_userstats": 600,
+        "starrail_characters": 1800,
+        "starrail_diary": 600,
+        "starrail_forgottenhall": 300,
+        "starrail_pure_fiction": 300,
+    }
+    """各端點資料的有效時間（單位：秒）"""
+
+    RESET_SCHEDULES: Final[dict[str, Callable[[datetime], bool]]] = {
+        # 深境螺旋目前每月 16 日換期，以前為每月 1 日與 16 日，兩者都視為可能換期
+        "genshin_spiral_abyss": lambda date: date.day in (1, 16),
+        # 忘卻之庭、虛構敘事在週一換期
+        "starrail_forgottenhall": lambda date: date.weekday() == 0,
+        "starrail_pure_fiction": lambda date: date.weekday() == 0,
+    }
+    """各端點可能換期的日期，換期時間為伺服器時間 04:00；寧可提早過期，不可晚於實際換期"""
+
+    SERVER_TIMEZONES: Final[tuple[timezone, ...]] = (
+        timezone(timedelta(hours=8)),
+        timezone(timedelta(hours=1)),
+        timezone(timedelta(hours=-5)),
+    )
+    """各伺服器的時區 (亞洲與台港澳、歐洲、美洲)"""
+
+    _caches: ClassVar[dict[str, TTLCache[Hashable, Any]]] = {
+        endpoint: TTLCache(maxsize=config.response_cache_maxsize, ttl=ttl)
+        for endpoint, ttl in POLICIES.items()
+    }
+    _immutable: ClassVar[LRUCache[Hashable, Any]] = LRUCache(maxsize=config.response_cache_maxsize)
+    _until_reset: ClassVar[TLRUCache[Hashable, Any]] = TLRUCache(
+        maxsize=config.response_cache_maxsize,
+        ttu=lambda key, value, now: ResponseCache.next_reset(key[0], now),
+        timer=time.time,
+    )
+    _inflight: ClassVar[dict[Hashable, asyncio.Future]] = {}
+
+    @classmethod
+    async def get_or_fetch(
+        cls,
+        endpoint: str,
+        user_id: int,
+        uid: int,
+        args: tuple[Hashable, ...],
+        fetch: Callable[[], Awaitable[T_Response]],
+        *,
+        immutable: bool = False,
+        until_reset: bool = False,
+    ) -> T_Response:
+        """從快取取得資料，沒有時呼叫 fetch 向 Hoyolab 請求並保存結果
+
+        Parameters
+        ------
+        endpoint: `str`
+            端點名稱，必須是 POLICIES 內的其中一項
+        user_id: `int`
+            請求資料的使用者 Discord ID，資料只會提供給同一位使用者
+        uid: `int`
+            遊戲 UID
+        args: `tuple`
+            其他會影響結果的參數 (例：年與月份、是否為上期)
+        fetch: `Callable[[], Awaitable[T_Response]]`
+            向 Hoyolab 請求資料的函式
+        immutable: `bool`
+            資料是否不會再變動，不會變動的資料不設定有效時間；args 必須能唯一識別資料 (例：包含年份)
+        until_reset: `bool`
+            資料是否在下次換期前不會變動，保存到下次換期，端點必須在 RESET_SCHEDULES 內
+
+        Returns
+        ------
+        `T_Response`
+            快取或 fetch 回傳的資料，多個呼叫端會取得同一個物件，請勿修改
+        """
+        key = (endpoint, user_id, uid, *args)
+        cache: Cache[Hashable, Any]
+        if immutable:
+            cache = cls._immutable
+        elif until_reset:
+            cache = cls._until_reset
+        else:
+            cache = cls._caches[endpoint]
+        if key in cache:
+            Metrics.RESPONSE_CACHE_REQUESTS.labels(endpoint, "hit").inc()
+            return cache[key]
+
+        future = cls._inflight.get(key)
+        if future is None:
+            Metrics.RESPONSE_CACHE_REQUESTS.labels(endpoint, "miss").inc()
+            future = cls._inflight[key] = asyncio.ensure_future(fetch())
+            future.add_done_callback(lambda f: cls._on_fetched(key, cache, f))
+        else:
+            Metrics.RESPONSE_CACHE_REQUESTS.labels(endpoint, "inflight").inc()
+        # 呼叫端被取消時不影響其他等待同一個請求的呼叫端
+        return await asyncio.shield(future)
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        """移除使用者所有的快取資料，在使用者的 Cookie 變更、刪除時呼叫"""
+        caches: list[Cache[Hashable, Any]] = [
+            *cls._caches.values(),
+            cls._immutable,
+            cls._until_reset,
+        ]
+        for cache in caches:
+            for key in [key for key in cache.keys() if key[1] == user_id]:
+                cache.pop(key, None)
+
+    @staticmethod
+    def diary_month(month: int) -> tuple[int, int]:
+        """札記月份的 (年, 月)；札記只能查詢最近幾個月，大於目前月份的月份屬於去年"""
+        now = datetime.now()
+        return (now.year - 1 if month > now.month else now.year, month)
+
+    @classmethod
+    def next_reset(cls, endpoint: str, now: float) -> float:
+        """回傳 now 之後最早的換期時間 (timestamp)；取所有伺服器中最早的一個，不會晚於任何伺服器實際換期"""
+        is_reset_day = cls.RESET_SCHEDULES[endpoint]
+        resets: list[float] = []
+        for tz in cls.SERVER_TIMEZONES:
+            local = datetime.fromtimestamp(now, tz)
+            reset = local.replace(hour=4, minute=0, second=0, microsecond=0)
+            while reset <= local or not is_reset_day(reset):
+                reset += timedelta(days=1)
+            resets.append(reset.timestamp())
+        return min(resets)
+
+    @staticmethod
+    def is_past_month(month: int) -> bool:
+        """判斷札記的月份是否已經結束 (每月 1 日各伺服器時區不同，仍視為可能變動)"""
+        now = datetime.now()
+        return month != now.month and now.day > 1
+
+    @classmethod
+    def _on_fetched(cls, key: Hashable, cache: Cache[Hashable, Any], future: asyncio.Future):
+        """請求完成後移除進行中的紀錄，成功時保存結果"""
+        cls._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            cache[key] = future.result()
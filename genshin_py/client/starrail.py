@@ -2,24 +2,45 @@ import genshin
 
 from ..errors_decorator import generalErrorHandler
 from .common import get_client
+from .notes_cache import NotesCache
+from .response_cache import ResponseCache
 
 
 @generalErrorHandler
 async def get_starrail_notes(user_id: int) -> genshin.models.StarRailNote:
+    # 短時間內 /notes 指令與自動排程共用同一份即時便箋，避免重複請求
+    cached = NotesCache.get(user_id, genshin.Game.STARRAIL)
+    if isinstance(cached, genshin.models.StarRailNote):
+        return cached
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    return await client.get_starrail_notes(client.uid)
+    notes = await client.get_starrail_notes(client.uid)
+    NotesCache.put(user_id, genshin.Game.STARRAIL, notes)
+    return notes
 
 
 @generalErrorHandler
 async def get_starrail_diary(user_id: int, month: int) -> genshin.models.StarRailDiary:
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    return await client.get_starrail_diary(client.uid, month=month)
+    return await ResponseCache.get_or_fetch(
+        "starrail_diary",
+        user_id,
+        client.uid or 0,
+        ResponseCache.diary_month(month),
+        lambda: client.get_starrail_diary(client.uid, month=month),
+        immutable=ResponseCache.is_past_month(month),
+    )
 
 
 @generalErrorHandler
 async def get_starrail_characters(user_id: int) -> list[genshin.models.StarRailDetailCharacter]:
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    r = await client.get_starrail_characters(client.uid)
+    r = await ResponseCache.get_or_fetch(
+        "starrail_characters",
+        user_id,
+        client.uid or 0,
+        (),
+        lambda: client.get_starrail_characters(client.uid),
+    )
     return r.avatar_list
 
 
@@ -28,7 +49,15 @@ async def get_starrail_forgottenhall(
     user_id: int, previous_season: bool = False
 ) -> genshin.models.StarRailChallenge:
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    return await client.get_starrail_challenge(client.uid, previous=previous_season)
+    # 上期忘卻之庭在下次換期前不會再變動
+    return await ResponseCache.get_or_fetch(
+        "starrail_forgottenhall",
+        user_id,
+        client.uid or 0,
+        (previous_season,),
+        lambda: client.get_starrail_challenge(client.uid, previous=previous_season),
+        until_reset=previous_season,
+    )
 
 
 @generalErrorHandler
@@ -36,10 +65,23 @@ async def get_starrail_pure_fiction(
     user_id: int, previous_season: bool = False
 ) -> genshin.models.StarRailPureFiction:
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    return await client.get_starrail_pure_fiction(client.uid, previous=previous_season)
+    return await ResponseCache.get_or_fetch(
+        "starrail_pure_fiction",
+        user_id,
+        client.uid or 0,
+        (previous_season,),
+        lambda: client.get_starrail_pure_fiction(client.uid, previous=previous_season),
+        until_reset=previous_season,
+    )
 
 
 @generalErrorHandler
 async def get_starrail_userstats(user_id: int) -> genshin.models.StarRailUserStats:
     client = await get_client(user_id, game=genshin.Game.STARRAIL)
-    return await client.get_starrail_user(client.uid)
+    return await ResponseCache.get_or_fetch(
+        "starrail_userstats",
+        user_id,
+        client.uid or 0,
+        (),
+        lambda: client.get_starrail_user(client.uid),
+    )
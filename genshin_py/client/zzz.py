@@ -2,9 +2,16 @@ import genshin
 
 from ..errors_decorator import generalErrorHandler
 from .common import get_client
+from .notes_cache import NotesCache
 
 
 @generalErrorHandler
 async def get_zzz_notes(user_id: int) -> genshin.models.ZZZNotes:
+    # 短時間內 /notes 指令與自動排程共用同一份即時便箋，避免重複請求
+    cached = NotesCache.get(user_id, genshin.Game.ZZZ)
+    if isinstance(cached, genshin.models.ZZZNotes):
+        return cached
     client = await get_client(user_id, game=genshin.Game.ZZZ)
-    return await client.get_zzz_notes(client.uid)
+    notes = await client.get_zzz_notes(client.uid)
+    NotesCache.put(user_id, genshin.Game.ZZZ, notes)
+    return notes
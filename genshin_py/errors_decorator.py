@@ -1,19 +1,21 @@
 import asyncio
 import datetime
+import time
 from typing import Callable
 
-import aiohttp
 import genshin
 import sentry_sdk
 
 from database import Database, User
-from utility import LOG, config
+from utility import LOG, CircuitOpenError, config
+from utility.prometheus import Metrics
 
 from .errors import GenshinAPIException, UserDataNotFound
+from .retry_policy import RetryPolicy
 
 
 def generalErrorHandler(func: Callable):
-    """對於使用genshin.py函式的通用例外處理裝飾器"""
+    """對於使用genshin.py函式的通用例外處理裝飾器，暫時性的錯誤依照目前執行環境的 RetryPolicy 重試"""
 
     async def wrapper(*args, **kwargs):
         user_id = -1
@@ -23,9 +25,12 @@ def generalErrorHandler(func: Callable):
                 user_id = arg
                 break
         try:
-            # 針對特定錯誤加入重試機制
-            RETRY_MAX = 3
-            for retry in range(RETRY_MAX, -1, -1):
+            # 針對暫時性的錯誤加入重試機制，重試次數與總時間依照目前的重試策略 (指令或自動排程)
+            policy = RetryPolicy.current()
+            start = time.monotonic()
+            retry = 0
+            delay = 0.0
+            while True:
                 try:
                     result = await func(*args, **kwargs)
 
@@ -36,14 +41,19 @@ def generalErrorHandler(func: Callable):
                         await Database.insert_or_replace(user)
 
                     return result
-                except (genshin.errors.InternalDatabaseError, aiohttp.ClientOSError) as e:
+                except Exception as e:
+                    if not policy.is_retryable(e):
+                        raise
                     LOG.FuncExceptionLog(user_id, f"{func.__name__} (retry={retry})", e)
-                    if retry == 0:  # 當重試次數用完時拋出例外
+                    delay = policy.next_delay(delay)
+                    error = type(e).__name__
+                    # 當重試次數用完，或等待後會超過重試的總時間時拋出例外
+                    if retry >= policy.max_retries or time.monotonic() - start + delay > policy.deadline:
+                        Metrics.GENSHIN_API_RETRIES_EXHAUSTED.labels(policy.name, error).inc()
                         raise
-                    else:
-                        # 重試之間加入等待時間，並遞增每次的等待時間
-                        await asyncio.sleep(1.0 + RETRY_MAX - retry)
-                        continue
+                    Metrics.GENSHIN_API_RETRIES.labels(policy.name, error).inc()
+                    retry += 1
+                    await asyncio.sleep(delay)
         except genshin.errors.DataNotPublic as e:
             LOG.FuncExceptionLog(user_id, func.__name__, e)
             raise GenshinAPIException(e, "此功能權限未開啟，請先從Hoyolab網頁或App上的個人戰績->設定，將此功能啟用")
@@ -61,6 +71,9 @@ def generalErrorHandler(func: Callable):
             LOG.FuncExceptionLog(user_id, func.__name__, e)
             sentry_sdk.capture_exception(e)
             raise GenshinAPIException(e, e.original)
+        except CircuitOpenError as e:  # API 異常中，不送出請求，直接回覆使用者稍後再試
+            LOG.FuncExceptionLog(user_id, func.__name__, e)
+            raise
         except UserDataNotFound as e:
             LOG.FuncExceptionLog(user_id, func.__name__, e)
             raise Exception(str(e))
@@ -1,2 +1,29 @@
-from .genshin import *
-from .starrail import *
+"""繪製遊戲紀錄圖片的模組，需要 PIL、enkanetwork 與 genshinpyrail，第一次使用時才載入對應的子模組"""
+
+from typing import TYPE_CHECKING
+
+from utility import lazy_attributes
+
+if TYPE_CHECKING:
+    from .characters import draw_character_list
+    from .genshin import draw_abyss_card, draw_exploration_card, draw_record_card
+    from .starrail import draw_starrail_forgottenhall_card
+
+__all__ = [
+    "draw_abyss_card",
+    "draw_character_list",
+    "draw_exploration_card",
+    "draw_record_card",
+    "draw_starrail_forgottenhall_card",
+]
+
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "draw_abyss_card": ".genshin",
+        "draw_character_list": ".characters",
+        "draw_exploration_card": ".genshin",
+        "draw_record_card": ".genshin",
+        "draw_starrail_forgottenhall_card": ".starrail",
+    },
+)
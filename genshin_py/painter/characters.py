@@ -0,0 +1,25 @@
+from typing import Sequence
+
+import genshin
+from genshinpyrail.genshinpyrail import genshin_character_list, honkai_character_list
+from genshinpyrail.src.tools.model import GenshinCharterList, StarRaillCharterList
+from PIL import Image
+
+__all__ = ["draw_character_list"]
+
+
+async def draw_character_list(
+    game: genshin.Game,
+    characters: (
+        Sequence[genshin.models.Character] | Sequence[genshin.models.StarRailDetailCharacter]
+    ),
+) -> Image.Image | None:
+    """使用 genshinpyrail 產生角色一覽圖片，不支援的遊戲回傳 None"""
+    match game:
+        case genshin.Game.GENSHIN:
+            data = await genshin_character_list.Creat(characters).start()
+            return GenshinCharterList(**data).card
+        case genshin.Game.STARRAIL:
+            data = await honkai_character_list.Creat(characters).start()
+            return StarRaillCharterList(**data).card
+    return None
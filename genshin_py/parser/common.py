@@ -1,6 +1,224 @@
 import re
+from html.parser import HTMLParser
 
-from bs4 import BeautifulSoup
+_URL_PATTERN = re.compile(r"\(\'(https?://.*)\'\)")
+"""米哈遊公告內連結的格式：javascript:miHoYoGameJSSDK.openInBrowser('https://...')"""
+
+
+class _StopParsing(Exception):
+    """內容長度已達上限，停止解析剩下的 html"""
+
+
+class _HtmlToDiscordParser(HTMLParser):
+    """以串流方式將公告的 html 轉換成 Discord 格式的文字，內容長度達到上限後就停止解析
+
+    以最外層的每個標籤為一列，依照列內的內容決定輸出格式：
+    連結 > 圖片 > 表格 > 有序項目 > 無序項目 > 一般文字
+    """
+
+    VOID_ELEMENTS = frozenset(
+        {
+            "area",
+            "base",
+            "basefont",
+            "bgsound",
+            "br",
+            "col",
+            "command",
+            "embed",
+            "frame",
+            "hr",
+            "image",
+            "img",
+            "input",
+            "isindex",
+            "keygen",
+            "link",
+            "menuitem",
+            "meta",
+            "nextid",
+            "param",
+            "source",
+            "spacer",
+            "track",
+            "wbr",
+        }
+    )
+    """沒有結束標籤的元素，與 BeautifulSoup 相同"""
+
+    PRESERVE_WHITESPACE = frozenset({"pre", "textarea"})
+    """保留原本空白字元的元素"""
+
+    ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+    """BeautifulSoup 視為空白的字元"""
+
+    def __init__(self, length_limit: int):
+        super().__init__(convert_charrefs=True)
+        self.length_limit = length_limit
+        self.buffer: list[str] = []
+        self.text_length = 0  # 用來統計已處理的文字長度
+        self._stack: list[str] = []
+        self._data: list[str] = []  # 兩個標籤之間還沒處理的文字
+        self._closed_voids: list[str] = []  # 已關閉的空元素，之後出現的結束標籤會被忽略
+        self._start_row("")
+
+    def _start_row(self, tag: str) -> None:
+        self._row_tag = tag
+        self._row_text: list[str] = []
+        self._link: str | None = None  # 列內第一個連結的網址
+        self._image: str | None = None  # 列內第一張圖片的網址
+        self._has_table = False
+        self._items: list[list[str]] = []  # 列內所有 li 的文字
+        self._open_items: list[list[str]] = []
+        self._table: list[list[list[str]]] = []  # 列內每個 tr 的所有 td 文字
+        self._open_rows: list[list[list[str]]] = []
+        self._open_cells: list[list[str]] = []
+
+    def _check_limit(self) -> None:
+        """每一列開始之前檢查長度，超過上限時加上刪節號並停止解析"""
+        if self.text_length > self.length_limit:
+            self.buffer.append("...")
+            raise _StopParsing
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._start_tag(tag, attrs)
+        if tag in self.VOID_ELEMENTS:
+            self._closed_voids.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        # <tag/> 的結束標籤一定會處理，且不影響之後出現的 </tag>
+        self._start_tag(tag, attrs)
+        self._end_tag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        # 與 BeautifulSoup 相同，空元素多餘的結束標籤直接忽略，前後的文字視為同一段
+        if tag in self._closed_voids:
+            self._closed_voids.remove(tag)
+            return
+        self._end_tag(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def _start_tag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_data()
+        if len(self._stack) == 0:
+            self._check_limit()
+            self._start_row(tag)
+            if tag not in self.VOID_ELEMENTS:
+                self._stack.append(tag)
+            else:
+                self._end_row()
+            return
+
+        # 列內的元素 (不包含列本身)
+        match tag:
+            case "a" if self._link is None:
+                self._link = dict(attrs).get("href") or ""
+            case "img" if self._image is None:
+                self._image = dict(attrs).get("src") or ""
+            case "table":
+                self._has_table = True
+            case "li":
+                self._items.append([])
+                self._open_items.append(self._items[-1])
+            case "tr":
+                self._table.append([])
+                self._open_rows.append(self._table[-1])
+            case "td":
+                # 與 BeautifulSoup 的 tr.find_all("td") 相同，td 屬於所有包含它的 tr，不在 tr 內的 td 不輸出
+                cell: list[str] = []
+                for row in self._open_rows:
+                    row.append(cell)
+                self._open_cells.append(cell)
+        if tag not in self.VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def _end_tag(self, tag: str) -> None:
+        self._flush_data()
+        # 與 BeautifulSoup 相同，結束標籤會關閉最近一個同名的標籤，沒有對應的開始標籤時忽略
+        if tag not in self._stack:
+            return
+        while len(self._stack) > 0:
+            closed = self._stack.pop()
+            if closed == "li" and len(self._open_items) > 0:
+                self._open_items.pop()
+            elif closed == "tr" and len(self._open_rows) > 0:
+                self._open_rows.pop()
+            elif closed == "td" and len(self._open_cells) > 0:
+                self._open_cells.pop()
+            if closed == tag:
+                break
+        if len(self._stack) == 0:
+            self._end_row()
+
+    def _flush_data(self) -> None:
+        """處理兩個標籤之間的文字"""
+        if len(self._data) == 0:
+            return
+        data = "".join(self._data)
+        self._data = []
+        # 與 BeautifulSoup 相同，只有空白字元的文字縮減成一個換行或空格 (pre、textarea 內除外)
+        preserve = not self.PRESERVE_WHITESPACE.isdisjoint(self._stack)
+        if not preserve and data.strip(self.ASCII_SPACES) == "":
+            data = "\n" if "\n" in data else " "
+        if len(self._stack) == 0:
+            # 最外層的純文字，與 BeautifulSoup 相同，只有空白字元時也算一列
+            self._check_limit()
+            if data.strip() == "":
+                return
+            self._start_row("")
+            self._row_text.append(data)
+            self._end_row()
+            return
+        self._row_text.append(data)
+        for item in self._open_items:
+            item.append(data)
+        for cell in self._open_cells:
+            cell.append(data)
+
+    def _end_row(self) -> None:
+        text = "".join(self._row_text)
+        if self._link is not None and (url := _URL_PATTERN.search(self._link)):
+            # 將連結轉換成 discord 格式
+            self.buffer.append(f"[{text}]({url.group(1)})\n")
+            self.text_length += len(text)
+        elif self._image is not None:
+            # 將圖片以連結顯示
+            self.buffer.append(f"[>>圖片<<]({self._image})\n")
+        elif self._row_tag == "div" and self._has_table:
+            # 將表格同一行內容以符號隔開
+            for tr in self._table:
+                for td in tr:
+                    td_text = "".join(td)
+                    self.buffer.append("· " + td_text + " ")
+                    self.text_length += len(td_text)
+                self.buffer.append("\n")
+        elif self._row_tag == "ol":
+            # 將有序項目每一行開頭加入數字
+            for i, li in enumerate(self._items):
+                li_text = "".join(li)
+                self.buffer.append(f"{i+1}. {li_text}\n")
+                self.text_length += len(li_text)
+        elif self._row_tag == "ul":
+            # 將無序項目每一行開頭加入符號
+            for li in self._items:
+                li_text = "".join(li)
+                self.buffer.append("· " + li_text + "\n")
+                self.text_length += len(li_text)
+        else:  # 一般內容
+            text = text.strip() + "\n"
+            self.buffer.append(text)
+            self.text_length += len(text)
+        self._start_row("")
+
+    def close(self) -> None:
+        super().close()
+        self._flush_data()
+        # 結尾沒有關閉的標籤視為已關閉
+        if len(self._stack) > 0:
+            self._stack.clear()
+            self._end_row()
 
 
 def parse_html_content(html_text: str, length_limit: int = 500) -> str:
@@ -19,43 +237,10 @@ def parse_html_content(html_text: str, length_limit: int = 500) -> str:
     html_text = html_text.replace('&lt;t class="t_gl"&gt;', "")
     html_text = html_text.replace("&lt;/t&gt;", "")
 
-    soup = BeautifulSoup(html_text, features="html.parser")
-    url_pattern = re.compile(r"\(\'(https?://.*)\'\)")
-
-    result = ""
-    text_length = 0  # 用來統計已處理的文字長度
-    for row in soup:
-        if text_length > length_limit:
-            return result + "..."
-
-        if row.a is not None and (url := url_pattern.search(row.a["href"])):
-            # 將連結轉換成 discord 格式
-            result += f"[{row.text}]({url.group(1)})\n"
-            text_length += len(row.text)
-        elif row.img is not None:
-            # 將圖片以連結顯示
-            url = row.img["src"]
-            result += f"[>>圖片<<]({url})\n"
-        elif row.name == "div" and row.table is not None:
-            # 將表格同一行內容以符號隔開
-            for tr in row.find_all("tr"):
-                for td in tr.find_all("td"):
-                    result += "· " + td.text + " "
-                    text_length += len(td.text)
-                result += "\n"
-        elif row.name == "ol":
-            # 將有序項目每一行開頭加入數字
-            for i, li in enumerate(row.find_all("li")):
-                result += f"{i+1}. {li.text}\n"
-                text_length += len(li.text)
-        elif row.name == "ul":  # 無序項目
-            # 將無序項目每一行開頭加入符號
-            for li in row.find_all("li"):
-                result += "· " + li.text + "\n"
-                text_length += len(li.text)
-        else:  # 一般內容
-            text = row.text.strip() + "\n"
-            result += text
-            text_length += len(text)
-
-    return result
+    parser = _HtmlToDiscordParser(length_limit)
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except _StopParsing:
+        pass
+    return "".join(parser.buffer)
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, ClassVar, Final
+
+import aiohttp
+import genshin
+import yarl
+from aiohttp_socks import ProxyConnector
+
+from utility import LOG, config
+from utility.prometheus import Metrics
+
+
+@dataclass
+class _Proxy:
+    """代理伺服器的狀態"""
+
+    url: str
+    latency: float | None = None
+    """回應時間的指數移動平均（單位：秒）"""
+    in_flight: int = 0
+    """目前經由此代理伺服器進行中的請求數量"""
+    failures: int = 0
+    """連續失敗的次數"""
+    ejected_until: float = 0.0
+    """被移出代理池直到此時間 (time.monotonic)"""
+    eject_reason: BaseException | None = None
+    """最近一次被移出代理池的原因"""
+
+    @property
+    def label(self) -> str:
+        """Prometheus 標籤，不包含代理伺服器的帳號密碼"""
+        url = yarl.URL(self.url)
+        return f"{url.host}:{url.port}"
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def update_latency(self, latency: float) -> None:
+        """以新的回應時間更新指數移動平均"""
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+
+    def score(self) -> float:
+        """選擇代理伺服器的分數，越小越優先；還沒有回應時間的代理伺服器會優先被嘗試"""
+        return (self.latency or 0.0) * (self.in_flight + 1)
+
+
+class ProxyPool:
+    """genshin.py 向 Hoyolab 請求時使用的代理伺服器池
+
+    - 每次請求選擇健康且未達並行上限的代理伺服器，同一個 Client 優先沿用上次的代理伺服器，
+      否則選擇回應時間 × 進行中請求數量最小的一台，讓自動排程的請求分散到不同的對外 IP
+    - 連續失敗 (連線錯誤、逾時、被限流) 達到次數時暫時移出代理池；因連線錯誤或逾時被移出的代理伺服器
+      由健康檢查確認恢復後提早重新加入，因被限流移出的代理伺服器必須等到移出時間結束
+    - 所有代理伺服器都被移出時，仍然從全部代理伺服器中選擇，不會改為直接連線
+
+    代理伺服器清單為 config.genshin_py_proxy_servers，未設定時使用 config.genshin_py_proxy_server
+
+    Methods
+    -----
+    acquire(preferred: `str` | `None`)
+        取得一台代理伺服器的並行名額
+    record(url: `str`, latency: `float`, exception: `BaseException` | `None`)
+        回報經由代理伺服器的請求結果
+    health_check()
+        檢查所有代理伺服器的連線狀況
+    """
+
+    EJECT_FAILURES: Final[int] = 3
+    """連續失敗達到此次數時移出代理池"""
+
+    HEALTH_CHECK_URL: Final[str] = "https://bbs-api-os.hoyolab.com/"
+    """健康檢查時經由代理伺服器連線的網址，收到任何 HTTP 回應即視為正常"""
+
+    FAILURE_ERRORS: Final[tuple[type[BaseException], ...]] = (
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+        genshin.errors.VisitsTooFrequently,
+    )
+    """視為代理伺服器異常的例外，被限流通常代表此對外 IP 的請求過多"""
+
+    RATELIMIT_ERRORS: Final[tuple[type[BaseException], ...]] = (
+        genshin.errors.VisitsTooFrequently,
+    )
+    """被限流的例外；限流時代理伺服器仍可正常連線，健康檢查無法判斷是否恢復"""
+
+    _proxies: ClassVar[dict[str, _Proxy] | None] = None
+    _condition: ClassVar[asyncio.Condition | None] = None
+
+    @classmethod
+    def _get_proxies(cls) -> dict[str, _Proxy]:
+        if cls._proxies is None:
+            urls = config.genshin_py_proxy_servers or (
+                [config.genshin_py_proxy_server] if config.genshin_py_proxy_server else []
+            )
+            cls._proxies = {url: _Proxy(url) for url in urls}
+        return cls._proxies
+
+    @classmethod
+    def _select(cls, preferred: str | None) -> _Proxy | None:
+        """選擇代理伺服器，所有代理伺服器都達到並行上限時回傳 None"""
+        proxies = list(cls._get_proxies().values())
+        candidates = [p for p in proxies if p.healthy] or proxies
+        candidates = [p for p in candidates if p.in_flight < config.proxy_max_concurrency]
+        if len(candidates) == 0:
+            return None
+        for proxy in candidates:
+            if proxy.url == preferred:
+                return proxy
+        return min(candidates, key=_Proxy.score)
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls, preferred: str | None = None) -> AsyncIterator[str | None]:
+        """取得一台代理伺服器的並行名額，沒有設定代理伺服器時回傳 None (直接連線)
+
+        Parameters
+        ------
+        preferred: `str` | `None`
+            優先使用的代理伺服器網址，通常為 Client 上次使用的代理伺服器
+        """
+        if len(cls._get_proxies()) == 0:
+            yield None
+            return
+        if cls._condition is None:
+            cls._condition = asyncio.Condition()
+        async with cls._condition:
+            while (proxy := cls._select(preferred)) is None:
+                await cls._condition.wait()
+            proxy.in_flight += 1
+        try:
+            yield proxy.url
+        finally:
+            async with cls._condition:
+                proxy.in_flight -= 1
+                cls._condition.notify_all()
+
+    @classmethod
+    def record(cls, url: str | None, latency: float, exception: BaseException | None = None):
+        """回報經由代理伺服器的請求結果，更新回應時間與連續失敗次數"""
+        proxy = cls._get_proxies().get(url or "")
+        if proxy is None:
+            return
+        if isinstance(exception, cls.FAILURE_ERRORS):
+            proxy.failures += 1
+            if proxy.failures >= cls.EJECT_FAILURES and proxy.healthy:
+                cls._eject(proxy, exception)
+        else:
+            proxy.failures = 0
+            proxy.update_latency(latency)
+        cls._export(proxy)
+
+    @classmethod
+    async def health_check(cls) -> None:
+        """經由每台代理伺服器連線到 Hoyolab，更新回應時間，並將因連線錯誤或逾時被移出的代理伺服器加回代理池"""
+
+        async def probe(proxy: _Proxy) -> None:
+            start = time.perf_counter()
+            try:
+                # 以 aiohttp_socks (genshin.py socks-proxy 套件) 連線，同時支援 http 與 socks 代理
+                connector = ProxyConnector.from_url(proxy.url)
+                timeout = aiohttp.ClientTimeout(total=10)
+                async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                    async with session.get(cls.HEALTH_CHECK_URL):
+                        pass
+            except Exception as e:
+                cls._eject(proxy, e)
+            else:
+                latency = time.perf_counter() - start
+                if isinstance(proxy.eject_reason, cls.RATELIMIT_ERRORS) and not proxy.healthy:
+                    # 被限流的代理伺服器仍能正常連線，只更新回應時間，等移出時間結束再加回代理池
+                    proxy.update_latency(latency)
+                else:
+                    if proxy.healthy is False:
+                        LOG.System(f"代理伺服器 {proxy.label} 恢復正常，重新加入代理池")
+                    proxy.ejected_until = 0.0
+                    proxy.failures = 0
+                    cls.record(proxy.url, latency)
+            cls._export(proxy)
+
+        await asyncio.gather(*[probe(proxy) for proxy in cls._get_proxies().values()])
+
+    @classmethod
+    def _eject(cls, proxy: _Proxy, exception: BaseException) -> None:
+        """將代理伺服器暫時移出代理池"""
+        if proxy.healthy:
+            LOG.System(f"代理伺服器 {proxy.label} 異常，暫時移出代理池：{exception!r}")
+        # 被限流移出期間健康檢查又失敗時保留限流的原因，避免連線恢復後提早加回代理池
+        if proxy.healthy or not isinstance(proxy.eject_reason, cls.RATELIMIT_ERRORS):
+            proxy.eject_reason = exception
+        proxy.ejected_until = time.monotonic() + config.proxy_eject_seconds
+
+    @classmethod
+    def _export(cls, proxy: _Proxy) -> None:
+        """將代理伺服器狀態輸出到 Prometheus"""
+        Metrics.PROXY_HEALTHY.labels(proxy.label).set(int(proxy.healthy))
+        Metrics.PROXY_LATENCY.labels(proxy.label).set(proxy.latency or 0.0)
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, ClassVar, Final
+
+import aiohttp
+import genshin
+
+from utility import CircuitBreaker, config
+from utility.prometheus import Metrics
+
+
+class RateController:
+    """以 AIMD (加法增加、乘法減少) 調整自動排程對 Hoyolab 的請求速率，每個區域各自擁有一個控制器
+
+    - 請求成功且回應時間正常時，並行數量緩慢增加 (約每完成一輪並行請求 +1)
+    - 發生限流、圖形驗證、內部錯誤或回應時間過長時，並行數量減半；
+      並行數量已經是 1 時則改為加倍使用者之間的等待時間
+    - 區域的名稱為 genshin.Region 的值 ("os"、"cn")，或遠端簽到 API 的網址
+    - 每個控制器擁有一個斷路器，API 持續異常時斷路器開啟，排程暫停直到試探請求成功
+
+    Methods
+    -----
+    get(region: `str`)
+        取得指定區域的控制器
+    slot()
+        取得一個並行名額，離開時等待使用者之間的間隔後歸還
+    record(latency: `float`, exception: `BaseException` | `None`)
+        回報一次請求的結果
+    """
+
+    CONGESTION_ERRORS: Final[tuple[type[BaseException], ...]] = (
+        genshin.errors.VisitsTooFrequently,
+        genshin.errors.InternalDatabaseError,
+        genshin.errors.GeetestError,
+        genshin.errors.DailyGeetestTriggered,
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+    )
+    """視為 API 壅塞的例外"""
+
+    UPSTREAM_ERRORS: Final[tuple[type[BaseException], ...]] = (
+        genshin.errors.VisitsTooFrequently,
+        genshin.errors.InternalDatabaseError,
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+    )
+    """視為 API 本身異常的例外，會計入斷路器的失敗次數 (圖形驗證只影響個別帳號，不計入)"""
+
+    MAX_DELAY: Final[float] = 60.0
+    """使用者之間的等待間隔上限（單位：秒）"""
+
+    _controllers: ClassVar[dict[str, "RateController"]] = {}
+
+    def __init__(self, region: str):
+        self.region = region
+        self.limit: float = 1.0
+        """目前的並行數量上限，從 1 開始慢慢增加"""
+        self.delay: float = config.schedule_loop_delay
+        """目前使用者之間的等待間隔（單位：秒）"""
+        self.latency: float | None = None
+        """請求回應時間的指數移動平均（單位：秒）"""
+        self._in_flight: int = 0
+        self._last_decrease: float = 0.0
+        self._condition = asyncio.Condition()
+        self.breaker = CircuitBreaker.get(f"hoyolab:{region}")
+        """此區域的斷路器"""
+        self._export()
+
+    @classmethod
+    def get(cls, region: str) -> "RateController":
+        """取得指定區域的控制器，若不存在則建立一個新的"""
+        controller = cls._controllers.get(region)
+        if controller is None:
+            controller = cls._controllers[region] = cls(region)
+        return controller
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """取得一個並行名額，離開時等待使用者之間的間隔後才歸還名額；斷路器開啟時先暫停等待"""
+        await self.breaker.wait_until_available()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            yield
+            await asyncio.sleep(self.delay)
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, latency: float, exception: BaseException | None = None) -> None:
+        """回報一次請求的回應時間與例外，依此調整請求速率
+
+        Parameters
+        ------
+        latency: `float`
+            請求的回應時間（單位：秒）
+        exception: `BaseException` | `None`
+            請求發生的例外；已領取、Cookie 失效等一般的 API 回應不會被視為壅塞
+        """
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if (
+            isinstance(exception, self.CONGESTION_ERRORS)
+            or latency > config.schedule_latency_threshold
+        ):
+            self._decrease()
+        else:
+            self._increase()
+        if isinstance(exception, self.UPSTREAM_ERRORS):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        self._export()
+
+    def _increase(self) -> None:
+        """加法增加：先將等待間隔恢復到設定值，再增加並行數量"""
+        if self.delay > config.schedule_loop_delay:
+            self.delay = max(config.schedule_loop_delay, self.delay - 1.0)
+        elif self.limit < config.schedule_concurrency_max:
+            self.limit = min(float(config.schedule_concurrency_max), self.limit + 1.0 / self.limit)
+
+    def _decrease(self) -> None:
+        """乘法減少：並行數量減半，已經是 1 時則加倍等待間隔"""
+        # 同一輪並行請求可能同時回報多個錯誤，一段時間內只減少一次
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 1.0) + self.delay:
+            return
+        self._last_decrease = now
+        if self.limit >= 2.0:
+            self.limit = max(1.0, self.limit / 2)
+        else:
+            self.limit = 1.0
+            self.delay = min(self.MAX_DELAY, max(1.0, self.delay * 2))
+
+    def _export(self) -> None:
+        """將目前的並行數量與預估速率輸出到 Prometheus"""
+        Metrics.SCHEDULE_CONCURRENCY.labels(self.region).set(int(self.limit))
+        Metrics.SCHEDULE_REQUEST_RATE.labels(self.region).set(
+            int(self.limit) / max((self.latency or 0.0) + self.delay, 0.001)
+        )
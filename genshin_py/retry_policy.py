@@ -0,0 +1,93 @@
+import asyncio
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import ClassVar, Iterator
+
+import aiohttp
+import genshin
+
+from utility import config
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """genshin.py 請求失敗時的重試策略
+
+    重試間隔使用 decorrelated jitter (每次等待時間在基本間隔與上次間隔的 3 倍之間隨機)，
+    避免大量請求在同一時間重試；所有重試加上等待時間不會超過 deadline
+
+    - INTERACTIVE：使用者的斜線指令，預算較短，避免超過 Discord 互動回應的時限
+    - SCHEDULER：自動排程，預算較長，盡量讓排程成功
+
+    目前的策略存在 ContextVar，預設為 INTERACTIVE，自動排程以 `with RetryPolicy.SCHEDULER.use()` 切換，
+    在區塊內建立的 asyncio task 也會使用同樣的策略
+    """
+
+    name: str
+    """策略名稱，用於 Prometheus 標籤"""
+    max_retries: int
+    """最多重試次數"""
+    deadline: float
+    """第一次請求開始後，允許重試的總時間（單位：秒）"""
+    base_delay: float
+    """重試的最短等待時間（單位：秒）"""
+    max_delay: float
+    """重試的最長等待時間（單位：秒）"""
+
+    RETRYABLE_ERRORS: ClassVar[tuple[type[BaseException], ...]] = (
+        genshin.errors.InternalDatabaseError,
+        genshin.errors.VisitsTooFrequently,
+        aiohttp.ClientOSError,
+        aiohttp.ServerDisconnectedError,
+        asyncio.TimeoutError,
+    )
+    """暫時性的錯誤，重試可能成功；其他錯誤 (例：Cookie 失效、資料未公開) 重試也不會成功"""
+
+    INTERACTIVE: ClassVar["RetryPolicy"]
+    SCHEDULER: ClassVar["RetryPolicy"]
+
+    @classmethod
+    def current(cls) -> "RetryPolicy":
+        """取得目前執行環境的重試策略"""
+        return _current_policy.get()
+
+    @contextmanager
+    def use(self) -> Iterator[None]:
+        """在 with 區塊內使用此重試策略"""
+        token = _current_policy.set(self)
+        try:
+            yield
+        finally:
+            _current_policy.reset(token)
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        """判斷例外是否為暫時性的錯誤"""
+        return isinstance(exception, self.RETRYABLE_ERRORS)
+
+    def next_delay(self, previous: float) -> float:
+        """依照上次的等待時間，計算下次重試前的等待時間 (decorrelated jitter)"""
+        return min(
+            self.max_delay, random.uniform(self.base_delay, max(previous, self.base_delay) * 3)
+        )
+
+
+RetryPolicy.INTERACTIVE = RetryPolicy(
+    name="interactive",
+    max_retries=2,
+    deadline=config.retry_interactive_deadline,
+    base_delay=0.3,
+    max_delay=1.0,
+)
+RetryPolicy.SCHEDULER = RetryPolicy(
+    name="scheduler",
+    max_retries=5,
+    deadline=config.retry_scheduler_deadline,
+    base_delay=1.0,
+    max_delay=20.0,
+)
+
+_current_policy: ContextVar[RetryPolicy] = ContextVar(
+    "retry_policy", default=RetryPolicy.INTERACTIVE
+)
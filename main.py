@@ -9,7 +9,7 @@ import sentry_sdk
 from discord.ext import commands
 
 import database
-from utility import LOG, config, sentry_logging
+from utility import LOG, Startup, config, sentry_logging, sync_app_commands
 
 intents = discord.Intents.default()
 argparser = argparse.ArgumentParser()
@@ -18,6 +18,7 @@ argparser = argparse.ArgumentParser()
 class GenshinDiscordBot(commands.AutoShardedBot):
     def __init__(self):
         self.db = database.Database
+        self._ready_reported = False
         super().__init__(
             command_prefix=commands.when_mentioned_or("$"),
             intents=intents,
@@ -30,40 +31,63 @@ class GenshinDiscordBot(commands.AutoShardedBot):
 
     async def setup_hook(self) -> None:
         # 載入 jishaku
-        await self.load_extension("jishaku")
+        async with Startup.phase("jishaku"):
+            await self.load_extension("jishaku")
 
         # 初始化資料庫
-        await database.Database.init()
+        async with Startup.phase("database"):
+            await database.Database.init()
 
-        # 初始化 genshin api 角色名字
-        await genshin.utility.update_characters_enka(["zh-tw"])
+        # 更新 genshin api 角色名字，更新完成前使用 genshin.py 內建的資料
+        Startup.background("genshin_characters", genshin.utility.update_characters_enka(["zh-tw"]))
 
-        # 從 cogs 資料夾載入所有 cog
+        # 從 cogs 資料夾與 cogs_external 資料夾同時載入所有 cog
+        extensions: list[str] = []
         for filepath in Path("./cogs").glob("**/*cog.py"):
             parts = list(filepath.parts)
             parts[-1] = filepath.stem
-            await self.load_extension(".".join(parts))
-
-        # 從 cogs_external 資料夾載入所有 cog
+            extensions.append(".".join(parts))
         for filepath in Path("./cogs_external").glob("**/*.py"):
-            cog_name = Path(filepath).stem
-            await self.load_extension(f"cogs_external.{cog_name}")
-
-        # 同步 Slash commands
+            extensions.append(f"cogs_external.{Path(filepath).stem}")
+
+        async def load_extension(name: str) -> None:
+            async with Startup.phase(f"extension:{name}"):
+                await self.load_extension(name)
+
+        # 等待所有擴充功能載入完成後，才依照順序回報載入失敗的擴充功能，避免失敗時其他擴充功能仍在背景載入
+        async with Startup.phase("extensions"):
+            results = await asyncio.gather(
+                *[load_extension(name) for name in extensions], return_exceptions=True
+            )
+        errors = [
+            (name, r) for name, r in zip(extensions, results) if isinstance(r, BaseException)
+        ]
+        for name, error in errors:
+            LOG.Error(f"擴充功能 {name} 載入失敗：{error!r}")
+        if len(errors) > 0:
+            raise errors[0][1]
+
+        # 同步 Slash commands，指令沒有變動時略過
+        test_guild = None
         if config.test_server_id is not None:
             test_guild = discord.Object(id=config.test_server_id)
             self.tree.copy_global_to(guild=test_guild)
-            await self.tree.sync(guild=test_guild)
-        await self.tree.sync()
+        async with Startup.phase("sync_commands"):
+            await sync_app_commands(self.tree, test_guild, force=args.sync_commands)
 
         # 啟動 Prometheus Server
         if config.prometheus_server_port is not None:
             prometheus_client.start_http_server(config.prometheus_server_port)
             LOG.System(f"prometheus server: started on port {config.prometheus_server_port}")
 
+        Startup.report("setup_hook")
+
     async def on_ready(self):
         LOG.System(f"on_ready: You have logged in as {self.user}")
         LOG.System(f"on_ready: Total {len(self.guilds)} servers connected")
+        if self._ready_reported is False:
+            self._ready_reported = True
+            Startup.report("ready")
 
     async def close(self) -> None:
         # 關閉資料庫
@@ -80,6 +104,7 @@ class GenshinDiscordBot(commands.AutoShardedBot):
 
 
 argparser.add_argument("--migrate_database", action="store_true")
+argparser.add_argument("--sync_commands", action="store_true", help="強制同步斜線指令")
 args = argparser.parse_args()
 
 if args.migrate_database:
@@ -0,0 +1,9 @@
+from typing import TYPE_CHECKING
+
+from utility import lazy_attributes
+
+if TYPE_CHECKING:
+    from .showcase import Showcase
+
+# 展示櫃需要 mihomo、honkairail、hsrcard 與 PIL，第一次使用時才載入
+__getattr__ = lazy_attributes(__name__, {"Showcase": ".showcase"})
@@ -7,10 +7,12 @@ from cachetools import LRUCache
 from honkairail.src.tools.modalV2 import StarRailApiDataV2
 from hsrcard.hsr import HonkaiCard
 from mihomo import MihomoAPI, StarrailInfoParsed
+from mihomo import errors as mihomo_errors
 from mihomo import tools as mihomo_tools
 from PIL.Image import Image
 
 from database import Database, StarrailShowcase
+from utility import CircuitBreaker
 
 
 class Showcase:
@@ -34,7 +36,11 @@ class Showcase:
         if srshowcase:
             cached_data = srshowcase.data
         try:
-            new_data = await self.client.fetch_user(self.uid)
+            # 玩家不存在、參數錯誤與 API 狀態無關，不計入斷路器的失敗次數
+            async with CircuitBreaker.get("mihomo").guard(
+                ignore=(mihomo_errors.UserNotFound, mihomo_errors.InvalidParams)
+            ):
+                new_data = await self.client.fetch_user(self.uid)
         except Exception as e:
             # 無法從 API 取得時，改用資料庫資料，若兩者都沒有則拋出錯誤
             if cached_data is None:
@@ -1,5 +1,9 @@
+from .app_command_sync import sync_app_commands
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .config import config
 from .custom_log import LOG, ContextCommandLogger, SlashCommandLogger
 from .discord_ui_template import *
 from .emoji import emoji
+from .lazy_import import lazy_attributes, lazy_module
+from .startup import Startup
 from .utils import *
@@ -0,0 +1,82 @@
+import hashlib
+import json
+from pathlib import Path
+
+import discord
+from discord import app_commands
+
+from .custom_log import LOG
+from .utils import get_app_command_mention
+
+APP_COMMANDS_PATH = Path("data/app_commands.json")
+"""斜線指令名稱與 ID 的對照表，用於 get_app_command_mention"""
+APP_COMMANDS_HASH_PATH = Path("data/app_commands.sha256")
+"""上次同步到 Discord 的指令內容雜湊值"""
+
+
+def _hash_tree(tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None) -> str:
+    """將指令樹與機器人的 application id 序列化後計算雜湊值，指令的名稱、說明、參數、權限等任何改變都會使雜湊值不同"""
+
+    def serialize(commands: list) -> list[dict]:
+        # 依照名稱排序，cog 載入的順序不同不影響雜湊值
+        return sorted(
+            (command.to_dict(tree) for command in commands),
+            key=lambda command: (command.get("type", 1), command["name"]),
+        )
+
+    payload = {
+        # 換成其他機器人的 token 時，即使指令相同也必須重新同步
+        "application_id": tree.client.application_id,
+        "global": serialize(tree.get_commands()),
+        "guild": serialize(tree.get_commands(guild=guild)) if guild is not None else None,
+        "guild_id": guild.id if guild is not None else None,
+    }
+    content = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+async def sync_app_commands(
+    tree: app_commands.CommandTree,
+    guild: discord.abc.Snowflake | None = None,
+    *,
+    force: bool = False,
+) -> bool:
+    """指令內容與上次同步時不同才向 Discord 同步斜線指令，同步後更新指令 ID 對照表
+
+    Parameters
+    ------
+    tree: `CommandTree`
+        機器人的指令樹
+    guild: `Snowflake` | `None`
+        額外同步的測試伺服器
+    force: `bool`
+        是否忽略雜湊值，強制同步
+
+    Returns
+    ------
+    `bool`:
+        是否有向 Discord 同步
+    """
+    digest = _hash_tree(tree, guild)
+    if (
+        force is False
+        and APP_COMMANDS_PATH.exists()
+        and APP_COMMANDS_HASH_PATH.exists()
+        and APP_COMMANDS_HASH_PATH.read_text(encoding="utf-8").strip() == digest
+    ):
+        LOG.System("sync_app_commands: 斜線指令沒有變動，略過同步")
+        return False
+
+    if guild is not None:
+        await tree.sync(guild=guild)
+    synced = await tree.sync()
+
+    # 以同步回傳的指令 ID 重新產生對照表
+    ids = {command.name: command.id for command in synced}
+    APP_COMMANDS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(APP_COMMANDS_PATH, "w", encoding="utf-8") as f:
+        json.dump(ids, f, ensure_ascii=False, indent=4)
+    APP_COMMANDS_HASH_PATH.write_text(digest, encoding="utf-8")
+    setattr(get_app_command_mention, "appcmd_id", ids)
+    LOG.System(f"sync_app_commands: 已同步 {len(synced)} 個斜線指令")
+    return True
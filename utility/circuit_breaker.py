@@ -0,0 +1,158 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, ClassVar, Final
+
+from .config import config
+from .custom_log import LOG
+from .prometheus import Metrics
+
+
+class CircuitOpenError(Exception):
+    """斷路器開啟時，請求不會送出而是直接拋出此例外"""
+
+    def __init__(self, upstream: str, retry_after: float) -> None:
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(f"{upstream} 目前連線異常，請在 {max(1, round(retry_after))} 秒後再試")
+
+
+class CircuitBreaker:
+    """外部 API 的斷路器，每個上游 (例：Hoyolab 各區域、Enka、Mihomo、genshin-db) 各自擁有一個
+
+    - 關閉 (CLOSED)：正常送出請求，連續失敗達到設定次數時開啟
+    - 開啟 (OPEN)：請求直接拋出 CircuitOpenError，不等待逾時與重試；經過設定時間後進入半開
+    - 半開 (HALF_OPEN)：只允許一個試探請求，成功則關閉，失敗則重新開啟
+
+    Methods
+    -----
+    get(upstream: `str`)
+        取得指定上游的斷路器
+    check()
+        確認是否允許送出請求，不允許時拋出 CircuitOpenError
+    guard(ignore: `tuple[type[BaseException], ...]`)
+        在 async with 區塊內送出請求，並依照結果記錄成功或失敗
+    wait_until_available()
+        等待斷路器允許送出請求，用來讓自動排程在上游異常時暫停
+    """
+
+    CLOSED: Final[int] = 0
+    HALF_OPEN: Final[int] = 1
+    OPEN: Final[int] = 2
+
+    _breakers: ClassVar[dict[str, "CircuitBreaker"]] = {}
+
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+        self.failures: int = 0
+        """連續失敗的次數"""
+        self._opened_at: float | None = None
+        self._probing: bool = False
+        self._export()
+
+    @classmethod
+    def get(cls, upstream: str) -> "CircuitBreaker":
+        """取得指定上游的斷路器，若不存在則建立一個新的"""
+        breaker = cls._breakers.get(upstream)
+        if breaker is None:
+            breaker = cls._breakers[upstream] = cls(upstream)
+        return breaker
+
+    @property
+    def state(self) -> int:
+        """目前的狀態：CLOSED、HALF_OPEN 或 OPEN"""
+        if self._opened_at is None:
+            return self.CLOSED
+        if self.retry_after > 0:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """距離進入半開狀態的剩餘秒數"""
+        if self._opened_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._opened_at
+        return max(0.0, config.circuit_breaker_reset_timeout - elapsed)
+
+    @property
+    def available(self) -> bool:
+        """目前是否允許送出請求 (關閉，或是半開且沒有進行中的試探請求)"""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and self._probing is False)
+
+    def check(self) -> None:
+        """確認是否允許送出請求，半開時由本次請求作為試探請求
+
+        Raises
+        ------
+        CircuitOpenError
+            斷路器開啟中，或半開狀態下已經有試探請求正在進行
+        """
+        if self.available is False:
+            raise CircuitOpenError(self.upstream, self.retry_after)
+        if self.state == self.HALF_OPEN:
+            self._probing = True
+            self._export()
+
+    def record_success(self) -> None:
+        """記錄一次成功的請求"""
+        if self._opened_at is not None:
+            LOG.System(f"斷路器 {self.upstream} 試探請求成功，恢復正常請求")
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._export()
+
+    def record_failure(self) -> None:
+        """記錄一次失敗的請求，連續失敗達到設定次數或試探請求失敗時開啟斷路器"""
+        self.failures += 1
+        if self._probing or (
+            self._opened_at is None and self.failures >= config.circuit_breaker_failure_threshold
+        ):
+            LOG.System(
+                f"斷路器 {self.upstream} 開啟：連續失敗 {self.failures} 次，"
+                + f"{config.circuit_breaker_reset_timeout} 秒後試探"
+            )
+            self._opened_at = time.monotonic()
+            self._probing = False
+        self._export()
+
+    def release_probe(self) -> None:
+        """請求被取消而沒有結果時呼叫，不影響斷路器狀態，只歸還半開狀態的試探名額"""
+        self._probing = False
+        self._export()
+
+    @asynccontextmanager
+    async def guard(self, ignore: tuple[type[BaseException], ...] = ()) -> AsyncIterator[None]:
+        """在 async with 區塊內送出請求，依照區塊內拋出的例外記錄成功或失敗
+
+        Parameters
+        ------
+        ignore: `tuple[type[BaseException], ...]`
+            與上游狀態無關的例外 (例：玩家不存在)，發生時視為請求成功
+        """
+        self.check()
+        try:
+            yield
+        except Exception as e:
+            if isinstance(e, ignore):
+                self.record_success()
+            else:
+                self.record_failure()
+            raise
+        except BaseException:
+            self.release_probe()
+            raise
+        else:
+            self.record_success()
+
+    async def wait_until_available(self) -> None:
+        """等待斷路器允許送出請求，自動排程在上游異常時以此暫停，而不是讓每位使用者都失敗"""
+        while self.available is False:
+            await asyncio.sleep(max(self.retry_after, 1.0))
+
+    def _export(self) -> None:
+        """將斷路器狀態輸出到 Prometheus"""
+        state = self.HALF_OPEN if self._probing else self.state
+        Metrics.CIRCUIT_BREAKER_STATE.labels(self.upstream).set(state)
@@ -14,6 +14,8 @@ class Config(BaseSettings):
     """機器人 Token，從 Discord Developer 網頁取得"""
     enka_api_key: str | None = None
     """向 Enka Network API 發送請求的金鑰"""
+    enka_assets_update_interval: int = 86400
+    """Enka 素材資料的更新間隔（單位：秒），第一次使用展示櫃時，素材資料超過此時間沒有更新才在背景更新"""
 
     daily_reward_api_list: list[str] = []
     """遠端簽到 API URL list"""
@@ -22,8 +24,42 @@ class Config(BaseSettings):
     """自動簽到的間隔 (單位：分鐘)"""
     schedule_check_resin_interval: int = 10
     """自動檢查即時便箋的間隔 (單位：分鐘)"""
+    notes_cache_ttl: float = 180
+    """即時便箋快取的有效時間，指令與自動排程在此時間內共用同一份資料（單位：秒）"""
+    response_cache_maxsize: int = 1000
+    """Hoyolab 唯讀資料 (戰績、角色、札記、深淵) 每個端點最多快取的資料數量"""
+    notices_refresh_interval: int = 30
+    """遊戲公告快取的更新間隔 (單位：分鐘)"""
+    genshin_db_prewarm_embeds: bool = True
+    """genshin-db 資料載入或更新後，是否在背景預先產生所有搜尋結果的 Embed"""
     schedule_loop_delay: float = 2.0
-    """排程執行時每位使用者之間的等待間隔（單位：秒）"""
+    """排程執行時每位使用者之間的基本等待間隔，API 壅塞時會自動加長（單位：秒）"""
+    notification_coalesce_window: float = 2.0
+    """排程通知在同一頻道合併成一則訊息前的等待時間（單位：秒）"""
+    schedule_concurrency_max: int = 8
+    """排程對每個區域 (國際服、國服、遠端簽到 API) 同時處理的使用者數量上限，實際數量依照 API 狀況自動調整"""
+    schedule_latency_threshold: float = 5.0
+    """排程請求 API 的回應時間超過此值時視為壅塞，會降低請求速率（單位：秒）"""
+    retry_interactive_deadline: float = 2.5
+    """斜線指令向 Hoyolab 請求失敗時，允許重試的總時間，避免超過 Discord 互動的回應時限（單位：秒）"""
+    retry_scheduler_deadline: float = 60.0
+    """自動排程向 Hoyolab 請求失敗時，允許重試的總時間（單位：秒）"""
+    circuit_breaker_failure_threshold: int = 5
+    """外部 API 連續失敗達到此次數時開啟斷路器，暫停向此 API 請求"""
+    circuit_breaker_reset_timeout: float = 30.0
+    """斷路器開啟後，經過此時間才送出試探請求確認 API 是否恢復（單位：秒）"""
+    daily_reward_game_concurrency: int = 3
+    """每位使用者簽到時，同時向 Hoyolab 請求簽到的遊戲數量上限"""
+    schedule_checkin_batch_size: int = 10
+    """自動簽到時每個 worker 一次從資料庫領取的使用者數量"""
+    schedule_checkin_lease_seconds: int = 900
+    """自動簽到 worker 領取使用者的租約時間（單位：秒），worker 當機時租約過期後會由其他 worker 重新領取"""
+    worker_name: str | None = None
+    """自動排程的 worker 名稱，共用資料庫的每個程序必須不同；未設定時使用主機名稱，但 docker 容器每次部署的主機名稱都不同"""
+    schedule_checkin_slot_capacity: int = 50
+    """自動簽到時間輪每分鐘最多分配的使用者數量"""
+    schedule_checkin_slot_tolerance: int = 30
+    """分配自動簽到時段時，允許比使用者設定的時間延後的最大分鐘數"""
     game_maintenance_time: tuple[datetime, datetime] | None = None
     """遊戲的維護時間(起始, 結束)，在此期間內自動排程不會執行"""
 
@@ -45,6 +81,14 @@ class Config(BaseSettings):
     """讓使用者設定圖形驗證的網址"""
     genshin_py_proxy_server: str | None = None
     """給 genshin_py 呼叫官方 API 使用的 proxy server 位址"""
+    genshin_py_proxy_servers: list[str] = []
+    """給 genshin_py 呼叫官方 API 使用的 proxy server 位址 list，請求會分散到各個 proxy，設定時取代 genshin_py_proxy_server"""
+    proxy_max_concurrency: int = 8
+    """每個 proxy server 同時進行的請求數量上限"""
+    proxy_eject_seconds: float = 300
+    """proxy server 連續失敗時移出代理池的時間，期間內健康檢查成功會提早加回（單位：秒）"""
+    proxy_health_check_interval: int = 1
+    """proxy server 健康檢查的間隔 (單位：分鐘)"""
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,62 @@
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Callable
+
+__all__ = ["lazy_attributes", "lazy_module"]
+
+
+def lazy_module(name: str) -> ModuleType:
+    """回傳模組的代理物件，第一次存取模組的屬性時才真正執行 import
+
+    用於 PIL、enkanetwork 等載入時間長、佔用記憶體多，但只有部分指令會用到的套件
+
+    Parameters
+    ------
+    name: `str`
+        模組的完整名稱，例：`"enkanetwork"`
+
+    Returns
+    ------
+    `ModuleType`:
+        模組的代理物件，已經載入過的模組直接回傳原本的模組
+    """
+    if (module := sys.modules.get(name)) is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_attributes(package: str, attributes: dict[str, str]) -> Callable[[str], Any]:
+    """產生模組層級的 `__getattr__` (PEP 562)，第一次取用屬性時才 import 定義該屬性的子模組
+
+    Parameters
+    ------
+    package: `str`
+        套件名稱，通常傳入 `__name__`
+    attributes: `dict[str, str]`
+        屬性名稱與定義該屬性的子模組，例：`{"Showcase": ".showcase"}`
+
+    Returns
+    ------
+    `Callable[[str], Any]`:
+        指派給套件的 `__getattr__`
+    """
+
+    def __getattr__(name: str) -> Any:
+        if (module_name := attributes.get(name)) is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 存回套件，之後的存取不再經過 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -49,3 +49,81 @@ class Metrics:
         PREFIX + "process_start_time_seconds", "機器人程序啟動時當下的時間"
     )
     """機器人程序啟動時當下的時間 (UNIX Timestamp)"""
+
+    SCHEDULE_CONCURRENCY: Final[Gauge] = Gauge(
+        PREFIX + "schedule_concurrency", "自動排程向 Hoyolab 請求的並行數量上限", ["region"]
+    )
+    """自動排程向 Hoyolab 請求的並行數量上限，由 RateController 依照 AIMD 動態調整"""
+
+    SCHEDULE_REQUEST_RATE: Final[Gauge] = Gauge(
+        PREFIX + "schedule_request_rate",
+        "自動排程向 Hoyolab 請求的預估速率 (每秒人數)",
+        ["region"],
+    )
+    """自動排程向 Hoyolab 請求的預估速率 (單位: 每秒人數)"""
+
+    NOTIFICATION_SENDS: Final[Counter] = Counter(
+        PREFIX + "notification_sends", "自動排程發送到頻道的訊息數量"
+    )
+    """自動排程發送到頻道的訊息數量，多則通知合併成一則訊息時只計算一次"""
+
+    NOTIFICATION_MERGES: Final[Counter] = Counter(
+        PREFIX + "notification_merges", "自動排程合併到其他訊息一起發送的通知數量"
+    )
+    """自動排程合併到其他訊息一起發送的通知數量"""
+
+    DISCORD_RATE_LIMITED: Final[Counter] = Counter(
+        PREFIX + "discord_rate_limited", "機器人向 Discord 請求時收到 HTTP 429 的次數"
+    )
+    """機器人向 Discord 請求時收到 HTTP 429 (被速率限制) 的次數"""
+
+    CIRCUIT_BREAKER_STATE: Final[Gauge] = Gauge(
+        PREFIX + "circuit_breaker_state", "外部 API 斷路器的狀態", ["upstream"]
+    )
+    """外部 API 斷路器的狀態 (0: 關閉、1: 半開、2: 開啟)"""
+
+    GENSHIN_API_RETRIES: Final[Counter] = Counter(
+        PREFIX + "genshin_api_retries", "向 Hoyolab 請求失敗後重試的次數", ["policy", "error"]
+    )
+    """向 Hoyolab 請求失敗後重試的次數，依照重試策略與錯誤類型區分"""
+
+    GENSHIN_API_RETRIES_EXHAUSTED: Final[Counter] = Counter(
+        PREFIX + "genshin_api_retries_exhausted",
+        "向 Hoyolab 請求的暫時性錯誤在重試次數或時間用完後仍然失敗的次數",
+        ["policy", "error"],
+    )
+    """向 Hoyolab 請求的暫時性錯誤在重試次數或時間用完後仍然失敗的次數"""
+
+    RESPONSE_CACHE_REQUESTS: Final[Counter] = Counter(
+        PREFIX + "response_cache_requests",
+        "讀取 Hoyolab 唯讀資料快取的次數",
+        ["endpoint", "result"],
+    )
+    """讀取 Hoyolab 唯讀資料快取的次數 (result: hit、miss、inflight)"""
+
+    PROXY_HEALTHY: Final[Gauge] = Gauge(
+        PREFIX + "proxy_healthy", "genshin.py 使用的 proxy server 是否正常", ["proxy"]
+    )
+    """genshin.py 使用的 proxy server 是否正常 (1: 正常、0: 暫時移出代理池)"""
+
+    PROXY_LATENCY: Final[Gauge] = Gauge(
+        PREFIX + "proxy_latency_seconds", "經由 proxy server 請求的平均回應時間", ["proxy"]
+    )
+    """經由 proxy server 請求的回應時間的指數移動平均"""
+
+    GENSHIN_DB_REFRESH_SECONDS: Final[Gauge] = Gauge(
+        PREFIX + "genshin_db_refresh_seconds", "最近一次更新 genshin-db 資料花費的時間"
+    )
+    """最近一次更新 genshin-db 資料花費的時間，包含請求、比較與解析"""
+
+    GENSHIN_DB_CHANGED_ITEMS: Final[Gauge] = Gauge(
+        PREFIX + "genshin_db_changed_items",
+        "最近一次更新 genshin-db 資料時變動的項目數量",
+        ["folder", "change"],
+    )
+    """最近一次更新 genshin-db 資料時變動的項目數量 (change: added、removed、changed)"""
+
+    STARTUP_PHASE_SECONDS: Final[Gauge] = Gauge(
+        PREFIX + "startup_phase_seconds", "機器人啟動時各階段花費的時間", ["phase"]
+    )
+    """機器人啟動時各階段花費的時間 (phase: 階段名稱，背景工作以 background: 開頭)"""
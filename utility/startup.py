@@ -0,0 +1,76 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, ClassVar, Coroutine
+
+import sentry_sdk
+
+from .custom_log import LOG
+from .prometheus import Metrics
+
+
+class Startup:
+    """機器人啟動流程的計時，記錄每個階段花費的時間，輸出到日誌與 Prometheus
+
+    - 必須完成才能連線的步驟以 `async with Startup.phase(...)` 計時
+    - 不影響連線的步驟 (例：更新素材資料) 以 Startup.background 在背景執行，先使用本地的快取資料
+
+    Methods
+    -----
+    phase(name: `str`)
+        計時一個啟動階段
+    background(name: `str`, coro: `Coroutine`)
+        在背景執行不影響連線的步驟，完成後記錄時間
+    report()
+        將各階段花費的時間輸出到日誌
+    """
+
+    _start: ClassVar[float] = time.perf_counter()
+    _phases: ClassVar[dict[str, float]] = {}
+    _tasks: ClassVar[set[asyncio.Task]] = set()
+
+    @classmethod
+    def record(cls, name: str, duration: float) -> None:
+        """記錄一個階段花費的時間（單位：秒）"""
+        cls._phases[name] = duration
+        Metrics.STARTUP_PHASE_SECONDS.labels(name).set(duration)
+
+    @classmethod
+    @asynccontextmanager
+    async def phase(cls, name: str) -> AsyncIterator[None]:
+        """計時 async with 區塊內的啟動階段"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.record(name, time.perf_counter() - start)
+
+    @classmethod
+    def background(cls, name: str, coro: Coroutine) -> asyncio.Task:
+        """在背景執行不影響連線的啟動步驟，失敗時只記錄錯誤，不中斷啟動"""
+
+        async def run() -> None:
+            start = time.perf_counter()
+            try:
+                await coro
+            except Exception as e:
+                LOG.Error(f"啟動背景工作 {name} 失敗：{e}")
+                sentry_sdk.capture_exception(e)
+            else:
+                duration = time.perf_counter() - start
+                cls.record(f"background:{name}", duration)
+                LOG.System(f"啟動背景工作 {name} 完成，耗時 {duration:.2f} 秒")
+
+        task = asyncio.create_task(run())
+        # 保留 task 的參考，避免執行中被回收
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return task
+
+    @classmethod
+    def report(cls, total_phase: str = "total") -> None:
+        """記錄從程序啟動到現在的總時間，並將各階段花費的時間輸出到日誌 (由長到短)"""
+        cls.record(total_phase, time.perf_counter() - cls._start)
+        phases = sorted(cls._phases.items(), key=lambda item: item[1], reverse=True)
+        lines = "\n".join(f"  {name}: {duration:.2f}s" for name, duration in phases)
+        LOG.System(f"啟動時間報告：\n{lines}")